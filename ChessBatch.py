@@ -0,0 +1,384 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file plays many games of the chess variant in ChessGame.py in lockstep with
+# NumPy, for training programs that need to step thousands of boards at once. The class
+# 'BatchChessEnv' holds K games as arrays instead of K ChessVar objects: piece planes of shape
+# (K, 12, 8, 8), where plane color * 6 + type is True on the squares holding that piece, and
+# captured counts of shape (K, 2, 6), where counts[k, color, type] is how many pieces of that type
+# the player of that color has captured in game k. The order of the colors and types is COLORS
+# and PIECE_TYPES from ChessGame.py, and row 0 of a plane is rank 8 like in ChessVar's board.
+# A move is one integer, (index moved from) * 64 + (index moved to), where the index of a square is
+# row * 8 + column, the same as the packed moves of ChessVar.legal_moves_idx(). legal_mask() finds
+# the legal moves of every game at once with lookup tables and one matrix product for the pieces
+# in the way of sliding moves, and step() makes one move in every game and checks for winners with
+# array operations, following the same rules as ChessVar (including pawns that can't move on the
+# last rank and a two-square pawn move that only needs its destination to be empty). A batch can
+# be made for a 'ChessRules' of ChessGame.py, and then all of its games use that board, starting
+# position and set sizes. The lookup tables are built from the rules once and shared by every
+# batch with the same rules.
+# NumPy is only needed for this file; the rest of the game works without it. Running this file
+# plays random games with BatchChessEnv and ChessVar side by side and checks that they agree.
+
+import random
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ChessGame import ChessVar, PIECE_TYPES, COLORS, STANDARD_RULES
+
+ROOK, KNIGHT, BISHOP, QUEEN, KING, PAWN = range(6)
+
+# The game states, by the number BatchChessEnv stores for them.
+GAME_STATES = ('UNFINISHED', 'WHITE_WON', 'BLACK_WON')
+
+
+def build_step_table(coordinates_table):
+    """
+    Returns a (64, 64) array that is True at [square_from, square_to] if square_to is in the
+    table's entry for square_from.
+
+    Parameters:
+        - coordinates_table: A list of 64 tuples of (row, column) tuples, like KING_COORDINATES.
+
+    Return value:
+        - a (64, 64) array of booleans
+    """
+    table = np.zeros((64, 64), dtype=bool)
+    for square, coordinates in enumerate(coordinates_table):
+        for row, column in coordinates:
+            table[square, row * 8 + column] = True
+    return table
+
+
+def build_ray_tables(rays_table):
+    """
+    Returns two arrays for sliding along the given rays. The first is True at
+    [square_from, square_to] if square_to is on one of the rays of square_from. The second is
+    True at [square_between, square_from, square_to] if square_between is on that ray between the
+    two squares, so a slide is only possible if none of those squares has a piece.
+
+    Parameters:
+        - rays_table: A list of 64 tuples of rays, like ROOK_RAYS.
+
+    Return value:
+        - lines: a (64, 64) array of booleans
+        - between: a (64, 64, 64) array of booleans
+    """
+    lines = np.zeros((64, 64), dtype=bool)
+    between = np.zeros((64, 64, 64), dtype=bool)
+    for square, rays in enumerate(rays_table):
+        for ray in rays:
+            passed = []
+            for row, column in ray:
+                lines[square, row * 8 + column] = True
+                between[passed, square, row * 8 + column] = True
+                passed.append(row * 8 + column)
+    return lines, between
+
+
+def build_batch_tables(rules):
+    """
+    Builds the arrays BatchChessEnv finds moves and winners with from the move tables and set
+    sizes of a game's rules. This is passed to ChessRules.compile_table(), so it runs once for
+    every set of rules.
+
+    Parameters:
+        - rules: A 'ChessRules' object.
+
+    Return value:
+        - A dictionary with 'king' and 'knight' (the squares each piece can reach from each
+        square, as (64, 64) arrays), 'pawn_moves' and 'pawn_captures' (the same for pawns, as
+        (2, 64, 64) arrays by color), 'rook_lines', 'bishop_lines' and 'queen_lines' (the
+        squares each slide can reach on an empty board), 'between' (a (64, 4096) float array
+        that is 1 at [square_between, square_from * 64 + square_to], so that the number of
+        pieces in the way of every slide in every game is one matrix product) and 'set_sizes'
+        (the number of captures of each type that wins, in the order of PIECE_TYPES)
+    """
+    rook_lines, rook_between = build_ray_tables(rules.get_table('rook_rays'))
+    bishop_lines, bishop_between = build_ray_tables(rules.get_table('bishop_rays'))
+    return {'king': build_step_table(rules.get_table('king')),
+            'knight': build_step_table(rules.get_table('knight')),
+            'pawn_moves': np.stack([build_step_table(rules.get_table('pawn_moves')[color])
+                                    for color in COLORS]),
+            'pawn_captures': np.stack([build_step_table(rules.get_table('pawn_captures')[color])
+                                       for color in COLORS]),
+            'rook_lines': rook_lines,
+            'bishop_lines': bishop_lines,
+            'queen_lines': rook_lines | bishop_lines,
+            'between': (rook_between | bishop_between).reshape(64, 4096).astype(np.float32),
+            'set_sizes': np.array(rules.get_set_size_list(), dtype=np.int8)}
+
+
+class BatchChessEnv:
+    """
+    This class holds K games of the chess variant as NumPy arrays and makes one move in every
+    game at a time. Every game starts in the starting position of the batch's rules.
+
+    Data members:
+        - self._rules (The 'ChessRules' every game of the batch is played by.)
+        - self._tables (The arrays of build_batch_tables() for the rules.)
+        - self._start_planes, self._start_counts, self._start_to_move (The starting position.)
+        - self._planes (A (K, 12, 64) boolean array of the pieces on every square.)
+        - self._counts (A (K, 2, 6) array of the pieces each player has captured.)
+        - self._to_move (A (K,) array with 0 where white is to move and 1 where black is.)
+        - self._states (A (K,) array of indices into GAME_STATES.)
+
+    Methods:
+        - reset(self, games)
+            - Puts games back in the starting position.
+        - load_game(self, index, game)
+            - Copies a ChessVar game into the batch.
+        - get_planes(self), get_counts(self), get_to_move(self), get_states(self)
+            - Return the arrays of the batch.
+        - get_game_states(self)
+            - Returns the state of every game as a string.
+        - legal_mask(self)
+            - Returns a (K, 4096) array of the legal moves of every game.
+        - step(self, actions)
+            - Makes one move in every game.
+
+    Classes in communication with:
+        - ChessVar (A ChessVar game can be copied into the batch, and the batch follows its rules.)
+        - ChessRules (The batch's lookup tables are built from its rules.)
+    """
+
+    def __init__(self, num_games, rules=None):
+        if np is None:
+            raise ImportError('BatchChessEnv needs NumPy, which is not installed')
+        self._rules = STANDARD_RULES if rules is None else rules
+        self._tables = self._rules.compile_table('batch', build_batch_tables)
+        self._start_planes = planes_from_game(ChessVar(self._rules))
+        self._start_counts = np.array(self._rules.get_start_counts(), dtype=np.int8)
+        self._start_to_move = COLORS.index(self._rules.get_start_color())
+        self._planes = np.repeat(self._start_planes[None], num_games, axis=0)
+        self._counts = np.repeat(self._start_counts[None], num_games, axis=0)
+        self._to_move = np.full(num_games, self._start_to_move, dtype=np.int8)
+        self._states = np.zeros(num_games, dtype=np.int8)
+
+    def reset(self, games=None):
+        """
+        Puts games back in the starting position.
+
+        Parameters:
+            - games: An array of the indices of the games to reset, or None to reset all of them.
+        """
+        if games is None:
+            games = slice(None)
+        self._planes[games] = self._start_planes
+        self._counts[games] = self._start_counts
+        self._to_move[games] = self._start_to_move
+        self._states[games] = 0
+
+    def load_game(self, index, game):
+        """
+        Copies the position, captured pieces, player to move and state of a ChessVar game into
+        one game of the batch. A ValueError is raised if the game is not played by the batch's
+        rules, since the batch could only play it by other rules.
+
+        Parameters:
+            - index: The index of the game in the batch. Example: 0
+            - game: A ChessVar object.
+        """
+        if game.get_rules() is not self._rules:
+            raise ValueError('the game is not played by the rules of the batch')
+        self._planes[index] = planes_from_game(game)
+        for color_index, player in enumerate((game.get_white_player(), game.get_black_player())):
+            captured_pieces = player.get_captured_pieces()
+            self._counts[index, color_index] = [captured_pieces[piece_type] for piece_type in PIECE_TYPES]
+        self._to_move[index] = COLORS.index(game.get_current_player().get_color())
+        self._states[index] = GAME_STATES.index(game.get_game_state())
+
+    def get_planes(self):
+        """
+        Returns the piece planes of the batch.
+
+        Return value:
+            - a (K, 12, 8, 8) boolean array that shares its memory with the batch
+        """
+        return self._planes.reshape(-1, 12, 8, 8)
+
+    def get_counts(self):
+        """
+        Returns the captured counts of the batch.
+
+        Return value:
+            - a (K, 2, 6) array where [k, color, type] is the number of pieces of that type the
+            player of that color has captured in game k
+        """
+        return self._counts
+
+    def get_to_move(self):
+        """
+        Returns whose turn it is in every game.
+
+        Return value:
+            - a (K,) array with 0 where white is to move and 1 where black is to move
+        """
+        return self._to_move
+
+    def get_states(self):
+        """
+        Returns the state of every game as a number.
+
+        Return value:
+            - a (K,) array of indices into GAME_STATES
+        """
+        return self._states
+
+    def get_game_states(self):
+        """
+        Returns the state of every game, like ChessVar.get_game_state().
+
+        Return value:
+            - a list of K strings, each 'UNFINISHED', 'WHITE_WON' or 'BLACK_WON'
+        """
+        return [GAME_STATES[state] for state in self._states]
+
+    def legal_mask(self):
+        """
+        Finds the legal moves of every game at once. A game that is over has no legal moves.
+
+        Return value:
+            - a (K, 4096) boolean array that is True at [k, move] if the move is legal in game k
+        """
+        tables = self._tables
+        games = np.arange(len(self._planes))
+        sides = self._planes.reshape(-1, 2, 6, 64)
+        own = sides[games, self._to_move]
+        opponent_occupied = sides[games, 1 - self._to_move].any(axis=1)
+        own_occupied = own.any(axis=1)
+        empty = ~(own_occupied | opponent_occupied)
+
+        # a slide is open if no square between the two squares has a piece
+        in_the_way = (~empty).astype(np.float32) @ tables['between']
+        open_lines = (in_the_way == 0).reshape(-1, 64, 64)
+
+        mask = ((own[:, ROOK, :, None] & tables['rook_lines'] & open_lines) |
+                (own[:, BISHOP, :, None] & tables['bishop_lines'] & open_lines) |
+                (own[:, QUEEN, :, None] & tables['queen_lines'] & open_lines) |
+                (own[:, KNIGHT, :, None] & tables['knight']) |
+                (own[:, KING, :, None] & tables['king']))
+        # no piece can move onto a piece of its own color
+        mask &= ~own_occupied[:, None, :]
+
+        # pawns move forward onto empty squares and capture diagonally
+        pawn_moves = tables['pawn_moves'][self._to_move] & empty[:, None, :]
+        pawn_captures = tables['pawn_captures'][self._to_move] & opponent_occupied[:, None, :]
+        mask |= own[:, PAWN, :, None] & (pawn_moves | pawn_captures)
+
+        mask &= (self._states == 0)[:, None, None]
+        return mask.reshape(-1, 4096)
+
+    def step(self, actions):
+        """
+        Makes one move in every game. A move that is not legal in its game (or an action outside
+        0 to 4095) changes nothing in that game, just like ChessVar.make_move() returning False. After the
+        moves, every player who has captured all of an opponent's pieces of one type has won.
+
+        Parameters:
+            - actions: A (K,) array of moves, each (index moved from) * 64 + (index moved to).
+
+        Return value:
+            - a (K,) boolean array that is True for the games where the move was made
+        """
+        actions = np.asarray(actions)
+        games = np.arange(len(self._planes))
+        made = np.zeros(len(games), dtype=bool)
+        played = (actions >= 0) & (actions < 4096)
+        made[played] = self.legal_mask()[games[played], actions[played]]
+
+        games = games[made]
+        squares_from = actions[made] // 64
+        squares_to = actions[made] % 64
+        movers = self._to_move[made]
+        moved_planes = self._planes[games, :, squares_from].argmax(axis=1)
+        targets = self._planes[games, :, squares_to]
+        captured = targets.any(axis=1)
+        captured_types = targets.argmax(axis=1) % 6
+
+        # move the pieces
+        self._planes[games, :, squares_to] = False
+        self._planes[games, moved_planes, squares_to] = True
+        self._planes[games, moved_planes, squares_from] = False
+        np.add.at(self._counts, (games[captured], movers[captured], captured_types[captured]), 1)
+
+        # check_if_winner() for every game that made a move
+        won = (self._counts[games, movers] == self._tables['set_sizes']).any(axis=1)
+        self._states[games[won]] = movers[won] + 1
+        self._to_move[games] = 1 - movers
+        return made
+
+
+def planes_from_game(game):
+    """
+    Returns the piece planes of a ChessVar game's board.
+
+    Parameters:
+        - game: A ChessVar object.
+
+    Return value:
+        - a (12, 64) boolean array
+    """
+    planes = np.zeros((12, 64), dtype=bool)
+    for square in range(64):
+        piece = game.get_piece_idx(square)
+        if piece.get_type() != '':
+            planes[COLORS.index(piece.get_color()) * 6 + PIECE_TYPES.index(piece.get_type()), square] = True
+    return planes
+
+
+def check_against_chessvar(num_games=64, max_plies=300, seed=0, rules=None):
+    """
+    Plays random games with a BatchChessEnv and with ChessVar objects side by side and checks
+    after every move that the legal moves, pieces, captured counts, player to move and game
+    states are the same. Some of the actions are random moves that are usually illegal, to check
+    that those are turned down by both.
+
+    Parameters:
+        - num_games: The number of games to play at once.
+        - max_plies: The number of moves to play.
+        - seed: The seed of the random moves.
+        - rules: The 'ChessRules' of the games, or None for the normal rules.
+
+    Return value:
+        - the number of moves that were compared
+    """
+    rng = random.Random(seed)
+    env = BatchChessEnv(num_games, rules)
+    games = [ChessVar(rules) for index in range(num_games)]
+    compared = 0
+    for ply in range(max_plies):
+        mask = env.legal_mask()
+        actions = []
+        for index, game in enumerate(games):
+            expected = sorted(game.legal_moves_idx())
+            if list(np.flatnonzero(mask[index])) != expected:
+                raise AssertionError('legal moves differ in game %d at ply %d' % (index, ply))
+            if expected and rng.random() < 0.9:
+                actions.append(rng.choice(expected))
+            else:
+                actions.append(rng.randrange(4096))
+        made = env.step(np.array(actions))
+        for index, game in enumerate(games):
+            if game.make_move_idx(actions[index] >> 6, actions[index] & 63) != made[index]:
+                raise AssertionError('move %d was handled differently in game %d' % (actions[index], index))
+            env_game = BatchChessEnv(1, rules)
+            env_game.load_game(0, game)
+            if (not np.array_equal(env_game.get_planes()[0], env.get_planes()[index]) or
+                    not np.array_equal(env_game.get_counts()[0], env.get_counts()[index]) or
+                    env_game.get_to_move()[0] != env.get_to_move()[index] or
+                    env_game.get_states()[0] != env.get_states()[index]):
+                raise AssertionError('game %d differs after ply %d' % (index, ply))
+            compared += 1
+    return compared
+
+
+if __name__ == '__main__':
+    if np is None:
+        print('NumPy is not installed')
+        sys.exit(1)
+    print('%d moves matched ChessVar' % check_against_chessvar())
@@ -0,0 +1,624 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file adds a second way of storing the board for the chess variant in
+# ChessGame.py. Instead of a list of 8 lists of 'Piece' objects, the class 'BitboardChessVar'
+# keeps one integer for every color and piece type (12 in total). Bit number (row * 8 + column)
+# of an integer is set if a piece of that color and type stands on that square, using the same
+# row and column indices as ChessVar._board (row 0 is rank 8, column 0 is the 'a' column).
+# Moves are found with bit shifts and lookup tables made when the file is imported instead of
+# building lists of coordinates, and no new 'Piece' objects are created when a move is made. The
+# rules are exactly the same as in ChessVar, and 'make_move()', 'display_board()' and
+# 'check_if_winner()' give the same results. A board view is kept in self._board so that code
+# reading self._board[row][col].get_type() still works. Games with other ChessRules get their
+# pawn moves and a mask of the squares on their board from bitboard tables built once per rules.
+
+from ChessGame import (ChessVar, Piece, PIECE_TYPES, COLORS, ZOBRIST_PIECE_KEYS, ZOBRIST_CAPTURE_KEYS,
+                       ZOBRIST_BLACK_TO_MOVE, STANDARD_RULES, is_on_board)
+
+# All 64 bits set.
+FULL_BOARD = (1 << 64) - 1
+
+# Masks used to stop a shifted bitboard from wrapping around to the other side of the board.
+COLUMN_A = sum(1 << (row * 8) for row in range(8))
+COLUMN_B = COLUMN_A << 1
+COLUMN_G = COLUMN_A << 6
+COLUMN_H = COLUMN_A << 7
+NOT_COLUMN_A = FULL_BOARD ^ COLUMN_A
+NOT_COLUMN_H = FULL_BOARD ^ COLUMN_H
+NOT_COLUMNS_AB = FULL_BOARD ^ (COLUMN_A | COLUMN_B)
+NOT_COLUMNS_GH = FULL_BOARD ^ (COLUMN_G | COLUMN_H)
+
+# (offset, mask) pairs. Shifting a bitboard by 'offset' squares and keeping only the bits in
+# 'mask' moves every piece one step in that direction.
+WEST, EAST = (-1, NOT_COLUMN_H), (1, NOT_COLUMN_A)
+NORTH, SOUTH = (-8, FULL_BOARD), (8, FULL_BOARD)
+NORTH_WEST, NORTH_EAST = (-9, NOT_COLUMN_H), (-7, NOT_COLUMN_A)
+SOUTH_WEST, SOUTH_EAST = (7, NOT_COLUMN_H), (9, NOT_COLUMN_A)
+
+ROOK_DIRECTIONS = (WEST, EAST, NORTH, SOUTH)
+BISHOP_DIRECTIONS = (NORTH_WEST, SOUTH_WEST, SOUTH_EAST, NORTH_EAST)
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+KING_STEPS = QUEEN_DIRECTIONS
+KNIGHT_STEPS = ((-17, NOT_COLUMN_H), (-15, NOT_COLUMN_A), (15, NOT_COLUMN_H), (17, NOT_COLUMN_A),
+                (-10, NOT_COLUMNS_GH), (-6, NOT_COLUMNS_AB), (6, NOT_COLUMNS_GH), (10, NOT_COLUMNS_AB))
+
+# Piece codes. A piece's code is (color index * 6 + type index), so white pieces are 0-5 and
+# black pieces are 6-11. EMPTY is used for a square with no piece on it.
+EMPTY = 12
+PIECE_OBJECTS = [Piece(piece_type, color) for color in COLORS for piece_type in PIECE_TYPES]
+PIECE_OBJECTS.append(Piece())
+PIECE_CODES = {(piece.get_type(), piece.get_color()): code for code, piece in enumerate(PIECE_OBJECTS)}
+# The Zobrist keys of every piece code, by square.
+ZOBRIST_CODE_KEYS = [ZOBRIST_PIECE_KEYS[(piece.get_type(), piece.get_color())] for piece in PIECE_OBJECTS]
+
+ROOK, KNIGHT, BISHOP, QUEEN, KING, PAWN = range(6)
+
+
+def shift(bitboard, offset):
+    """
+    Shifts every bit of a bitboard by the given number of squares. A negative offset moves
+    pieces towards row 0 (rank 8) and a positive offset moves them towards row 7 (rank 1).
+    Bits shifted past either end of the board are dropped.
+
+    Parameters:
+        - bitboard: An integer bitboard.
+        - offset: The number of squares to shift by. Example: -8
+
+    Return value:
+        - the shifted bitboard
+    """
+    if offset > 0:
+        return (bitboard << offset) & FULL_BOARD
+    return bitboard >> -offset
+
+
+def step_attacks(bitboard, steps):
+    """
+    Returns every square that can be reached from the pieces in a bitboard with a single step
+    of one of the given (offset, mask) pairs. This is used for kings and knights.
+
+    Parameters:
+        - bitboard: An integer bitboard with the starting squares.
+        - steps: A tuple of (offset, mask) pairs.
+
+    Return value:
+        - a bitboard of the reachable squares
+    """
+    attacks = 0
+    for offset, mask in steps:
+        attacks |= shift(bitboard, offset) & mask
+    return attacks
+
+
+def slide_attacks(bitboard, directions, occupied):
+    """
+    Returns every square a sliding piece (queen, rook or bishop) can reach from the square in
+    the given bitboard. Each direction is followed until the edge of the board or until a
+    piece is reached. The square of that first piece is included, whatever its color.
+
+    Parameters:
+        - bitboard: An integer bitboard with the sliding piece's square.
+        - directions: A tuple of (offset, mask) pairs to slide in.
+        - occupied: A bitboard of every piece on the board.
+
+    Return value:
+        - a bitboard of the reachable squares
+    """
+    attacks = 0
+    for offset, mask in directions:
+        ray = bitboard
+        while True:
+            ray = shift(ray, offset) & mask
+            if not ray:
+                break
+            attacks |= ray
+            if ray & occupied:
+                break
+    return attacks
+
+
+# Every square a king or knight can reach from each square, and every square a pawn of each
+# color (index 0 for white, 1 for black) can move forward to or capture on from each square.
+# These are worked out once when this file is imported.
+KING_ATTACKS = [step_attacks(1 << square, KING_STEPS) for square in range(64)]
+KNIGHT_ATTACKS = [step_attacks(1 << square, KNIGHT_STEPS) for square in range(64)]
+PAWN_MOVES = [[shift(1 << square, NORTH[0]) | (shift(1 << square, NORTH[0] * 2) if square // 8 == 6 else 0)
+               for square in range(64)],
+              [shift(1 << square, SOUTH[0]) | (shift(1 << square, SOUTH[0] * 2) if square // 8 == 1 else 0)
+               for square in range(64)]]
+PAWN_CAPTURES = [[step_attacks(1 << square, (NORTH_WEST, NORTH_EAST)) for square in range(64)],
+                 [step_attacks(1 << square, (SOUTH_WEST, SOUTH_EAST)) for square in range(64)]]
+
+
+def build_rules_bitboards(rules):
+    """
+    Builds the bitboard tables that depend on the rules of a game: the squares a pawn of each
+    color can move forward to from each square, and the squares that are on the board. This is
+    passed to ChessRules.compile_table(), so it runs once for every set of rules.
+
+    Parameters:
+        - rules: A 'ChessRules' object.
+
+    Return value:
+        - pawn_moves: A table like PAWN_MOVES for the rules' board and double step rows
+        - board_mask: A bitboard of the squares on the rules' board (FULL_BOARD for 8 by 8)
+    """
+    pawn_moves = [[sum(1 << (row * 8 + column) for row, column in coordinates)
+                   for coordinates in rules.get_table('pawn_moves')[color]]
+                  for color in COLORS]
+    board_mask = sum(1 << square for square in range(64)
+                     if is_on_board(square >> 3, square & 7, rules.get_width(), rules.get_height()))
+    return pawn_moves, board_mask
+
+
+def build_line_tables(directions):
+    """
+    Builds the lookup tables used to find a sliding piece's moves along one line of the board
+    (a row, a column, or one of the two diagonals) in a single lookup. For each square, only the
+    squares on that line strictly between the piece and the edge of the board can block it, so
+    every combination of pieces on those squares is worked out ahead of time. This is like the
+    "magic bitboard" lookups used by chess engines, with a dictionary doing the hashing.
+
+    Parameters:
+        - directions: The two (offset, mask) pairs of a line, pointing in opposite directions.
+        Example: (WEST, EAST)
+
+    Return value:
+        - masks: A list of 64 bitboards with the squares that can block a piece on each square
+        - tables: A list of 64 dictionaries, mapping (occupied & masks[square]) to the bitboard
+        of squares the piece can reach along the line, including the first blocking piece
+    """
+    masks = []
+    tables = []
+    for square in range(64):
+        bit = 1 << square
+        mask = 0
+        for direction in directions:
+            ray = slide_attacks(bit, (direction,), 0)
+            # the last square of a ray can't block anything behind it
+            mask |= ray ^ last_square(ray, direction[0])
+        table = {}
+        # visit every subset of the mask
+        occupied = 0
+        while True:
+            table[occupied] = slide_attacks(bit, directions, occupied)
+            occupied = (occupied - mask) & mask
+            if not occupied:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+def last_square(ray, offset):
+    """
+    Returns the square of a ray furthest from the piece, as a bitboard.
+
+    Parameters:
+        - ray: A bitboard of the squares in one direction from a piece.
+        - offset: The offset of that direction. Rays with a positive offset end at their
+        highest bit and rays with a negative offset end at their lowest bit.
+
+    Return value:
+        - a bitboard with one bit set, or 0 if the ray is empty
+    """
+    if not ray:
+        return 0
+    if offset > 0:
+        return 1 << (ray.bit_length() - 1)
+    return ray & -ray
+
+
+# Lookup tables for the four lines through every square.
+ROW_MASKS, ROW_ATTACKS = build_line_tables((WEST, EAST))
+COLUMN_MASKS, COLUMN_ATTACKS = build_line_tables((NORTH, SOUTH))
+DIAGONAL_MASKS, DIAGONAL_ATTACKS = build_line_tables((NORTH_WEST, SOUTH_EAST))
+ANTI_DIAGONAL_MASKS, ANTI_DIAGONAL_ATTACKS = build_line_tables((NORTH_EAST, SOUTH_WEST))
+
+
+def rook_attacks(square, occupied):
+    """
+    Returns every square a rook on the given square can reach, including the first piece it
+    runs into in each direction whatever its color, with one lookup for its row and one for
+    its column.
+
+    Parameters:
+        - square: The rook's square index (row * 8 + column).
+        - occupied: A bitboard of every piece on the board.
+
+    Return value:
+        - a bitboard of the reachable squares
+    """
+    return (ROW_ATTACKS[square][occupied & ROW_MASKS[square]] |
+            COLUMN_ATTACKS[square][occupied & COLUMN_MASKS[square]])
+
+
+def bishop_attacks(square, occupied):
+    """
+    Returns every square a bishop on the given square can reach, including the first piece it
+    runs into in each direction whatever its color, with one lookup for each diagonal.
+
+    Parameters:
+        - square: The bishop's square index (row * 8 + column).
+        - occupied: A bitboard of every piece on the board.
+
+    Return value:
+        - a bitboard of the reachable squares
+    """
+    return (DIAGONAL_ATTACKS[square][occupied & DIAGONAL_MASKS[square]] |
+            ANTI_DIAGONAL_ATTACKS[square][occupied & ANTI_DIAGONAL_MASKS[square]])
+
+
+class BitboardChessVar(ChessVar):
+    """
+    This class plays the same modified game of chess as ChessVar, but stores the board as
+    bitboards. A bitboard is an integer where bit number (row * 8 + column) represents one
+    square of the board. Every (color, piece type) pair has its own bitboard.
+
+    Data Members:
+        - self._bitboards (A list of 12 bitboards, indexed by piece code. The code of a piece is
+        its color index * 6 + its type index, using the orders in COLORS and PIECE_TYPES.)
+        - self._occupied (A list of 2 bitboards with every white piece and every black piece.)
+        - self._mailbox (A list of 64 piece codes, one for every square, so the piece on a
+        square can be found without checking all 12 bitboards. EMPTY is used for no piece.)
+        - self._board (A 'BoardView' that looks like the list of 8 lists in ChessVar, so that
+        self._board[row][col] still returns a 'Piece'.)
+        - self._pawn_moves (The pawn move bitboards of the game's rules, like PAWN_MOVES.)
+        - self._board_mask (A bitboard of the squares on the board of the game's rules.)
+        - All data members of ChessVar except the list board.
+
+    Methods:
+        - init method
+            - Sets up the same starting position as ChessVar and converts it to bitboards.
+        - load_board(self, board)
+            - Same as ChessVar.load_board(), setting the bitboards to match the list instead of
+            using it as the board.
+        - compute_position_key(self)
+            - Same as ChessVar.compute_position_key(), using the mailbox.
+        - get_piece_code(self, column, row)
+            - Returns the code of the piece on a square.
+        - set_square(self, column, row, piece)
+            - Same as ChessVar.set_square(), updating every bitboard.
+        - get_target_bitboard(self, column_from, row_from)
+            - Returns a bitboard of the squares the piece on a square can move to.
+        - get_piece_idx(self, square)
+            - Same as ChessVar.get_piece_idx(), using the mailbox.
+        - is_legal_idx(self, from_sq, to_sq)
+            - Same as ChessVar.is_legal_idx(), using bitboards.
+        - move_piece(self, column_from, row_from, column_to, row_to)
+            - Same as ChessVar.move_piece(), using bitboards.
+        - legal_moves_from_idx(self, from_sq)
+            - Same as ChessVar.legal_moves_from_idx(), using bitboards.
+        - legal_moves_idx(self)
+            - Same as ChessVar.legal_moves_idx(), using bitboards.
+
+    Classes in communication with:
+        - ChessVar (BitboardChessVar is a ChessVar, and keeps its players and game state.)
+        - BoardView (Used as self._board.)
+        - Piece (Only the shared objects in PIECE_OBJECTS are handed out by the board view.)
+    """
+
+    def __init__(self, rules=None):
+        self._pawn_moves, self._board_mask = (STANDARD_RULES if rules is None else rules).compile_table(
+            'bitboards', build_rules_bitboards)
+        # ChessVar.__init__() sets up the starting position with load_board(), which fills the
+        # bitboards instead of keeping the list
+        super().__init__(rules)
+        self._board = BoardView(self)
+
+    def load_board(self, board):
+        """
+        Sets the bitboards to match a board given as a list of 8 lists of 'Piece' objects, like
+        the board used by ChessVar, and computes the position key again.
+
+        Parameters:
+            - board: A list of 8 lists that contain 8 'Piece' objects each.
+        """
+        self._mailbox = [PIECE_CODES[(piece.get_type(), piece.get_color())] for row in board for piece in row]
+        self._bitboards = [0] * 13
+        for square, code in enumerate(self._mailbox):
+            self._bitboards[code] |= 1 << square
+        # the extra bitboard only collected the empty squares
+        del self._bitboards[EMPTY]
+        self._occupied = [self._bitboards[0] | self._bitboards[1] | self._bitboards[2] |
+                          self._bitboards[3] | self._bitboards[4] | self._bitboards[5],
+                          self._bitboards[6] | self._bitboards[7] | self._bitboards[8] |
+                          self._bitboards[9] | self._bitboards[10] | self._bitboards[11]]
+        self._position_key = self.compute_position_key()
+
+    def compute_position_key(self):
+        """
+        Computes the Zobrist key of the position from scratch, the same way as
+        ChessVar.compute_position_key(), reading the pieces from the mailbox.
+
+        Return value:
+            - position key (an integer from 0 to 2**64 - 1)
+        """
+        key = 0
+        for square, code in enumerate(self._mailbox):
+            key ^= ZOBRIST_CODE_KEYS[code][square]
+        for player in (self._white_player, self._black_player):
+            for piece_type in PIECE_TYPES:
+                count = player.get_captured_count(piece_type)
+                key ^= ZOBRIST_CAPTURE_KEYS[(player.get_color(), piece_type)][count]
+        if self._current_player.get_color() == 'black':
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        return key
+
+    def get_piece_code(self, column, row):
+        """
+        Returns the code of the piece on a square, or EMPTY if there is no piece there.
+
+        Parameters:
+            - column: An integer column index. Example: 0
+            - row: An integer row index. Example: 0
+
+        Return value:
+            - piece code (an integer from 0 to 12)
+        """
+        return self._mailbox[row * 8 + column]
+
+    def set_square(self, column, row, piece):
+        """
+        Puts a piece on a square, removing whatever piece was there before, the same way as
+        ChessVar.set_square(). All bitboards and the mailbox are updated.
+
+        Parameters:
+            - column: An integer column index. Example: 0
+            - row: An integer row index. Example: 0
+            - piece: A 'Piece' object. EMPTY_PIECE clears the square.
+        """
+        square = row * 8 + column
+        bit = 1 << square
+        old_code = self._mailbox[square]
+        if old_code != EMPTY:
+            self._bitboards[old_code] ^= bit
+            self._occupied[old_code // 6] ^= bit
+        new_code = PIECE_CODES[(piece.get_type(), piece.get_color())]
+        if new_code != EMPTY:
+            self._bitboards[new_code] |= bit
+            self._occupied[new_code // 6] |= bit
+        self._mailbox[square] = new_code
+
+    def get_target_bitboard(self, column_from, row_from):
+        """
+        Returns a bitboard of every square the piece on the given square can move to, using the
+        same movement rules as ChessVar's is_valid_move_(piecetype) methods. Squares with a
+        piece of the same color are never included.
+
+        Parameters:
+            - column_from: An integer column index of the piece. Example: 0
+            - row_from: An integer row index of the piece. Example: 0
+
+        Return value:
+            - a bitboard of target squares (0 if the square is empty)
+        """
+        square = row_from * 8 + column_from
+        code = self._mailbox[square]
+        if code == EMPTY:
+            return 0
+        color = code // 6
+        piece_type = code - color * 6
+        own = self._occupied[color]
+        enemy = self._occupied[1 - color]
+
+        if piece_type == PAWN:
+            # just like ChessVar, only the square being moved to has to be empty
+            return ((self._pawn_moves[color][square] & ~(own | enemy)) |
+                    (PAWN_CAPTURES[color][square] & enemy))
+        if piece_type == KNIGHT:
+            targets = KNIGHT_ATTACKS[square]
+        elif piece_type == KING:
+            targets = KING_ATTACKS[square]
+        elif piece_type == ROOK:
+            targets = rook_attacks(square, own | enemy)
+        elif piece_type == BISHOP:
+            targets = bishop_attacks(square, own | enemy)
+        else:
+            targets = rook_attacks(square, own | enemy) | bishop_attacks(square, own | enemy)
+        # a smaller board leaves out the squares off the board
+        return targets & ~own & self._board_mask
+
+    def get_piece_idx(self, square):
+        """
+        Returns the piece on the square with the given index, the same way as
+        ChessVar.get_piece_idx().
+
+        Parameters:
+            - square: The index of the square (0 to 63). Example: 0
+
+        Return value:
+            - the shared 'Piece' object for what is on that square
+        """
+        return PIECE_OBJECTS[self._mailbox[square]]
+
+    def is_legal_idx(self, from_sq, to_sq):
+        """
+        Given the index of a starting square and an ending square, this method returns True if
+        the current player can make that move and returns False otherwise. The checks are the
+        same as in ChessVar.is_legal_idx() and happen in the same order, and nothing is changed.
+        An index outside 0 to 63 is not a square, so False is returned.
+
+        Parameters:
+            - from_sq: The index of the square moved from (0 to 63). Example: 52
+            - to_sq: The index of the square moved to (0 to 63). Example: 36
+
+        Return value:
+            - True: if the move is valid
+            - False: if the move is not valid
+        """
+
+        # make sure both indices are squares, since a negative index would still find a square
+        if not (0 <= from_sq < 64 and 0 <= to_sq < 64):
+            return False
+
+        code = self._mailbox[from_sq]
+
+        # make sure a piece is in the square we are moving from
+        if code == EMPTY:
+            return False
+
+        # make sure the piece being moved matches the current player's color
+        if COLORS[code // 6] != self._current_player.get_color():
+            return False
+
+        # check status of game, must be unfinished to make a move
+        if self._game_state != "UNFINISHED":
+            return False
+
+        return self.get_target_bitboard(from_sq & 7, from_sq >> 3) >> to_sq & 1 == 1
+
+    def move_piece(self, column_from, row_from, column_to, row_to):
+        """
+        Moves the piece on one square to another square by updating the bitboards, the same way
+        as ChessVar.move_piece(). No 'Piece' objects are created.
+
+        Parameters:
+            - column_from: An integer column list index of the piece. Example: 0
+            - row_from: An integer row list index of the piece. Example: 0
+            - column_to: An integer column list index to move to. Example: 0
+            - row_to: An integer row list index to move to. Example: 0
+
+        Return value:
+            - captured_piece: the shared 'Piece' object for what was in the square moved to
+        """
+        square_from = row_from * 8 + column_from
+        square_to = row_to * 8 + column_to
+        code = self._mailbox[square_from]
+        color = code // 6
+        bit_to = 1 << square_to
+
+        # remove any captured piece
+        captured_code = self._mailbox[square_to]
+        if captured_code != EMPTY:
+            self._bitboards[captured_code] ^= bit_to
+            self._occupied[captured_code // 6] ^= bit_to
+
+        # move the piece
+        move_bits = (1 << square_from) | bit_to
+        self._bitboards[code] ^= move_bits
+        self._occupied[color] ^= move_bits
+        self._mailbox[square_to] = code
+        self._mailbox[square_from] = EMPTY
+
+        return PIECE_OBJECTS[captured_code]
+
+    def legal_moves_from_idx(self, from_sq):
+        """
+        Returns every move the current player can make with the piece on the square with the
+        given index, without changing the state of the game. The moves are the same as the ones
+        returned by ChessVar.legal_moves_from_idx().
+
+        Parameters:
+            - from_sq: The index of the square the piece is on (0 to 63). Example: 57
+
+        Return value:
+            - A list of packed moves.
+        """
+        code = self._mailbox[from_sq]
+        if (self._game_state != 'UNFINISHED' or code == EMPTY
+                or COLORS[code // 6] != self._current_player.get_color()):
+            return []
+        return self.get_moves_from_bitboard(from_sq, self.get_target_bitboard(from_sq & 7, from_sq >> 3))
+
+    def legal_moves_idx(self):
+        """
+        Returns every move the current player can make as packed moves, without changing the
+        state of the game. The moves are the same as the ones returned by
+        ChessVar.legal_moves_idx().
+
+        Return value:
+            - A list of packed moves.
+        """
+        moves = []
+        if self._game_state != 'UNFINISHED':
+            return moves
+        pieces = self._occupied[COLORS.index(self._current_player.get_color())]
+        while pieces:
+            bit = pieces & -pieces
+            square = bit.bit_length() - 1
+            pieces ^= bit
+            targets = self.get_target_bitboard(square & 7, square >> 3)
+            moves.extend(self.get_moves_from_bitboard(square, targets))
+        return moves
+
+    def get_moves_from_bitboard(self, from_sq, targets):
+        """
+        Turns a bitboard of target squares into a list of packed moves from the given square.
+
+        Parameters:
+            - from_sq: The index of the square being moved from.
+            - targets: A bitboard of the squares being moved to.
+
+        Return value:
+            - A list of packed moves.
+        """
+        moves = []
+        from_bits = from_sq << 6
+        while targets:
+            bit = targets & -targets
+            moves.append(from_bits | (bit.bit_length() - 1))
+            targets ^= bit
+        return moves
+
+
+class BoardView:
+    """
+    This class makes the bitboards of a BitboardChessVar look like the list of 8 lists used by
+    ChessVar. Indexing it with a row returns a 'RowView', and indexing that with a column
+    returns the 'Piece' on that square. Assigning a Piece to a square updates the bitboards.
+
+    Data members:
+        - self._game (the BitboardChessVar whose board is being viewed)
+
+    Classes in communication with:
+        - BitboardChessVar (Uses a BoardView as its self._board.)
+        - RowView (Returned for each row.)
+    """
+
+    def __init__(self, game):
+        self._game = game
+
+    def __getitem__(self, row):
+        return RowView(self._game, range(8)[row])
+
+    def __len__(self):
+        return 8
+
+    def __iter__(self):
+        for row in range(8):
+            yield RowView(self._game, row)
+
+
+class RowView:
+    """
+    This class is one row of a 'BoardView'. Indexing it with a column returns the shared
+    'Piece' object for the piece on that square, and assigning a Piece to a column puts that
+    piece on the board.
+
+    Data members:
+        - self._game (the BitboardChessVar whose board is being viewed)
+        - self._row (the row index of this row)
+
+    Classes in communication with:
+        - BoardView (Creates RowView objects.)
+        - BitboardChessVar (Reads and writes its squares.)
+    """
+
+    def __init__(self, game, row):
+        self._game = game
+        self._row = row
+
+    def __getitem__(self, column):
+        return PIECE_OBJECTS[self._game.get_piece_code(range(8)[column], self._row)]
+
+    def __setitem__(self, column, piece):
+        self._game.set_square(range(8)[column], self._row, piece)
+
+    def __len__(self):
+        return 8
+
+    def __iter__(self):
+        for column in range(8):
+            yield PIECE_OBJECTS[self._game.get_piece_code(column, self._row)]
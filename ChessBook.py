@@ -0,0 +1,321 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file has a read-only book of positions of the chess variant in ChessGame.py,
+# for example an opening book made from many played games. For every position the book keeps how
+# many games reached it, how many of them white and black won, and the best move found there. The
+# book is one file that is memory-mapped instead of read, so it can be many gigabytes and many
+# worker processes can look positions up in it at once while the operating system keeps only one
+# copy of the pages they use in memory. The file starts with the Zobrist keys of all the positions
+# (from ChessVar.position_key()) in sorted order, so a position is found with a binary search that
+# only touches a few pages, followed by one record per position in the same order. A record holds
+# the packed position itself (the pieces on the board, the player to move and both players'
+# captured counts), which is compared with the position being looked up so that two positions
+# with the same key are never mixed up, and the position's statistics. 'PositionBookBuilder' makes
+# a book from games and 'PositionBook' looks positions up in it:
+#
+#     python ChessBook.py games.rec book.bin --max-plies 20
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from ChessGame import ChessVar, PIECE_TYPES, COLORS, move_to_algebraic
+from ChessBitboard import PIECE_CODES, EMPTY
+from ChessRecord import read_games
+
+# The first bytes of every book file.
+MAGIC = b'CVBOOK\x00\x01'
+
+# The book header: MAGIC and the number of positions.
+BOOK_HEADER = struct.Struct('<8sQ')
+
+# A position record: the packed position (32 bytes of board, one byte for the player to move and
+# 6 bytes of captured counts), then the number of games, white wins and black wins, and the best
+# move as (index moved from) * 64 + (index moved to), or NO_MOVE.
+RECORD = struct.Struct('<32sB6sIIIH')
+NO_MOVE = 0xFFFF
+
+
+def pack_position(game):
+    """
+    Packs the position of a game into 39 bytes: the code of the piece on every square (4 bits per
+    square, in the order of the square indices, with EMPTY for an empty square), the player to move (0
+    for white, 1 for black), and the captured count of every type for white and then black (4 bits
+    per count, in the order of PIECE_TYPES).
+
+    Parameters:
+        - game: A ChessVar object.
+
+    Return value:
+        - a bytes object of 39 bytes
+    """
+    board = 0
+    for square in range(64):
+        piece = game.get_piece_idx(square)
+        code = EMPTY if piece.get_type() == '' else PIECE_CODES[(piece.get_type(), piece.get_color())]
+        board |= code << (4 * square)
+    counts = 0
+    for color_index, player in enumerate((game.get_white_player(), game.get_black_player())):
+        captured_pieces = player.get_captured_pieces()
+        for type_index, piece_type in enumerate(PIECE_TYPES):
+            counts |= captured_pieces[piece_type] << (4 * (color_index * 6 + type_index))
+    side = COLORS.index(game.get_current_player().get_color())
+    return board.to_bytes(32, 'little') + bytes((side,)) + counts.to_bytes(6, 'little')
+
+
+class PositionBookBuilder:
+    """
+    This class collects positions and their statistics and writes them to a book file. The
+    positions are kept in memory until the book is written, so a book is built once, for example
+    from a file of game records, and then read by many processes with 'PositionBook'.
+
+    Data members:
+        - self._entries (A dictionary from (position key, packed position) to a list of
+        [games, white wins, black wins, moves], where moves is a dictionary from each move played
+        in the position to [games, wins for the player who played it].)
+
+    Methods:
+        - add_game(self, moves, winner, max_plies)
+            - Adds the positions of one game.
+        - add_position(self, game, move, winner)
+            - Adds one position with the move played there.
+        - add_records(self, path, max_plies)
+            - Adds the positions of every game in a game record file.
+        - write(self, path)
+            - Writes the book file.
+
+    Classes in communication with:
+        - ChessVar (The games are replayed on a ChessVar to get their positions.)
+        - PositionBook (Reads the files a PositionBookBuilder writes.)
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def add_game(self, moves, winner, max_plies=None):
+        """
+        Adds every position of a game before each of its moves, with the game's result and the
+        move that was played there.
+
+        Parameters:
+            - moves: A list of packed moves.
+            - winner: The result of the game: 'UNFINISHED', 'WHITE_WON' or 'BLACK_WON'
+            - max_plies: Only add the positions before the first max_plies moves, or None for all.
+        """
+        if max_plies is not None:
+            moves = moves[:max_plies]
+        game = ChessVar()
+        for move in moves:
+            self.add_position(game, move, winner)
+            if not game.make_move_idx(move >> 6, move & 63):
+                raise ValueError('move %s%s is not valid' % move_to_algebraic(move))
+
+    def add_position(self, game, move, winner):
+        """
+        Adds one position with the move played there and the result of the game.
+
+        Parameters:
+            - game: A ChessVar object in the position.
+            - move: The packed move played in the position.
+            - winner: The result of the game: 'UNFINISHED', 'WHITE_WON' or 'BLACK_WON'
+        """
+        key = (game.position_key(), pack_position(game))
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [0, 0, 0, {}]
+            self._entries[key] = entry
+        entry[0] += 1
+        entry[1] += winner == 'WHITE_WON'
+        entry[2] += winner == 'BLACK_WON'
+        move_statistics = entry[3].setdefault(move, [0, 0])
+        move_statistics[0] += 1
+        move_statistics[1] += winner == game.get_current_player().get_color().upper() + '_WON'
+
+    def add_records(self, path, max_plies=None):
+        """
+        Adds the positions of every game in a game record file made with ChessRecord.py.
+
+        Parameters:
+            - path: The name of the record file.
+            - max_plies: Only add the positions before the first max_plies moves of each game.
+
+        Return value:
+            - the number of games added
+        """
+        games = 0
+        for record in read_games(path):
+            self.add_game(record['moves'], record['winner'], max_plies)
+            games += 1
+        return games
+
+    def write(self, path):
+        """
+        Writes the book file. The best move of a position is the move that won the most games
+        for the player who played it, and of those the one played most often.
+
+        Parameters:
+            - path: The name of the book file.
+
+        Return value:
+            - the number of positions written
+        """
+        keys = sorted(self._entries)
+        with open(path, 'wb') as file:
+            file.write(BOOK_HEADER.pack(MAGIC, len(keys)))
+            file.write(struct.pack('<%dQ' % len(keys), *[key for key, packed in keys]))
+            for key in keys:
+                visits, white_wins, black_wins, moves = self._entries[key]
+                best_move = max(moves, key=lambda move: (moves[move][1], moves[move][0]))
+                file.write(RECORD.pack(key[1][:32], key[1][32], key[1][33:], visits, white_wins,
+                                       black_wins, best_move))
+        return len(keys)
+
+
+class PositionBook:
+    """
+    This class looks positions up in a book file written by 'PositionBookBuilder'. The file is
+    memory-mapped and never changed, so any number of processes can open the same book and
+    share the memory of its pages. It can be used in a 'with' statement, which closes the file
+    at the end.
+
+    Data members:
+        - self._file (the book file)
+        - self._map (the memory map of the whole file)
+        - self._keys (A memoryview of the sorted position keys in the map, as 64-bit integers.)
+        - self._records_offset (The byte offset of the first record in the file.)
+
+    Methods:
+        - lookup(self, game)
+            - Returns the statistics of a game's position, or None.
+        - get_best_move(self, game)
+            - Returns the book's best move for a game's position, or None.
+        - close(self)
+            - Closes the file.
+
+    Classes in communication with:
+        - ChessVar (Positions are looked up by a ChessVar game.)
+        - SearchEngine (Can use a PositionBook for its moves before searching.)
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = None
+        self._keys = None
+        try:
+            # an empty file can't be mapped and a shorter one has no header, so the size is
+            # checked before the file is mapped
+            size = os.fstat(self._file.fileno()).st_size
+            if size < BOOK_HEADER.size:
+                raise ValueError(path + ' is not a position book file')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count = BOOK_HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(path + ' is not a position book file')
+            keys_offset = BOOK_HEADER.size
+            self._records_offset = keys_offset + count * 8
+            if size < self._records_offset + count * RECORD.size:
+                raise ValueError(path + ' is shorter than its number of positions')
+            # the keys are written little-endian, which is also how they are read on x86 and ARM
+            self._keys = memoryview(self._map)[keys_offset:self._records_offset].cast('Q')
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def lookup(self, game):
+        """
+        Finds a game's position in the book.
+
+        Parameters:
+            - game: A ChessVar object.
+
+        Return value:
+            - a dictionary with 'visits', 'white_wins', 'black_wins' and 'best_move' (a packed
+            move or None), or None if the position is not in the book
+        """
+        keys = self._keys
+        key = game.position_key()
+        low, high = 0, len(keys)
+        while low < high:
+            middle = (low + high) // 2
+            if keys[middle] < key:
+                low = middle + 1
+            else:
+                high = middle
+        packed = None
+        # different positions with the same key are next to each other
+        while low < len(keys) and keys[low] == key:
+            board, side, counts, visits, white_wins, black_wins, best_move = RECORD.unpack_from(
+                self._map, self._records_offset + low * RECORD.size)
+            if packed is None:
+                packed = pack_position(game)
+            if board + bytes((side,)) + counts == packed:
+                return {'visits': visits, 'white_wins': white_wins, 'black_wins': black_wins,
+                        'best_move': None if best_move == NO_MOVE else best_move}
+            low += 1
+        return None
+
+    def get_best_move(self, game):
+        """
+        Returns the book's best move for a game's position if it is legal in the game.
+
+        Parameters:
+            - game: A ChessVar object.
+
+        Return value:
+            - a packed move, or None
+        """
+        entry = self.lookup(game)
+        if entry is None or entry['best_move'] is None:
+            return None
+        if not game.is_legal_idx(entry['best_move'] >> 6, entry['best_move'] & 63):
+            return None
+        return entry['best_move']
+
+    def close(self):
+        """Closes the memory map and the file."""
+        if self._keys is not None:
+            self._keys.release()
+            self._keys = None
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+def main(arguments=None):
+    """
+    Builds a position book from a game record file from the command line.
+
+    Parameters:
+        - arguments: A list of command line arguments, or None to use sys.argv.
+
+    Return value:
+        - the exit status (0)
+    """
+    parser = argparse.ArgumentParser(description='Build a position book from game records.')
+    parser.add_argument('records', help='a game record file made with ChessRecord.py')
+    parser.add_argument('book', help='the book file to write')
+    parser.add_argument('--max-plies', type=int, default=20,
+                        help='the number of moves of each game to add (default: 20)')
+    options = parser.parse_args(arguments)
+
+    builder = PositionBookBuilder()
+    games = builder.add_records(options.records, options.max_plies)
+    positions = builder.write(options.book)
+    print('%d positions from %d games written to %s' % (positions, games, options.book))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,315 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file scores positions of the chess variant in ChessGame.py for the computer
+# player in ChessSearch.py. In this variant a player loses as soon as one set of pieces is gone:
+# the only king, the only queen, both rooks, both knights, both bishops, or all 8 pawns. Counting
+# material like in normal chess is therefore wrong, since losing 3 pawns is nothing but losing
+# one of two bishops leaves a player one capture away from losing. The class 'VariantEvaluator'
+# scores every set by how many of its pieces are left (its distance to being lost) and adds a
+# mobility score: the number of squares each piece attacks, with the other pieces in the way.
+# Both scores are updated with each move made or taken back through the evaluator, instead of
+# looking at all 64 squares again.
+#
+# A rook, bishop or queen attacks along its lines up to and including the first piece it runs
+# into, so a rook boxed in on a1 attacks two squares and a free one fourteen. Kings, knights and
+# pawns attack the same squares wherever the other pieces are, so their mobility comes from a
+# table. A move only changes the mobility of the moved piece, the captured piece, and the sliders
+# whose lines pass through the square moved from (the line is opened) or the empty square moved
+# to (the line is closed). Those sliders are found with the same bitboard attack lookups as in
+# ChessBitboard.py, looking out from the two squares, since a slider sees a square exactly when
+# that square sees the slider along the same line.
+
+from ChessGame import PIECE_TYPES, COLORS
+from ChessBitboard import (build_rules_bitboards, rook_attacks, bishop_attacks, FULL_BOARD,
+                           KING_ATTACKS, KNIGHT_ATTACKS, PAWN_CAPTURES)
+
+# The penalty for a set, indexed by how many of its pieces are left. A set with 0 pieces left
+# has been lost, and a set with 1 piece left is one capture away from losing the game, so the
+# penalty grows quickly as a set gets smaller.
+SET_DANGER = [1000, 300, 120, 60, 35, 20, 12, 7, 4]
+
+# How much each attacked square is worth, for each type.
+MOBILITY_WEIGHTS = {'rook': 1, 'knight': 3, 'bishop': 2, 'queen': 1, 'king': 0, 'pawn': 1}
+
+
+def build_step_mobility_table(piece_type, color, board_mask=FULL_BOARD):
+    """
+    Returns a list with the mobility of a king, knight or pawn of the given color on each of the
+    64 squares (indexed by row * 8 + column): the number of squares it attacks from there, times
+    the type's weight in MOBILITY_WEIGHTS. These pieces can't be blocked, so the other pieces
+    don't matter. A pawn attacks the two squares it captures on. Only squares in board_mask are
+    counted.
+
+    Parameters:
+        - piece_type: 'king', 'knight' or 'pawn'
+        - color: A string color. Example: 'white'
+        - board_mask: A bitboard of the squares on the board, FULL_BOARD for 8 by 8.
+
+    Return value:
+        - a list of 64 integers
+    """
+    if piece_type == 'king':
+        attacks = KING_ATTACKS
+    elif piece_type == 'knight':
+        attacks = KNIGHT_ATTACKS
+    else:
+        attacks = PAWN_CAPTURES[COLORS.index(color)]
+    return [bin(attacks[square] & board_mask).count('1') * MOBILITY_WEIGHTS[piece_type]
+            for square in range(64)]
+
+
+def build_rules_mobility_tables(rules):
+    """
+    Builds what the mobility score needs to know about the board of a game's rules, so that
+    squares off a smaller board are not counted. This is passed to ChessRules.compile_table(),
+    so it runs once for every set of rules.
+
+    Parameters:
+        - rules: A 'ChessRules' object.
+
+    Return value:
+        - board_mask: A bitboard of the squares on the rules' board
+        - step_tables: A dictionary mapping (piece_type, color) of every king, knight and pawn
+        to its build_step_mobility_table() list
+    """
+    board_mask = rules.compile_table('bitboards', build_rules_bitboards)[1]
+    step_tables = {(piece_type, color): build_step_mobility_table(piece_type, color, board_mask)
+                   for color in COLORS for piece_type in ('king', 'knight', 'pawn')}
+    return board_mask, step_tables
+
+
+class VariantEvaluator:
+    """
+    This class keeps a running score of a ChessVar game. Moves are made and taken back through
+    the evaluator's push_move() and pop_move() methods, which call the game's own push_move_idx()
+    and pop_move_idx() and change only the parts of the score touched by the move. A move changes
+    the mobility of the moved piece and of the sliders whose lines it opens or closes, and a
+    capture also removes the captured piece's mobility and moves one set of the opponent a step
+    closer to being lost.
+
+    Data members:
+        - self._game (the ChessVar being scored)
+        - self._board_mask (A bitboard of the squares on the board of the game's rules.)
+        - self._step_tables (The king, knight and pawn mobility tables for that board.)
+        - self._danger (A list with the total SET_DANGER of the white and of the black sets.)
+        - self._mobility (A list with the total mobility of the white and of the black pieces.)
+        - self._square_mobility (A list with the mobility of the piece on each of the 64
+        squares, 0 for an empty square.)
+        - self._occupied (A bitboard of every piece on the board.)
+        - self._straight_sliders (A bitboard of the rooks and queens of both colors.)
+        - self._diagonal_sliders (A bitboard of the bishops and queens of both colors.)
+        - self._stack (A list of what each move made through push_move() changed, so that
+        pop_move() can restore it.)
+
+    Methods:
+        - refresh(self)
+            - Computes both scores from the whole board.
+        - add_piece(self, piece_type, square)
+            - Adds a piece to the occupied squares and the slider bitboards.
+        - get_piece_mobility(self, piece_type, color, square)
+            - Returns the mobility of one piece.
+        - push_move(self, from_sq, to_sq)
+            - Makes a move on the game and updates the scores.
+        - pop_move(self)
+            - Takes back the last move and restores the scores.
+        - evaluate(self)
+            - Returns the score for the player whose turn it is.
+
+    Classes in communication with:
+        - ChessVar (The game being scored.)
+        - SearchEngine (Makes all of its moves through a VariantEvaluator.)
+    """
+
+    def __init__(self, game):
+        self._game = game
+        self._board_mask, self._step_tables = game.get_rules().compile_table(
+            'mobility', build_rules_mobility_tables)
+        self._danger = [0, 0]
+        self._mobility = [0, 0]
+        self._square_mobility = [0] * 64
+        self._occupied = 0
+        self._straight_sliders = 0
+        self._diagonal_sliders = 0
+        self._stack = []
+        self.refresh()
+
+    def refresh(self):
+        """
+        Computes the set danger and mobility scores from the whole board and both players'
+        captured pieces. This only needs to be called if the game was changed without going
+        through this evaluator.
+        """
+        game = self._game
+        self._danger = [0, 0]
+        self._mobility = [0, 0]
+        self._square_mobility = [0] * 64
+        self._occupied = 0
+        self._straight_sliders = 0
+        self._diagonal_sliders = 0
+        self._stack = []
+        for color_index, opponent in enumerate((game.get_black_player(), game.get_white_player())):
+            for piece_type in PIECE_TYPES:
+                self._danger[color_index] += SET_DANGER[opponent.get_remaining_count(piece_type)]
+        # every piece has to be on the bitboards before any slider's attacks are worked out
+        for square in range(64):
+            piece_type = game.get_piece_idx(square).get_type()
+            if piece_type != '':
+                self.add_piece(piece_type, square)
+        for square in range(64):
+            piece = game.get_piece_idx(square)
+            if piece.get_type() != '':
+                mobility = self.get_piece_mobility(piece.get_type(), piece.get_color(), square)
+                self._square_mobility[square] = mobility
+                self._mobility[COLORS.index(piece.get_color())] += mobility
+
+    def add_piece(self, piece_type, square):
+        """
+        Adds a piece to the occupied squares, and to the slider bitboards if it is a rook,
+        bishop or queen.
+
+        Parameters:
+            - piece_type: A string piece type. Example: 'rook'
+            - square: The index of the piece's square (0 to 63).
+        """
+        bit = 1 << square
+        self._occupied |= bit
+        if piece_type == 'rook' or piece_type == 'queen':
+            self._straight_sliders |= bit
+        if piece_type == 'bishop' or piece_type == 'queen':
+            self._diagonal_sliders |= bit
+
+    def get_piece_mobility(self, piece_type, color, square):
+        """
+        Returns the mobility of a piece: the number of squares on the board it attacks with the
+        pieces in self._occupied in the way, times its type's weight in MOBILITY_WEIGHTS.
+
+        Parameters:
+            - piece_type: A string piece type. Example: 'bishop'
+            - color: A string color. Example: 'black'
+            - square: The index of the piece's square (0 to 63).
+
+        Return value:
+            - mobility (an integer)
+        """
+        if piece_type == 'rook':
+            attacks = rook_attacks(square, self._occupied)
+        elif piece_type == 'bishop':
+            attacks = bishop_attacks(square, self._occupied)
+        elif piece_type == 'queen':
+            attacks = rook_attacks(square, self._occupied) | bishop_attacks(square, self._occupied)
+        else:
+            return self._step_tables[(piece_type, color)][square]
+        return bin(attacks & self._board_mask).count('1') * MOBILITY_WEIGHTS[piece_type]
+
+    def push_move(self, from_sq, to_sq):
+        """
+        Makes a move with the game's push_move_idx() and updates the scores for it. If the move
+        is not valid, nothing changes.
+
+        Parameters:
+            - from_sq: The index of the square moved from (0 to 63). Example: 48
+            - to_sq: The index of the square moved to (0 to 63). Example: 32
+
+        Return value:
+            - True: if the move was made
+            - False: if the move is not valid
+        """
+        game = self._game
+        moved_piece = game.get_piece_idx(from_sq)
+        captured_piece = game.get_piece_idx(to_sq)
+        if not game.push_move_idx(from_sq, to_sq):
+            return False
+
+        mobility = self._mobility
+        square_mobility = self._square_mobility
+        occupied = self._occupied
+        # the squares whose mobility is changed, with the mobility before the move
+        changed = [(from_sq, square_mobility[from_sq]), (to_sq, square_mobility[to_sq])]
+        self._stack.append((self._danger[0], self._danger[1], mobility[0], mobility[1], occupied,
+                            self._straight_sliders, self._diagonal_sliders, changed))
+        color_index = 0 if moved_piece.get_color() == 'white' else 1
+        captured_type = captured_piece.get_type()
+
+        # the sliders that see the square moved from have their lines opened, and the sliders
+        # that see the square moved to have their lines closed if it was empty
+        straight_seen = rook_attacks(from_sq, occupied)
+        diagonal_seen = bishop_attacks(from_sq, occupied)
+        if captured_type == '':
+            straight_seen |= rook_attacks(to_sq, occupied)
+            diagonal_seen |= bishop_attacks(to_sq, occupied)
+
+        mobility[color_index] -= square_mobility[from_sq]
+        square_mobility[from_sq] = 0
+        not_moved = ~((1 << from_sq) | (1 << to_sq))
+        self._occupied &= not_moved
+        self._straight_sliders &= not_moved
+        self._diagonal_sliders &= not_moved
+
+        if captured_type != '':
+            opponent_index = 1 - color_index
+            mobility[opponent_index] -= square_mobility[to_sq]
+            # the mover has already been given the capture, so this is the number left after it
+            mover = game.get_white_player() if color_index == 0 else game.get_black_player()
+            remaining = mover.get_remaining_count(captured_type)
+            self._danger[opponent_index] += SET_DANGER[remaining] - SET_DANGER[remaining + 1]
+
+        self.add_piece(moved_piece.get_type(), to_sq)
+        square_mobility[to_sq] = self.get_piece_mobility(moved_piece.get_type(),
+                                                         moved_piece.get_color(), to_sq)
+        mobility[color_index] += square_mobility[to_sq]
+
+        # the moved piece may see the square it came from, but it has already been scored
+        sliders = ((straight_seen & self._straight_sliders) |
+                   (diagonal_seen & self._diagonal_sliders)) & not_moved
+        while sliders:
+            bit = sliders & -sliders
+            sliders ^= bit
+            square = bit.bit_length() - 1
+            piece = game.get_piece_idx(square)
+            changed.append((square, square_mobility[square]))
+            square_mobility[square] = self.get_piece_mobility(piece.get_type(), piece.get_color(),
+                                                              square)
+            mobility[COLORS.index(piece.get_color())] += square_mobility[square] - changed[-1][1]
+        return True
+
+    def pop_move(self):
+        """
+        Takes back the last move made with push_move() and restores the scores from before it.
+
+        Return value:
+            - A (from_sq, to_sq) tuple of the square indices of the move that was taken back.
+        """
+        (self._danger[0], self._danger[1], self._mobility[0], self._mobility[1], self._occupied,
+         self._straight_sliders, self._diagonal_sliders, changed) = self._stack.pop()
+        for square, mobility in changed:
+            self._square_mobility[square] = mobility
+        return self._game.pop_move_idx()
+
+    def evaluate(self):
+        """
+        Returns the score of the position for the player whose turn it is. Positive scores are
+        good for that player. The score is the opponent's set danger minus the player's own,
+        plus the player's mobility minus the opponent's.
+
+        Return value:
+            - score (an integer)
+        """
+        score = self._danger[1] - self._danger[0] + self._mobility[0] - self._mobility[1]
+        if self._game.get_current_player().get_color() == 'white':
+            return score
+        return -score
+
+
+def evaluate(game):
+    """
+    Returns the score of a position for the player whose turn it is, computed from scratch. This
+    is the same score VariantEvaluator.evaluate() keeps up to date.
+
+    Parameters:
+        - game: A ChessVar object.
+
+    Return value:
+        - score (an integer)
+    """
+    return VariantEvaluator(game).evaluate()
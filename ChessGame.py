@@ -15,6 +15,512 @@
 # state of the game as such. At the end of 'make_move()', we set the current player to be the
 # opposite color if a valid move was made.
 
+import random
+from array import array
+
+# The piece types and colors in a fixed order. Other files use the position of a type or color
+# in these tuples as its index (for example, 'knight' is 1 and 'black' is 1).
+PIECE_TYPES = ('rook', 'knight', 'bishop', 'queen', 'king', 'pawn')
+COLORS = ('white', 'black')
+TYPE_INDICES = {piece_type: index for index, piece_type in enumerate(PIECE_TYPES)}
+
+# The algebraic notation of every square by its square index, and the index of every square by
+# its algebraic notation. The index of a square is row * 8 + column in ChessVar._board, so row 0
+# is rank 8: 'a8' is 0, 'h8' is 7 and 'h1' is 63.
+SQUARE_NAMES = [column + row for row in '87654321' for column in 'abcdefgh']
+SQUARE_INDICES = {name: index for index, name in enumerate(SQUARE_NAMES)}
+
+# The number of pieces of each type a player starts with. Capturing all of them wins the game.
+SET_SIZES = {'rook': 2, 'knight': 2, 'bishop': 2, 'queen': 1, 'king': 1, 'pawn': 8}
+
+# The bit of every piece type in the set masks of a Player (see Player.get_last_piece_mask()),
+# with 0 for an empty square so that a move onto an empty square never matches a mask.
+TYPE_BITS = {piece_type: 1 << index for index, piece_type in enumerate(PIECE_TYPES)}
+TYPE_BITS[''] = 0
+
+# Position strings, used by ChessVar.to_string() and ChessVar.load_string(). Like FEN in normal
+# chess, a position string has the rows of the board from rank 8 to rank 1 separated by '/',
+# where every piece is a letter (capital for white) and a digit is that many empty squares,
+# then 'w' or 'b' for the player to move. Since capturing a whole set wins, it also has the
+# captured counts of white and then black, one digit per type in the order of PIECE_TYPES.
+PIECE_LETTERS = {(piece_type, color): letter.upper() if color == 'white' else letter
+                 for color in COLORS for piece_type, letter in zip(PIECE_TYPES, 'rnbqkp')}
+START_POSITION = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w 000000 000000'
+# Turns every digit of a row into that many '.' characters, one for every empty square.
+_EMPTY_SQUARES_TABLE = str.maketrans({str(count): '.' * count for count in range(1, 9)})
+
+# Random 64-bit numbers used for Zobrist hashing of positions. The key of a position is the XOR
+# of one number for every (piece, square) on the board, one number for the captured count of
+# every (color, type), and ZOBRIST_BLACK_TO_MOVE if it is black's turn. A fixed seed is used so
+# that every process gets the same keys. An empty square and a count of 0 both use the number 0.
+_zobrist_random = random.Random(20231129)
+ZOBRIST_PIECE_KEYS = {(piece_type, color): [_zobrist_random.getrandbits(64) for square in range(64)]
+                      for color in COLORS for piece_type in PIECE_TYPES}
+ZOBRIST_PIECE_KEYS[('', '')] = [0] * 64
+ZOBRIST_CAPTURE_KEYS = {(color, piece_type): [0] + [_zobrist_random.getrandbits(64) for count in range(16)]
+                        for color in COLORS for piece_type in PIECE_TYPES}
+ZOBRIST_BLACK_TO_MOVE = _zobrist_random.getrandbits(64)
+
+# The (row, column) changes of every king and knight move.
+KING_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (1, 1), (-1, 1))
+KNIGHT_OFFSETS = ((-2, -1), (-2, 1), (2, -1), (2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2))
+
+
+def is_on_board(row, column, width=8, height=8):
+    """
+    Checks if a square is on a board of the given size. A board smaller than 8 by 8 uses the
+    bottom left corner of the 8 by 8 grid, so 'a1' is always row 7, column 0 and the square
+    indices and names stay the same.
+
+    Parameters:
+        - row: An integer row index. Example: 7
+        - column: An integer column index. Example: 0
+        - width: The number of columns of the board (1 to 8). Example: 6
+        - height: The number of rows of the board (1 to 8). Example: 6
+
+    Return value:
+        - True: if the square is on the board
+        - False: otherwise
+    """
+    return 8 - height <= row <= 7 and 0 <= column < width
+
+
+def build_coordinates_table(offsets, width=8, height=8):
+    """
+    Returns a list with an entry for each of the 64 squares (indexed by row * 8 + column). Each
+    entry is a tuple of the (row, column) coordinates reached by adding one of the given offsets
+    to that square, leaving out any that are off the board.
+
+    Parameters:
+        - offsets: A tuple of (row change, column change) tuples.
+        - width, height: The size of the board (see is_on_board()).
+
+    Return value:
+        - a list of 64 tuples of (row, column) tuples
+    """
+    table = []
+    for row in range(8):
+        for column in range(8):
+            table.append(tuple((row + row_change, column + column_change)
+                               for row_change, column_change in offsets
+                               if is_on_board(row + row_change, column + column_change, width, height)))
+    return table
+
+
+def build_pawn_move_table(color, double_step_rows, width=8, height=8):
+    """
+    Returns a list with an entry for each of the 64 squares (indexed by row * 8 + column). Each
+    entry is a tuple of the (row, column) coordinates a pawn of the given color can move forward
+    to from that square: two squares first if the square is on one of its double step rows,
+    then one square, leaving out any that are off the board.
+
+    Parameters:
+        - color: The color of the pawn, which moves towards row 0 if it is 'white'.
+        - double_step_rows: The row indices a pawn can move two squares from. Example: (6,)
+        - width, height: The size of the board (see is_on_board()).
+
+    Return value:
+        - a list of 64 tuples of (row, column) tuples
+    """
+    step = -1 if color == 'white' else 1
+    table = []
+    for row in range(8):
+        for column in range(8):
+            steps = (2, 1) if row in double_step_rows else (1,)
+            table.append(tuple((row + step * count, column) for count in steps
+                               if is_on_board(row + step * count, column, width, height)))
+    return table
+
+
+# Every square a king or a knight can reach from each square, worked out once when this file is
+# imported instead of on every move.
+KING_COORDINATES = build_coordinates_table(KING_OFFSETS)
+KNIGHT_COORDINATES = build_coordinates_table(KNIGHT_OFFSETS)
+
+# Every square a pawn of each color can move forward to from each square (two squares from its
+# starting row, one otherwise) and every diagonal square it could capture on.
+PAWN_MOVE_COORDINATES = {'white': build_pawn_move_table('white', (6,)),
+                         'black': build_pawn_move_table('black', (1,))}
+PAWN_CAPTURE_COORDINATES = {'white': build_coordinates_table(((-1, -1), (-1, 1))),
+                            'black': build_coordinates_table(((1, -1), (1, 1)))}
+
+# The (row, column) change of one step in each direction a rook or a bishop can slide. A queen
+# slides in all eight directions.
+ROOK_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+BISHOP_OFFSETS = ((-1, -1), (1, -1), (1, 1), (-1, 1))
+
+
+def build_rays_table(offsets, width=8, height=8):
+    """
+    Returns a list with an entry for each of the 64 squares (indexed by row * 8 + column). Each
+    entry is a tuple with one ray for every offset, and a ray is a tuple of the (row, column)
+    coordinates passed through by stepping from the square in that direction until the edge of
+    the board, nearest first.
+
+    Parameters:
+        - offsets: A tuple of (row change, column change) tuples.
+        - width, height: The size of the board (see is_on_board()).
+
+    Return value:
+        - a list of 64 tuples of rays
+    """
+    table = []
+    for row in range(8):
+        for column in range(8):
+            rays = []
+            for row_change, column_change in offsets:
+                ray = []
+                ray_row, ray_column = row + row_change, column + column_change
+                while is_on_board(ray_row, ray_column, width, height):
+                    ray.append((ray_row, ray_column))
+                    ray_row += row_change
+                    ray_column += column_change
+                rays.append(tuple(ray))
+            table.append(tuple(rays))
+    return table
+
+
+# The rays of a rook, bishop and queen from each square, worked out once when this file is
+# imported. Only the pieces in the way have to be checked on each move.
+ROOK_RAYS = build_rays_table(ROOK_OFFSETS)
+BISHOP_RAYS = build_rays_table(BISHOP_OFFSETS)
+QUEEN_RAYS = build_rays_table(ROOK_OFFSETS + BISHOP_OFFSETS)
+
+
+def pack_move(from_sq, to_sq):
+    """
+    Packs a move into one integer that fits in 16 bits: the index of the square moved from in
+    bits 6 to 11 and the index of the square moved to in bits 0 to 5. This is the same as
+    from_sq * 64 + to_sq.
+
+    Parameters:
+        - from_sq: The index of the square moved from (0 to 63). Example: 52
+        - to_sq: The index of the square moved to (0 to 63). Example: 36
+
+    Return value:
+        - the packed move (an integer from 0 to 4095)
+    """
+    return (from_sq << 6) | to_sq
+
+
+def unpack_move(move):
+    """
+    Returns the square indices of a packed move. This is the reverse of pack_move().
+
+    Parameters:
+        - move: A packed move. Example: 3364
+
+    Return value:
+        - from_sq: The index of the square moved from
+        - to_sq: The index of the square moved to
+    """
+    return move >> 6, move & 63
+
+
+def move_to_algebraic(move):
+    """
+    Returns a packed move in algebraic notation.
+
+    Parameters:
+        - move: A packed move. Example: 3364
+
+    Return value:
+        - a (square_moved_from, square_moved_to) tuple. Example: ('e2', 'e4')
+    """
+    return SQUARE_NAMES[move >> 6], SQUARE_NAMES[move & 63]
+
+
+def move_from_algebraic(square_moved_from, square_moved_to):
+    """
+    Returns the packed move of a move in algebraic notation. This is the reverse of
+    move_to_algebraic(). A KeyError is raised if a square is not on the board.
+
+    Parameters:
+        - square_moved_from: A string in algebraic notation. Example: 'e2'
+        - square_moved_to: A string in algebraic notation. Example: 'e4'
+
+    Return value:
+        - the packed move (an integer from 0 to 4095)
+    """
+    return (SQUARE_INDICES[square_moved_from] << 6) | SQUARE_INDICES[square_moved_to]
+
+
+def parse_position_string(text, width=8, height=8, set_sizes=SET_SIZES):
+    """
+    Reads a position string like START_POSITION. A ValueError is raised if the string is not a
+    position: the wrong number of rows or squares, an unknown letter, or captured counts that
+    are larger than a set or show that both players have won. A position of a smaller board has
+    height rows of width squares, and it is put in the bottom left corner of the board returned.
+
+    Parameters:
+        - text: A position string. Example: START_POSITION
+        - width, height: The size of the board (see is_on_board()).
+        - set_sizes: The number of pieces of each type that have to be captured to win.
+
+    Return value:
+        - board: A list of 8 lists of 8 'Piece' objects, like ChessVar._board
+        - color: The color of the player to move ('white' or 'black')
+        - white_counts: A list of white's captured counts in the order of PIECE_TYPES
+        - black_counts: A list of black's captured counts in the order of PIECE_TYPES
+    """
+    fields = text.split()
+    if len(fields) != 4 or fields[1] not in ('w', 'b'):
+        raise ValueError('not a position string: %r' % text)
+    rows = fields[0].translate(_EMPTY_SQUARES_TABLE).split('/')
+    if len(rows) != height or any(len(row) != width for row in rows):
+        raise ValueError('a position string needs %d rows of %d squares: %r' % (height, width, text))
+    try:
+        board = [[LETTER_PIECES[letter] for letter in row.ljust(8, '.')]
+                 for row in ['.' * 8] * (8 - height) + rows]
+    except KeyError as error:
+        raise ValueError('unknown piece %s in position string: %r' % (error, text)) from None
+
+    counts = []
+    for field in fields[2:]:
+        if len(field) != len(PIECE_TYPES) or not field.isdigit():
+            raise ValueError('captured counts need one digit per piece type: %r' % text)
+        counts.append([int(digit) for digit in field])
+    for player_counts in counts:
+        if any(count > set_sizes[piece_type] for piece_type, count in zip(PIECE_TYPES, player_counts)):
+            raise ValueError('more pieces captured than a player has: %r' % text)
+    if all(has_full_set(player_counts, set_sizes) for player_counts in counts):
+        raise ValueError('both players have captured a whole set: %r' % text)
+    return board, 'white' if fields[1] == 'w' else 'black', counts[0], counts[1]
+
+
+def has_full_set(counts, set_sizes=SET_SIZES):
+    """
+    Checks if a list of captured counts has all the pieces of some type, which wins the game.
+
+    Parameters:
+        - counts: A list of captured counts in the order of PIECE_TYPES. Example: [0, 2, 0, 0, 0, 3]
+        - set_sizes: The number of pieces of each type that have to be captured to win.
+
+    Return value:
+        - True: if every piece of some type was captured
+        - False: otherwise
+    """
+    return any(count == set_sizes[piece_type] for piece_type, count in zip(PIECE_TYPES, counts))
+
+
+class ChessRules:
+    """
+    This class holds the rules of a version of the variant: the starting position, the size of
+    the board, how many pieces of each type have to be captured to win, and which rows pawns can
+    move two squares from. The move tables of ChessVar (every square a king or knight can reach,
+    the rays of the sliding pieces and the pawn moves) are built from the rules once when the
+    rules are made, and every game using the same rules shares them, so a game with other rules
+    makes its moves exactly as fast as a normal game. Boards smaller than 8 by 8 use the bottom
+    left corner of the 8 by 8 grid, so squares keep their names and indices.
+
+    Data members:
+        - self._width, self._height (The number of columns and rows of the board, 1 to 8.)
+        - self._set_sizes (A dictionary with the number of captures of each type that wins.)
+        - self._double_step_rows (A dictionary with the row indices each color's pawns can move
+        two squares from.)
+        - self._start_position (The position string of the starting position.)
+        - self._start_board (The starting board as a tuple of 8 tuples of 'Piece' objects.)
+        - self._start_color (The color of the player who moves first.)
+        - self._start_counts (The captured counts of white and black at the start.)
+        - self._tables (A dictionary of the move tables built from the rules, by name.)
+
+    Methods:
+        - get_width(self), get_height(self), get_start_position(self), get_start_color(self)
+            - Return the data members.
+        - get_set_sizes(self)
+            - Returns a copy of the number of captures of each type that wins.
+        - get_set_size_list(self)
+            - Returns the same numbers as a tuple in the order of PIECE_TYPES.
+        - get_double_step_rows(self, color)
+            - Returns the rows a pawn of a color can move two squares from.
+        - get_start_board(self)
+            - Returns a new list of 8 lists with the starting board.
+        - get_start_counts(self)
+            - Returns the captured counts of both players at the start.
+        - parse_position(self, text)
+            - Reads a position string of a board of these rules.
+        - get_table(self, name)
+            - Returns a move table built from the rules.
+        - compile_table(self, name, builder)
+            - Builds a table from the rules the first time it is asked for and returns it.
+
+    Classes in communication with:
+        - ChessVar (A game plays by one ChessRules object and uses its move tables.)
+        - Player (Is given the number of captures of each type that wins.)
+    """
+
+    def __init__(self, start_position=None, width=8, height=8, capture_targets=None,
+                 double_step_ranks=None):
+        if not (1 <= width <= 8 and 1 <= height <= 8):
+            raise ValueError('a board has 1 to 8 columns and 1 to 8 rows')
+        self._width = width
+        self._height = height
+
+        # captures needed to win, the normal sets unless changed for some types
+        self._set_sizes = dict(SET_SIZES)
+        for piece_type, count in (capture_targets or {}).items():
+            if piece_type not in SET_SIZES:
+                raise ValueError('there is no piece type %r' % piece_type)
+            if not 1 <= count <= 8:
+                raise ValueError('a capture target is from 1 to 8 pieces')
+            self._set_sizes[piece_type] = count
+
+        # pawns move two squares from the second rank of their side unless other ranks are given
+        if double_step_ranks is None:
+            double_step_ranks = {'white': (2,), 'black': (height - 1,)}
+        self._double_step_rows = {color: tuple(8 - rank for rank in double_step_ranks.get(color, ()))
+                                  for color in COLORS}
+
+        if start_position is None:
+            if width != 8 or height != 8:
+                raise ValueError('a board that is not 8 by 8 needs a start position')
+            start_position = START_POSITION
+        self._start_position = start_position
+        board, self._start_color, white_counts, black_counts = self.parse_position(start_position)
+        self._start_board = tuple(tuple(row) for row in board)
+        self._start_counts = (tuple(white_counts), tuple(black_counts))
+
+        self._tables = {
+            'king': build_coordinates_table(KING_OFFSETS, width, height),
+            'knight': build_coordinates_table(KNIGHT_OFFSETS, width, height),
+            'pawn_moves': {color: build_pawn_move_table(color, self._double_step_rows[color], width, height)
+                           for color in COLORS},
+            'pawn_captures': {'white': build_coordinates_table(((-1, -1), (-1, 1)), width, height),
+                              'black': build_coordinates_table(((1, -1), (1, 1)), width, height)},
+            'rook_rays': build_rays_table(ROOK_OFFSETS, width, height),
+            'bishop_rays': build_rays_table(BISHOP_OFFSETS, width, height),
+            'queen_rays': build_rays_table(ROOK_OFFSETS + BISHOP_OFFSETS, width, height)}
+
+    def get_width(self):
+        """
+        Returns the number of columns of the board.
+
+        Return value:
+            - number of columns (an integer from 1 to 8)
+        """
+        return self._width
+
+    def get_height(self):
+        """
+        Returns the number of rows of the board.
+
+        Return value:
+            - number of rows (an integer from 1 to 8)
+        """
+        return self._height
+
+    def get_start_position(self):
+        """
+        Returns the starting position.
+
+        Return value:
+            - a position string. Example: START_POSITION
+        """
+        return self._start_position
+
+    def get_start_color(self):
+        """
+        Returns the color of the player who moves first.
+
+        Return value:
+            - 'white' or 'black'
+        """
+        return self._start_color
+
+    def get_set_sizes(self):
+        """
+        Returns the number of pieces of each type a player has to capture to win.
+
+        Return value:
+            - a new dictionary like SET_SIZES
+        """
+        return dict(self._set_sizes)
+
+    def get_set_size_list(self):
+        """
+        Returns the number of pieces of each type a player has to capture to win, in the order
+        of PIECE_TYPES.
+
+        Return value:
+            - a tuple of 6 integers. Example: (2, 2, 2, 1, 1, 8)
+        """
+        return tuple(self._set_sizes[piece_type] for piece_type in PIECE_TYPES)
+
+    def get_double_step_rows(self, color):
+        """
+        Returns the row indices a pawn of a color can move two squares from.
+
+        Parameters:
+            - color: 'white' or 'black'
+
+        Return value:
+            - a tuple of row indices. Example: (6,) for white on a normal board
+        """
+        return self._double_step_rows[color]
+
+    def get_start_board(self):
+        """
+        Returns the starting board as a new list of 8 lists of 'Piece' objects, which a game can
+        change without changing the rules.
+
+        Return value:
+            - a list of 8 lists of 8 'Piece' objects
+        """
+        return [list(row) for row in self._start_board]
+
+    def get_start_counts(self):
+        """
+        Returns the captured counts of both players in the starting position.
+
+        Return value:
+            - white_counts, black_counts: Tuples of captured counts in the order of PIECE_TYPES
+        """
+        return self._start_counts
+
+    def parse_position(self, text):
+        """
+        Reads a position string of a board with these rules' size and capture targets, the same
+        way as parse_position_string().
+
+        Parameters:
+            - text: A position string.
+
+        Return value:
+            - the board, color, white_counts and black_counts of parse_position_string()
+        """
+        return parse_position_string(text, self._width, self._height, self._set_sizes)
+
+    def get_table(self, name):
+        """
+        Returns one of the move tables built from the rules.
+
+        Parameters:
+            - name: 'king', 'knight', 'pawn_moves', 'pawn_captures', 'rook_rays', 'bishop_rays'
+            or 'queen_rays', or the name given to compile_table().
+
+        Return value:
+            - the table, like KING_COORDINATES or the other tables of the same kind
+        """
+        return self._tables[name]
+
+    def compile_table(self, name, builder):
+        """
+        Returns a table built from the rules by another part of the program, for example the
+        bitboards of BitboardChessVar. The table is built the first time it is asked for and
+        kept, so every game with these rules shares it.
+
+        Parameters:
+            - name: The name of the table. Example: 'bitboard_pawn_moves'
+            - builder: A function that takes the rules and returns the table.
+
+        Return value:
+            - the table
+        """
+        if name not in self._tables:
+            self._tables[name] = builder(self)
+        return self._tables[name]
+
+
 class ChessVar:
     """This class implements a modified game of chess. The pieces begin in their traditional squares,
     and white moves first, but the winner is the first player to capture all of an opponent's pieces
@@ -30,101 +536,171 @@ class ChessVar:
         - self._game_state (Will initially be set to 'UNFINISHED,' but can have a value of either
         'UNFINISHED', 'WHITE_WON', or 'BLACK_WON')
         - self._white_player (Calls upon the class 'Player'. An object of type 'Player' has a color
-        and a dictionary with the quantities of pieces that player has captured. Having a white player
-        makes it so we can easily access their dictionary and keep track of if the game's
+        and the quantities of pieces that player has captured. Having a white player
+        makes it so we can easily access their captured pieces and keep track of if the game's
         white player wins. )
         - self._black_player (Calls upon the class 'Player'. An object of type 'Player' has a color
-        and a dictionary with the quantities of pieces that player has captured. Having a black player
-        makes it so we can easily access their dictionary and keep track of if the game's
+        and the quantities of pieces that player has captured. Having a black player
+        makes it so we can easily access their captured pieces and keep track of if the game's
         black player wins.)
         - self._current_player (Will be initially set to self._white_player. Helps to keep track of
         whose turn it is.)
         - self._reference_dict (Will be a dictionary that can be used to translate a given square's
         algebraic notation to its actual row and column indices in self._board. For example: 'a': 0,
         'b':1, '1': 0, '2': 1 and so on.)
+        - self._move_stack (A list with one tuple for every move made with push_move(). Each tuple
+        has the indices of the squares moved from and to, the moved piece, the captured piece, and the current
+        player, state of the game and position key before the move, so that pop_move() can take
+        it back.)
+        - self._position_key (A 64-bit Zobrist key for the position: the pieces on the board,
+        whose turn it is, and how many pieces of each type both players have captured. It is
+        updated by every move instead of being computed again from the whole board.)
+        - self._rules (The 'ChessRules' the game is played by, STANDARD_RULES unless others are
+        given.)
+        - self._king_coordinates, self._knight_coordinates, self._pawn_move_coordinates,
+        self._pawn_capture_coordinates, self._rook_rays, self._bishop_rays, self._queen_rays
+        (The move tables of self._rules, kept here so a move only has to look them up.)
 
     Methods:
         - init method
-            - Initializes self._board to mimic a standard chess board setup with 64 pieces of particular
-            types in their usual starting spots.
+            - Initializes self._board to the starting board of the rules, which is a standard
+            chess board setup with 64 pieces of particular types in their usual starting spots
+            unless other rules are given.
             - Initializes self._game_state to be 'UNFINISHED'.
             - Initializes self._white_player to be Player('white').
             - Initializes self._black_player to be Player('black').
-            - Initializes self._current_player to be self._white_player.
+            - Initializes self._current_player to be self._white_player (or the player the rules
+            start with).
             - Initializes self._reference_dict to be the following:
                         {'a':0,'b':1,'c':2,'d':3,'e':4,'f':5,'g':6,'h':7,
                         '1':7,'2':6,'3':5,'4':4,'5':3,'6':2,'7':1,'8':0}.
+            - Initializes self._move_stack to be an empty list.
+            - Initializes self._position_key to be the key of the starting position.
         - get_game_state(self)
             - Returns the state of the game.
         - set_game_state(self, state)
             - Sets the state of the game to be the given state (string).
         - set_current_player(self, player)
             - Sets the current player to be the player we send it.
+        - get_current_player(self), get_white_player(self), get_black_player(self)
+            - Return the current player, the white player, and the black player.
+        - get_piece(self, square)
+            - Returns the piece on a square given in algebraic notation.
+        - get_piece_idx(self, square)
+            - Returns the piece on a square given by its index.
         - make_move(self, square_moved_from, square_moved_to)
             - Given a square the player is moving from and the square the player wants to move
             to, this method returns True if the move is valid and False otherwise.
+        - make_move_idx(self, from_sq, to_sq)
+            - Same as 'make_move()', with the squares given by their indices (0 to 63).
+        - is_legal(self, square_moved_from, square_moved_to), is_legal_idx(self, from_sq, to_sq)
+            - Return True if a move is valid and False otherwise, without changing anything.
+        - apply_move(self, square_moved_from, square_moved_to), apply_move_idx(self, from_sq, to_sq)
+            - Make a move that is already known to be valid, including any capture, and
+            change whose turn it is.
+        - push_move(self, square_moved_from, square_moved_to), push_move_idx(self, from_sq, to_sq)
+            - Make a move like 'make_move()' and remember it so it can be taken back.
+        - push_legal_move_idx(self, from_sq, to_sq)
+            - Make and remember a move that is already known to be valid, without checking it.
+        - pop_move(self), pop_move_idx(self)
+            - Take back the last move made with 'push_move()' or 'push_move_idx()'.
+        - position_key(self)
+            - Returns the 64-bit Zobrist key of the position.
+        - compute_position_key(self)
+            - Computes the Zobrist key of the position from scratch.
+        - to_string(self)
+            - Returns the position as a position string (see START_POSITION).
+        - load_string(self, text)
+            - Sets up the position of a position string on this game.
+        - from_string(cls, text)
+            - Returns a new game in the position of a position string.
+        - load_board(self, board)
+            - Sets the board to a list of 8 lists of 'Piece' objects.
+        - set_position(self, board, color, white_counts, black_counts)
+            - Sets the board, the player to move and both players' captured counts.
+        - get_rules(self)
+            - Returns the rules the game is played by.
+        - set_square(self, column, row, piece)
+            - Puts a piece on a square of the board.
+        - move_piece(self, column_from, row_from, column_to, row_to)
+            - Moves a piece from one square to another and returns the piece captured there.
+        - get_square_indices(self, square)
+            - Translates a square in algebraic notation to its column and row indices.
+        - get_square_name(self, column, row)
+            - Translates column and row indices to the square's algebraic notation.
+        - legal_moves_from(self, square), legal_moves_from_idx(self, from_sq)
+            - Return every move the current player can make with the piece on a square, without
+            changing the state of the game.
+        - legal_moves(self), legal_moves_idx(self)
+            - Return every move the current player can make, without changing the state of
+            the game. The _idx versions return packed moves instead of pairs of strings.
         - is_valid_move_king(self, column_from, row_from, column_to, row_to)
-            - This method is called inside 'make_move' and returns True if a given move is valid
+            - This method is called inside 'is_legal' and returns True if a given move is valid
             for a piece of type 'king' and False otherwise.
+        - get_coordinates_list_king(self, column_from, row_from)
+            - Returns a list of all the coordinates a king on a square could move to. The
+            other get_coordinates_list_(piecetype) methods do the same for the queen, rook,
+            bishop, and knight, and get_coordinates_lists_pawn returns separate lists of
+            forward moves and captures for a pawn.
+        - get_coordinates_list_rays(self, rays)
+            - Returns the coordinates a queen, rook or bishop can move to by following its
+            precomputed rays until a piece is in the way.
         - is_valid_move_queen(self, column_from, row_from, column_to, row_to)
-            - This method is called inside 'make_move' and returns True if a given move is valid
+            - This method is called inside 'is_legal' and returns True if a given move is valid
             for a piece of type 'queen' and False otherwise.
         - is_valid_move_rook(self, column_from, row_from, column_to, row_to)
-            - This method is called inside 'make_move' and returns True if a given move is valid
+            - This method is called inside 'is_legal' and returns True if a given move is valid
             for a piece of type 'rook' and False otherwise.
         - is_valid_move_bishop(self, column_from, row_from, column_to, row_to)
-            - This method is called inside 'make_move' and returns True if a given move is valid
+            - This method is called inside 'is_legal' and returns True if a given move is valid
             for a piece of type 'bishop' and False otherwise.
         - is_valid_move_knight(self, column_from, row_from, column_to, row_to)
-            - This method is called inside 'make_move' and returns True if a given move is valid
+            - This method is called inside 'is_legal' and returns True if a given move is valid
             for a piece of type 'knight' and False otherwise.
         - is_valid_move_pawn(self, column_from, row_from, column_to, row_to)
-            - This method is called inside 'make_move' and returns True if a given move is valid
+            - This method is called inside 'is_legal' and returns True if a given move is valid
             for a piece of type 'pawn' and False otherwise.
-        - validate_coordinates_list(self, coordinates_list, column_from, row_from, column_to, row_to, piece_type)
+        - validate_coordinates_list(self, coordinates_list, column_to, row_to)
             - This method is called inside each is_valid_move_(piecetype) method. It sees if
-            a specific move can be made for a specific piece, and if so makes the move as well as any
-            capture. It returns True if the move was made and False otherwise.
+            a specific move can be made for a specific piece. It returns True if the move is valid
+            and False otherwise.
         - display_board(self)
             - Displays the board in an organized manner.
         - check_if_winner(self)
             - Checks if self._current_player has won the game.
+        - is_winning_move_idx(self, from_sq, to_sq)
+            - Returns True if a legal move would win the game at once.
 
     Classes in communication with:
         - Piece (A ChessVar object has a board filled with 64 elements of type 'Piece'.)
         - Player (A ChessVar object has a white player, black player, and a current player being
         either the white or black player.)
+        - ChessRules (The rules of the game, with its starting position and move tables.)
     """
 
-    def __init__(self):
-        self._board = [[Piece('rook','black'), Piece('knight','black'),
-                        Piece('bishop','black'), Piece('queen','black'),
-                        Piece('king','black'), Piece('bishop','black'),
-                        Piece('knight','black'), Piece('rook','black')],
-                       [Piece('pawn','black'), Piece('pawn','black'),
-                        Piece('pawn','black'), Piece('pawn','black'),
-                        Piece('pawn','black'), Piece('pawn','black'),
-                        Piece('pawn','black'), Piece('pawn','black')],
-                       [Piece(), Piece(), Piece(), Piece(), Piece(), Piece(), Piece(), Piece()],
-                       [Piece(), Piece(), Piece(), Piece(), Piece(), Piece(), Piece(), Piece()],
-                       [Piece(), Piece(), Piece(), Piece(), Piece(), Piece(), Piece(), Piece()],
-                       [Piece(), Piece(), Piece(), Piece(), Piece(), Piece(), Piece(), Piece()],
-                       [Piece('pawn','white'), Piece('pawn','white'),
-                        Piece('pawn','white'), Piece('pawn','white'),
-                        Piece('pawn','white'), Piece('pawn','white'),
-                        Piece('pawn','white'), Piece('pawn','white')],
-                       [Piece('rook','white'), Piece('knight','white'),
-                        Piece('bishop','white'), Piece('queen','white'),
-                        Piece('king','white'), Piece('bishop','white'),
-                        Piece('knight','white'), Piece('rook','white')]]
+    def __init__(self, rules=None):
+        self._rules = STANDARD_RULES if rules is None else rules
+        self._king_coordinates = self._rules.get_table('king')
+        self._knight_coordinates = self._rules.get_table('knight')
+        self._pawn_move_coordinates = self._rules.get_table('pawn_moves')
+        self._pawn_capture_coordinates = self._rules.get_table('pawn_captures')
+        self._rook_rays = self._rules.get_table('rook_rays')
+        self._bishop_rays = self._rules.get_table('bishop_rays')
+        self._queen_rays = self._rules.get_table('queen_rays')
         self._game_state = 'UNFINISHED'
-        self._white_player = Player('white')
-        self._black_player = Player('black')
+        self._white_player = Player('white', self._rules.get_set_size_list())
+        self._black_player = Player('black', self._rules.get_set_size_list())
         self._current_player = self._white_player
         # This dictionary is used to translate a given square's algebraic notation to its actual
         # row and column indices in self._board.
         self._reference_dict = {'a':0,'b':1,'c':2,'d':3,'e':4,'f':5,'g':6,'h':7,
                                 '1':7,'2':6,'3':5,'4':4,'5':3,'6':2,'7':1,'8':0}
+        # Moves made with push_move() that can be taken back with pop_move().
+        self._move_stack = []
+        # the board comes from the rules, so a game with other rules starts in its own position
+        white_counts, black_counts = self._rules.get_start_counts()
+        self.set_position(self._rules.get_start_board(), self._rules.get_start_color(),
+                          white_counts, black_counts)
 
     def get_game_state(self):
         """
@@ -138,117 +714,672 @@ class ChessVar:
         """
         Sets the game state to be 'UNFINISHED', 'WHITE_WON', or 'BLACK_WON'
         Parameters:
-            - state: will be either 'UNFINISHED', 'WHITE_WON', or 'BLACK_WON'
+            - state: will be either 'UNFINISHED', 'WHITE_WON', or 'BLACK_WON'
+        """
+        self._game_state = state
+
+    def set_current_player(self, player):
+        """
+        Sets the current player to be the class's black player or white player.
+        Parameters:
+            - player: will be either self._white_player or self._black_player
+        """
+        self._current_player = player
+
+    def get_current_player(self):
+        """
+        Returns the player whose turn it is.
+
+        Return value:
+            - self._white_player or self._black_player
+        """
+        return self._current_player
+
+    def get_white_player(self):
+        """
+        Returns the white player.
+
+        Return value:
+            - self._white_player
+        """
+        return self._white_player
+
+    def get_black_player(self):
+        """
+        Returns the black player.
+
+        Return value:
+            - self._black_player
+        """
+        return self._black_player
+
+    def get_piece(self, square):
+        """
+        Returns the piece on a square.
+
+        Parameters:
+            - square: A string in algebraic notation. Example: 'a1'
+
+        Return value:
+            - the 'Piece' on that square (an empty Piece if there is no piece there)
+        """
+        column, row = self.get_square_indices(square)
+        return self._board[row][column]
+
+    def get_piece_idx(self, square):
+        """
+        Returns the piece on the square with the given index.
+
+        Parameters:
+            - square: The index of the square (0 to 63). Example: 0
+
+        Return value:
+            - the 'Piece' on that square (an empty Piece if there is no piece there)
+        """
+        return self._board[square >> 3][square & 7]
+
+    def make_move(self, square_moved_from, square_moved_to):
+        """
+        Given a starting square and an ending square, this method returns True if that move can
+        be made and returns False otherwise. We first use 'is_legal()' to see if the move is
+        valid. If it is not, nothing changes and we return False. Otherwise we use 'apply_move()'
+        to move the piece, make any capture, update the state of the game if the player has won,
+        and change whose turn it is. Then we return True since a valid move has been made.
+        The squares are translated to square indices and the move is made by 'make_move_idx()'.
+
+        Parameters:
+            - square_moved_from: A string in algebraic notation that represents the square on the
+            chess board that the player wants to start at. Example: 'a1'
+            - square_moved_to: A string in algebraic notation that represents the square on the
+            chess board that the player wants to move a piece to. Example: 'b3'
+
+        Return value:
+            - True: if a valid move was made
+            - False: if the move is not valid and nothing occurs
+        """
+
+        column_from, row_from = self.get_square_indices(square_moved_from)
+        column_to, row_to = self.get_square_indices(square_moved_to)
+        return self.make_move_idx(row_from * 8 + column_from, row_to * 8 + column_to)
+
+    def make_move_idx(self, from_sq, to_sq):
+        """
+        Makes a move given by square indices, the same way as 'make_move()'. The index of a
+        square is row * 8 + column in self._board, so 'a8' is 0 and 'h1' is 63. Programs that make
+        many moves should use this method, since no strings have to be read.
+
+        Parameters:
+            - from_sq: The index of the square moved from (0 to 63). Example: 52
+            - to_sq: The index of the square moved to (0 to 63). Example: 36
+
+        Return value:
+            - True: if a valid move was made
+            - False: if the move is not valid and nothing occurs
+        """
+
+        # the move the player wanted to make is not valid, return False
+        if not self.is_legal_idx(from_sq, to_sq):
+            return False
+
+        self.apply_move_idx(from_sq, to_sq)
+
+        # a valid move was made, return True
+        return True
+
+    def is_legal(self, square_moved_from, square_moved_to):
+        """
+        Given a starting square and an ending square, this method returns True if the current
+        player can make that move and returns False otherwise. The squares are translated to
+        square indices and checked by 'is_legal_idx()'. This method only reads the board, so it
+        never changes the board, the players, or the state of the game, and it can be called
+        from many threads at once as long as no move is being applied at the same time.
+
+        Parameters:
+            - square_moved_from: A string in algebraic notation that represents the square on the
+            chess board that the player wants to start at. Example: 'a1'
+            - square_moved_to: A string in algebraic notation that represents the square on the
+            chess board that the player wants to move a piece to. Example: 'b3'
+
+        Return value:
+            - True: if the move is valid
+            - False: if the move is not valid
+        """
+
+        # get the row and column indices of the square moving from and the square moving to
+        column_from, row_from = self.get_square_indices(square_moved_from)
+        column_to, row_to = self.get_square_indices(square_moved_to)
+        return self.is_legal_idx(row_from * 8 + column_from, row_to * 8 + column_to)
+
+    def is_legal_idx(self, from_sq, to_sq):
+        """
+        Given the index of a starting square and an ending square, this method returns True if
+        the current player can make that move and returns False otherwise. If the piece being
+        moved does not match the current player's color, we return False. If a piece does not
+        exist in the square moved from, we return False. If the game has already been won, we
+        return False. Otherwise we ask the is_valid_move_(piecetype) method for the piece being
+        moved. Nothing is changed. An index outside 0 to 63 is not a square, so we return False.
+
+        Parameters:
+            - from_sq: The index of the square moved from (0 to 63). Example: 52
+            - to_sq: The index of the square moved to (0 to 63). Example: 36
+
+        Return value:
+            - True: if the move is valid
+            - False: if the move is not valid
+        """
+
+        # make sure both indices are squares, since a negative index would still find a square
+        if not (0 <= from_sq < 64 and 0 <= to_sq < 64):
+            return False
+
+        row_from, column_from = from_sq >> 3, from_sq & 7
+        row_to, column_to = to_sq >> 3, to_sq & 7
+
+        # get the specific piece being moved
+        piece_being_moved = self._board[row_from][column_from]
+
+        # make sure a piece is in the square we are moving from
+        if piece_being_moved.get_type() == '':
+            return False
+
+        # make sure the piece being moved matches the current player's color
+        if piece_being_moved.get_color() != self._current_player.get_color():
+            return False
+
+        # check status of game, must be unfinished to make a move
+        if self._game_state != "UNFINISHED":
+            return False
+
+        # Based on the type of the piece, call the method that checks if that piece can
+        # be moved to its desired square or not.
+        if piece_being_moved.get_type() == 'king':
+            return self.is_valid_move_king(column_from, row_from, column_to, row_to)
+
+        elif piece_being_moved.get_type() == 'queen':
+            return self.is_valid_move_queen(column_from, row_from, column_to, row_to)
+
+        elif piece_being_moved.get_type() == 'rook':
+            return self.is_valid_move_rook(column_from, row_from, column_to, row_to)
+
+        elif piece_being_moved.get_type() == 'bishop':
+            return self.is_valid_move_bishop(column_from, row_from, column_to, row_to)
+
+        elif piece_being_moved.get_type() == 'knight':
+            return self.is_valid_move_knight(column_from, row_from, column_to, row_to)
+
+        return self.is_valid_move_pawn(column_from, row_from, column_to, row_to)
+
+    def apply_move(self, square_moved_from, square_moved_to):
+        """
+        Makes a move that is already known to be valid, given in algebraic notation. The squares
+        are translated to square indices and the move is made by 'apply_move_idx()'.
+        * this method does not check the move, so 'is_legal()' must have returned True for it
+
+        Parameters:
+            - square_moved_from: A string in algebraic notation that represents the square on the
+            chess board that the player is moving a piece from. Example: 'a1'
+            - square_moved_to: A string in algebraic notation that represents the square on the
+            chess board that the player is moving a piece to. Example: 'b3'
+
+        Return value:
+            - captured_piece: the 'Piece' that was in square_moved_to before the move (an empty
+            Piece if nothing was captured)
+        """
+
+        column_from, row_from = self.get_square_indices(square_moved_from)
+        column_to, row_to = self.get_square_indices(square_moved_to)
+        return self.apply_move_idx(row_from * 8 + column_from, row_to * 8 + column_to)
+
+    def apply_move_idx(self, from_sq, to_sq):
+        """
+        Makes a move that is already known to be valid. The piece is moved to its new square,
+        and if a piece of the opposite color was there it is captured and added to the current
+        player's captured pieces. If the move causes the player to win, then we update the state
+        of the game. Then we change whose turn it is.
+        * this method does not check the move, so 'is_legal_idx()' must have returned True for it
+
+        Parameters:
+            - from_sq: The index of the square moved from (0 to 63). Example: 52
+            - to_sq: The index of the square moved to (0 to 63). Example: 36
+
+        Return value:
+            - captured_piece: the 'Piece' that was in the square moved to before the move (an
+            empty Piece if nothing was captured)
+        """
+
+        row_from, column_from = from_sq >> 3, from_sq & 7
+        row_to, column_to = to_sq >> 3, to_sq & 7
+
+        # move the piece, making the previous spot empty
+        moved_piece = self._board[row_from][column_from]
+        captured_piece = self.move_piece(column_from, row_from, column_to, row_to)
+
+        # update the position key for the moved piece, the captured piece and the turn
+        moved_keys = ZOBRIST_PIECE_KEYS[(moved_piece.get_type(), moved_piece.get_color())]
+        self._position_key ^= (moved_keys[from_sq] ^ moved_keys[to_sq] ^ ZOBRIST_BLACK_TO_MOVE ^
+                               ZOBRIST_PIECE_KEYS[(captured_piece.get_type(), captured_piece.get_color())][to_sq])
+
+        # add any capture to the current player's captured pieces
+        if captured_piece.get_type() != '':
+            self._current_player.add_captured_piece(captured_piece.get_type())
+            count = self._current_player.get_captured_count(captured_piece.get_type())
+            count_keys = ZOBRIST_CAPTURE_KEYS[(self._current_player.get_color(), captured_piece.get_type())]
+            self._position_key ^= count_keys[count - 1] ^ count_keys[count]
+
+        # check if the current player has won, if yes then update the state of the game
+        won = self.check_if_winner()
+        if won:
+            if self._current_player.get_color() == 'white':
+                self.set_game_state('WHITE_WON')
+            else:
+                self.set_game_state('BLACK_WON')
+
+        # a valid move has been made, so change player
+        if self._current_player == self._white_player:
+            self.set_current_player(self._black_player)
+        else:
+            self.set_current_player(self._white_player)
+
+        return captured_piece
+
+    def push_move(self, square_moved_from, square_moved_to):
+        """
+        Makes a move just like 'make_move()', but also remembers everything needed to take the
+        move back with 'pop_move()'. The squares are translated to square indices and the move
+        is made by 'push_move_idx()'.
+        * moves made with 'make_move()' are not remembered, so they can't be taken back
+
+        Parameters:
+            - square_moved_from: A string in algebraic notation that represents the square on the
+            chess board that the player wants to start at. Example: 'a1'
+            - square_moved_to: A string in algebraic notation that represents the square on the
+            chess board that the player wants to move a piece to. Example: 'b3'
+
+        Return value:
+            - True: if a valid move was made
+            - False: if the move is not valid and nothing occurs
+        """
+
+        column_from, row_from = self.get_square_indices(square_moved_from)
+        column_to, row_to = self.get_square_indices(square_moved_to)
+        return self.push_move_idx(row_from * 8 + column_from, row_to * 8 + column_to)
+
+    def push_move_idx(self, from_sq, to_sq):
+        """
+        Makes a move given by square indices just like 'make_move_idx()', and remembers
+        everything needed to take it back with 'pop_move_idx()' or 'pop_move()'. The squares of
+        the move, the piece that was moved, the piece that was captured (if any), the current
+        player, the state of the game and the position key before the move are added to
+        self._move_stack. If the move is not valid, nothing is added and we return False.
+
+        Parameters:
+            - from_sq: The index of the square moved from (0 to 63). Example: 52
+            - to_sq: The index of the square moved to (0 to 63). Example: 36
+
+        Return value:
+            - True: if a valid move was made
+            - False: if the move is not valid and nothing occurs
+        """
+
+        if not self.is_legal_idx(from_sq, to_sq):
+            return False
+
+        self.push_legal_move_idx(from_sq, to_sq)
+        return True
+
+    def push_legal_move_idx(self, from_sq, to_sq):
+        """
+        Makes a move given by square indices with 'apply_move_idx()' and remembers it the same
+        way as 'push_move_idx()', without checking it first. This is for moves that are already
+        known to be valid, like the moves of 'legal_moves_idx()', so they are not checked twice.
+        * the move must be one that 'is_legal_idx()' returns True for
+
+        Parameters:
+            - from_sq: The index of the square moved from (0 to 63). Example: 52
+            - to_sq: The index of the square moved to (0 to 63). Example: 36
+        """
+
+        moved_piece = self._board[from_sq >> 3][from_sq & 7]
+        previous_player = self._current_player
+        previous_game_state = self._game_state
+        previous_position_key = self._position_key
+
+        captured_piece = self.apply_move_idx(from_sq, to_sq)
+
+        self._move_stack.append((from_sq, to_sq, moved_piece, captured_piece,
+                                 previous_player, previous_game_state, previous_position_key))
+
+    def pop_move(self):
+        """
+        Takes back the last move made with 'push_move()' or 'push_move_idx()', the same way as
+        'pop_move_idx()'.
+
+        Return value:
+            - A (square_moved_from, square_moved_to) tuple in algebraic notation of the move that
+            was taken back. An IndexError is raised if there is no move to take back.
+        """
+
+        from_sq, to_sq = self.pop_move_idx()
+        return SQUARE_NAMES[from_sq], SQUARE_NAMES[to_sq]
+
+    def pop_move_idx(self):
+        """
+        Takes back the last move made with 'push_move()' or 'push_move_idx()'. The moved piece
+        goes back to the square it came from, any captured piece is put back and removed from
+        the capturing player's captured pieces, and the current player and the state of the
+        game are set back to what they were before the move. Only the two squares of the move
+        are changed.
+
+        Return value:
+            - A (from_sq, to_sq) tuple of the square indices of the move that was taken back.
+            An IndexError is raised if there is no move to take back.
+        """
+
+        (from_sq, to_sq, moved_piece, captured_piece,
+         previous_player, previous_game_state, previous_position_key) = self._move_stack.pop()
+
+        # put both pieces back
+        self.set_square(from_sq & 7, from_sq >> 3, moved_piece)
+        self.set_square(to_sq & 7, to_sq >> 3, captured_piece)
+
+        # the player who made the move no longer has the captured piece
+        if captured_piece.get_type() != '':
+            previous_player.remove_captured_piece(captured_piece.get_type())
+
+        self._current_player = previous_player
+        self._game_state = previous_game_state
+        self._position_key = previous_position_key
+        return from_sq, to_sq
+
+    def position_key(self):
+        """
+        Returns the 64-bit Zobrist key of the position. Two games with the same pieces on the
+        same squares, the same player to move, and the same captured counts for both players
+        have the same key, so it can be used to find repeated positions or store evaluations.
+        The key is kept up to date by 'apply_move()' and 'pop_move()'.
+
+        Return value:
+            - position key (an integer from 0 to 2**64 - 1)
+        """
+        return self._position_key
+
+    def compute_position_key(self):
+        """
+        Computes the Zobrist key of the position from the whole board, the current player and
+        both players' captured pieces. This is only needed when a position is set up some other
+        way than by making moves, since moves update the key themselves.
+
+        Return value:
+            - position key (an integer from 0 to 2**64 - 1)
+        """
+        key = 0
+        for row in range(8):
+            for column in range(8):
+                piece = self._board[row][column]
+                key ^= ZOBRIST_PIECE_KEYS[(piece.get_type(), piece.get_color())][row * 8 + column]
+        for player in (self._white_player, self._black_player):
+            for piece_type, count in player.get_captured_pieces().items():
+                key ^= ZOBRIST_CAPTURE_KEYS[(player.get_color(), piece_type)][count]
+        if self._current_player.get_color() == 'black':
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        return key
+
+    def to_string(self):
+        """
+        Returns the position as a position string: the board, the player to move and both
+        players' captured counts, which is everything needed to go on playing from here. The
+        moves that reached the position are not included. Only the squares of the rules' board
+        are written.
+
+        Return value:
+            - a position string. Example: START_POSITION for a new game
+        """
+        rows = []
+        width = self._rules.get_width()
+        for row in range(8 - self._rules.get_height(), 8):
+            text = ''
+            empty_squares = 0
+            for square in range(row * 8, row * 8 + width):
+                piece = self.get_piece_idx(square)
+                if piece.get_type() == '':
+                    empty_squares += 1
+                    continue
+                if empty_squares:
+                    text += str(empty_squares)
+                    empty_squares = 0
+                text += PIECE_LETTERS[(piece.get_type(), piece.get_color())]
+            if empty_squares:
+                text += str(empty_squares)
+            rows.append(text)
+        counts = [''.join(str(player.get_captured_count(piece_type)) for piece_type in PIECE_TYPES)
+                  for player in (self._white_player, self._black_player)]
+        return '%s %s %s %s' % ('/'.join(rows), self._current_player.get_color()[0], counts[0], counts[1])
+
+    def load_string(self, text):
+        """
+        Sets up the position of a position string on this game, replacing the board, whose turn
+        it is and both players' captured pieces. The state of the game is 'WHITE_WON' or
+        'BLACK_WON' if that player's captured counts include a whole set, and moves made before
+        can no longer be taken back. Loading into the same game again and again is faster than
+        making a new game with 'from_string()' for every position. A ValueError is raised if the
+        string is not a position of the game's rules (see parse_position_string()).
+
+        Parameters:
+            - text: A position string. Example: START_POSITION
+        """
+        self.set_position(*self._rules.parse_position(text))
+
+    @classmethod
+    def from_string(cls, text, rules=None):
+        """
+        Makes a new game in the position of a position string.
+
+        Parameters:
+            - text: A position string. Example: START_POSITION
+            - rules: The 'ChessRules' of the game, or None for STANDARD_RULES.
+
+        Return value:
+            - a new game of this class (ChessVar or a subclass)
+        """
+        game = cls(rules)
+        game.load_string(text)
+        return game
+
+    def set_position(self, board, color, white_counts, black_counts):
+        """
+        Sets up a position on this game: the board, whose turn it is and both players' captured
+        pieces. The state of the game is 'WHITE_WON' or 'BLACK_WON' if that player's captured
+        counts include a whole set, and moves made before can no longer be taken back.
+
+        Parameters:
+            - board: A list of 8 lists that contain 8 'Piece' objects each. It is used as the
+            board, not copied.
+            - color: The color of the player to move. Example: 'white'
+            - white_counts, black_counts: The captured counts of each player in the order of
+            PIECE_TYPES. Example: [0, 0, 0, 0, 0, 0]
+        """
+        set_sizes = self._rules.get_set_sizes()
+        self._white_player.set_captured_counts(white_counts)
+        self._black_player.set_captured_counts(black_counts)
+        self._current_player = self._white_player if color == 'white' else self._black_player
+        if has_full_set(white_counts, set_sizes):
+            self._game_state = 'WHITE_WON'
+        elif has_full_set(black_counts, set_sizes):
+            self._game_state = 'BLACK_WON'
+        else:
+            self._game_state = 'UNFINISHED'
+        self._move_stack = []
+        self.load_board(board)
+
+    def get_rules(self):
+        """
+        Returns the rules the game is played by.
+
+        Return value:
+            - a 'ChessRules' object
+        """
+        return self._rules
+
+    def load_board(self, board):
+        """
+        Sets the board to a list of 8 lists of 'Piece' objects and computes the position key
+        again. The list is used as the board, not copied.
+
+        Parameters:
+            - board: A list of 8 lists that contain 8 'Piece' objects each.
         """
-        self._game_state = state
+        self._board = board
+        self._position_key = self.compute_position_key()
 
-    def set_current_player(self, player):
+    def set_square(self, column, row, piece):
         """
-        Sets the current player to be the class's black player or white player.
+        Puts a piece on a square of the board, replacing whatever was there. This does not
+        check any rules or change the players, and it does not update the position key.
+
         Parameters:
-            - player: will be either self._white_player or self._black_player
+            - column: An integer column list index. Example: 0
+            - row: An integer row list index. Example: 0
+            - piece: A 'Piece' object. EMPTY_PIECE clears the square.
         """
-        self._current_player = player
+        self._board[row][column] = piece
 
-    def make_move(self, square_moved_from, square_moved_to):
+    def move_piece(self, column_from, row_from, column_to, row_to):
         """
-        Given a starting square and an ending square, this method returns True if that move can
-        be made and returns False otherwise. If the piece being moved does not match the current
-        player's color, we return False. If a piece does not exist in square_moved_from, we return
-        False. If the game has already been won, we return False. If a capture was made, we update
-        the board accordingly as well as the player's 'captured_pieces' dictionary. If the move
-        being made causes the player to win, then we update the state of the game. Then we change
-        whose turn it is and return True since a valid move has been made.
+        Moves the piece on one square of the board to another square and makes the first square
+        empty. This does not check any rules or change the players, and it does not update the
+        position key.
 
         Parameters:
-            - square_moved_from: A string in algebraic notation that represents the square on the
-            chess board that the player wants to start at. Example: 'a1'
-            - square_moved_to: A string in algebraic notation that represents the square on the
-            chess board that the player wants to move a piece to. Example: 'b3'
+            - column_from: An integer column list index of the piece. Example: 0
+            - row_from: An integer row list index of the piece. Example: 0
+            - column_to: An integer column list index to move to. Example: 0
+            - row_to: An integer row list index to move to. Example: 0
 
         Return value:
-            - True: if a valid move was made
-            - False: if the move is not valid and nothing occurs
+            - captured_piece: the 'Piece' that was in the square being moved to
         """
+        captured_piece = self._board[row_to][column_to]
+        self._board[row_to][column_to] = self._board[row_from][column_from]
+        self._board[row_from][column_from] = EMPTY_PIECE
+        return captured_piece
 
-        # first get the row and column indices of the square the player wants to move a piece from
-        char_from1 = square_moved_from[0]
-        char_from2 = square_moved_from[1]
-        column_from = self._reference_dict[char_from1]
-        row_from = self._reference_dict[char_from2]
+    def get_square_indices(self, square):
+        """
+        Translates a square in algebraic notation to its column and row indices in self._board.
 
-        # get the row and column indices of the square moving to
-        char_to1 = square_moved_to[0]
-        char_to2 = square_moved_to[1]
-        column_to = self._reference_dict[char_to1]
-        row_to = self._reference_dict[char_to2]
+        Parameters:
+            - square: A string in algebraic notation. Example: 'a1'
 
-        # get the specific piece being moved
-        piece_being_moved = self._board[row_from][column_from]
+        Return value:
+            - column: An integer column list index. Example: 0
+            - row: An integer row list index. Example: 7
+        """
+        return self._reference_dict[square[0]], self._reference_dict[square[1]]
 
-        # boolean for if a valid move is eventually made or not
-        move_was_made = False
+    def get_square_name(self, column, row):
+        """
+        Translates a column and row index in self._board to the square's algebraic notation.
 
-        # make sure a piece is in the square we are moving from
-        if piece_being_moved.get_type() == '':
-            return False
+        Parameters:
+            - column: An integer column list index. Example: 0
+            - row: An integer row list index. Example: 7
 
-        # make sure the piece being moved matches the current player's color
-        if piece_being_moved.get_color() != self._current_player.get_color():
-            return False
+        Return value:
+            - square: A string in algebraic notation. Example: 'a1'
+        """
+        return 'abcdefgh'[column] + str(8 - row)
 
-        # check status of game, must be unfinished to make a move
-        if self._game_state != "UNFINISHED":
-            return False
+    def legal_moves_from(self, square):
+        """
+        Returns every move the current player can make with the piece on the given square,
+        without changing anything. The moves are found by 'legal_moves_from_idx()'.
 
-        # Based on the type of the piece, call the method that checks if that piece can
-        # be moved to its desired square or not. If the move is valid, 'move_was_made'
-        # will be set to True.
-        if piece_being_moved.get_type() == 'king':
-            king_can_move = self.is_valid_move_king(column_from, row_from, column_to, row_to)
-            move_was_made = king_can_move
+        Parameters:
+            - square: A string in algebraic notation that represents the square on the chess
+            board the piece is on. Example: 'b1'
 
-        elif piece_being_moved.get_type() == 'queen':
-            queen_can_move = self.is_valid_move_queen(column_from, row_from, column_to, row_to)
-            move_was_made = queen_can_move
+        Return value:
+            - A list of (square_moved_from, square_moved_to) tuples. Example: [('b1', 'a3'),
+            ('b1', 'c3')]. Each tuple can be passed to make_move() and it will return True.
+        """
+        column_from, row_from = self.get_square_indices(square)
+        return [move_to_algebraic(move) for move in self.legal_moves_from_idx(row_from * 8 + column_from)]
 
-        elif piece_being_moved.get_type() == 'rook':
-            rook_can_move = self.is_valid_move_rook(column_from, row_from, column_to, row_to)
-            move_was_made = rook_can_move
+    def legal_moves_from_idx(self, from_sq):
+        """
+        Returns every move the current player can make with the piece on the square with the
+        given index. This uses the same coordinates lists as the is_valid_move_(piecetype)
+        methods, but nothing on the board, the players, or the state of the game is changed. If
+        the square is empty, has a piece of the other player's color, or the game is over, the
+        list is empty.
 
-        elif piece_being_moved.get_type() == 'bishop':
-            bishop_can_move = self.is_valid_move_bishop(column_from, row_from, column_to, row_to)
-            move_was_made = bishop_can_move
+        Parameters:
+            - from_sq: The index of the square the piece is on (0 to 63). Example: 57
 
-        elif piece_being_moved.get_type() == 'knight':
-            knight_can_move = self.is_valid_move_knight(column_from, row_from, column_to, row_to)
-            move_was_made = knight_can_move
+        Return value:
+            - A list of packed moves (from_sq * 64 + to_sq, see pack_move()). Each move can be
+            passed to make_move_idx() as (move >> 6, move & 63) and it will return True.
+        """
+        row_from, column_from = from_sq >> 3, from_sq & 7
+        piece = self._board[row_from][column_from]
+        current_color = self._current_player.get_color()
 
-        elif piece_being_moved.get_type() == 'pawn':
-            pawn_can_move = self.is_valid_move_pawn(column_from, row_from, column_to, row_to)
-            move_was_made = pawn_can_move
+        # nothing can be moved from this square
+        if (self._game_state != 'UNFINISHED' or piece.get_type() == ''
+                or piece.get_color() != current_color):
+            return []
+
+        if piece.get_type() == 'pawn':
+            coordinates_list_for_move, coordinates_list_for_capture = self.get_coordinates_lists_pawn(column_from, row_from)
+            # a pawn can only move forward onto an empty square
+            coordinates_list = [(row, column) for row, column in coordinates_list_for_move
+                                if self._board[row][column].get_type() == '']
+            coordinates_list.extend(coordinates_list_for_capture)
+        else:
+            if piece.get_type() == 'king':
+                coordinates_list = self.get_coordinates_list_king(column_from, row_from)
+            elif piece.get_type() == 'queen':
+                coordinates_list = self.get_coordinates_list_queen(column_from, row_from)
+            elif piece.get_type() == 'rook':
+                coordinates_list = self.get_coordinates_list_rook(column_from, row_from)
+            elif piece.get_type() == 'bishop':
+                coordinates_list = self.get_coordinates_list_bishop(column_from, row_from)
+            else:
+                coordinates_list = self.get_coordinates_list_knight(column_from, row_from)
+            # a piece can never move onto a piece of its own color
+            coordinates_list = [(row, column) for row, column in coordinates_list
+                                if self._board[row][column].get_color() != current_color]
 
-        # the move the player wanted to make is not valid, return False
-        if not move_was_made:
-            return False
+        return [(from_sq << 6) | (row * 8 + column) for row, column in coordinates_list]
 
-        # check if the current player has won, if yes then update the state of the game
-        won = self.check_if_winner()
-        if won:
-            if self._current_player.get_color() == 'white':
-                self.set_game_state('WHITE_WON')
-            else:
-                self.set_game_state('BLACK_WON')
+    def legal_moves(self):
+        """
+        Returns every move the current player can make, without changing the board, the players,
+        or the state of the game. If the game is over, the list is empty.
 
-        # a valid move has been made, so change player
-        if self._current_player == self._white_player:
-            self.set_current_player(self._black_player)
-        else:
-            self.set_current_player(self._white_player)
+        Return value:
+            - A list of (square_moved_from, square_moved_to) tuples. Example: [('a2', 'a4'),
+            ('a2', 'a3'), ...]
+        """
+        return [move_to_algebraic(move) for move in self.legal_moves_idx()]
 
-        # a valid move was made, return True
-        return True
+    def legal_moves_idx(self):
+        """
+        Returns every move the current player can make as packed moves, in the same order as
+        'legal_moves()', without changing anything. If the game is over, the list is empty.
 
+        Return value:
+            - A list of packed moves (from_sq * 64 + to_sq, see pack_move()).
+        """
+        moves = []
+        if self._game_state != 'UNFINISHED':
+            return moves
+        current_color = self._current_player.get_color()
+        for row in range(8):
+            for column in range(8):
+                if self._board[row][column].get_color() == current_color:
+                    moves.extend(self.legal_moves_from_idx(row * 8 + column))
+        return moves
 
     def is_valid_move_king(self, column_from, row_from, column_to, row_to):
         """
@@ -270,42 +1401,31 @@ class ChessVar:
             chess board that the player wants to move to. Example: 0
 
         Return value:
-            - True: if a valid move was made
+            - True: if the move is valid
             - False: if the move is not valid
         """
 
-        # list of valid coordinates
-        coordinates_list =[]
-
-        # check that all moves keep us on the board
-        # horizontal move left
-        if 0<=column_from-1<=7:
-            coordinates_list.append((row_from,column_from-1))
-        # horizontal move right
-        if 0<=column_from+1<=7:
-            coordinates_list.append((row_from,column_from+1))
-        # vertical move down
-        if 0<=row_from-1<=7:
-            coordinates_list.append((row_from-1, column_from))
-        # vertical move up
-        if 0<=row_from+1<=7:
-            coordinates_list.append((row_from+1, column_from))
-        # diagonal move
-        if 0<=column_from-1<=7 and 0<=row_from-1<=7:
-            coordinates_list.append((row_from-1, column_from-1))
-        # diagonal move
-        if 0<=column_from-1<=7 and 0<=row_from+1<=7:
-            coordinates_list.append((row_from+1, column_from-1))
-        # diagonal move
-        if 0<=column_from+1<=7 and 0<=row_from+1<=7:
-            coordinates_list.append((row_from+1, column_from+1))
-        # diagonal move
-        if 0<=column_from+1<=7 and 0<=row_from-1<=7:
-            coordinates_list.append((row_from-1, column_from+1))
-
-        return self.validate_coordinates_list(coordinates_list, column_from, row_from, column_to, row_to, 'king')
+        coordinates_list = self.get_coordinates_list_king(column_from, row_from)
+        return self.validate_coordinates_list(coordinates_list, column_to, row_to)
+
+    def get_coordinates_list_king(self, column_from, row_from):
+        """
+        Given a starting column and row, this method returns a list of all the coordinates on
+        the board a King standing there could move to. (A King can move one
+        square in any direction.)
+
+        Parameters:
+            - column_from: An integer that represents the column list index of the square on the
+            chess board that the King is on. Example: 0
+            - row_from: An integer that represents the row list index of the square on the
+            chess board that the King is on. Example: 0
 
+        Return value:
+            - coordinates_list: A tuple of (row, column) tuples
+        """
 
+        # the king's coordinates are looked up in a table made when the file is imported
+        return self._king_coordinates[row_from * 8 + column_from]
 
     def is_valid_move_queen(self, column_from, row_from, column_to, row_to):
         """
@@ -327,163 +1447,32 @@ class ChessVar:
             chess board that the player wants to move to. Example: 0
 
         Return value:
-            - True: if a valid move was made
+            - True: if the move is valid
             - False: if the move is not valid
         """
 
-        # list of valid coordinates
-        coordinates_list = []
+        coordinates_list = self.get_coordinates_list_queen(column_from, row_from)
+        return self.validate_coordinates_list(coordinates_list, column_to, row_to)
 
-        # horizontal moves going left
-        move = column_from - 1
-        # stay in bounds
-        while 0 <= move <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[row_from][move].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then queen can move there but
-            # can't move anymore after that
-            elif (self._board[row_from][move].get_color() != self._current_player.get_color()
-                  and self._board[row_from][move].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((row_from, move))
-                break
-            # add coordinate to list
-            coordinates_list.append((row_from, move))
-            move -= 1
-
-        # horizontal moves going right
-        move2 = column_from + 1
-        # stay in bounds
-        while 0 <= move2 <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[row_from][move2].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then queen can move there but
-            # can't move anymore after that
-            elif (self._board[row_from][move2].get_color() != self._current_player.get_color()
-                  and self._board[row_from][move2].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((row_from, move2))
-                break
-            # add coordinate to list
-            coordinates_list.append((row_from, move2))
-            move2 += 1
-
-        # vertical moves going up
-        move3 = row_from - 1
-        # stay in bounds
-        while 0 <= move3 <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move3][column_from].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then queen can move there but
-            # can't move anymore after that
-            elif (self._board[move3][column_from].get_color() != self._current_player.get_color()
-                  and self._board[move3][column_from].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move3, column_from))
-                break
-            # add coordinate to list
-            coordinates_list.append((move3, column_from))
-            move3 -= 1
-
-        # vertical moves going down
-        move4 = row_from + 1
-        # stay in bounds
-        while 0 <= move4 <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move4][column_from].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then queen can move there but
-            # can't move anymore after that
-            elif (self._board[move4][column_from].get_color() != self._current_player.get_color()
-                  and self._board[move4][column_from].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move4, column_from))
-                break
-            # add coordinate to list
-            coordinates_list.append((move4, column_from))
-            move4 += 1
-
-        # left top diagonal moves
-        move5y = column_from-1
-        move5x = row_from-1
-        # stay in bounds
-        while 0<=move5y<=7 and 0<=move5x<=7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move5x][move5y].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then queen can move there but
-            # can't move anymore after that
-            elif (self._board[move5x][move5y].get_color() != self._current_player.get_color()
-                  and self._board[move5x][move5y].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move5x, move5y))
-                break
-            coordinates_list.append((move5x, move5y))
-            move5y -= 1
-            move5x -= 1
-
-        # left bottom diagonal moves
-        move6y = column_from - 1
-        move6x = row_from + 1
-        # stay in bounds
-        while 0 <= move6y <= 7 and 0 <= move6x <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move6x][move6y].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then queen can move there but
-            # can't move anymore after that
-            elif (self._board[move6x][move6y].get_color() != self._current_player.get_color()
-                  and self._board[move6x][move6y].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move6x, move6y))
-                break
-            coordinates_list.append((move6x, move6y))
-            move6y -= 1
-            move6x += 1
-
-        # right bottom diagonal moves
-        move7y = column_from + 1
-        move7x = row_from + 1
-        # stay in bounds
-        while 0 <= move7y <= 7 and 0 <= move7x <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move7x][move7y].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then queen can move there but
-            # can't move anymore after that
-            elif (self._board[move7x][move7y].get_color() != self._current_player.get_color()
-                  and self._board[move7x][move7y].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move7x, move7y))
-                break
-            coordinates_list.append((move7x, move7y))
-            move7y += 1
-            move7x += 1
-
-        # right top diagonal moves
-        move8y = column_from + 1
-        move8x = row_from - 1
-        # stay in bounds
-        while 0 <= move8y <= 7 and 0 <= move8x <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move8x][move8y].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then queen can move there but
-            # can't move anymore after that
-            elif (self._board[move8x][move8y].get_color() != self._current_player.get_color()
-                  and self._board[move8x][move8y].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move8x, move8y))
-                break
-            coordinates_list.append((move8x, move8y))
-            move8y += 1
-            move8x -= 1
+    def get_coordinates_list_queen(self, column_from, row_from):
+        """
+        Given a starting column and row, this method returns a list of all the coordinates on
+        the board a Queen standing there could move to. (A queen can move any
+        direction any number of spaces until it reaches a piece. It can move onto a piece of the
+        opposite color but not one of its own color.)
 
-        return self.validate_coordinates_list(coordinates_list, column_from, row_from, column_to, row_to, 'queen')
+        Parameters:
+            - column_from: An integer that represents the column list index of the square on the
+            chess board that the Queen is on. Example: 0
+            - row_from: An integer that represents the row list index of the square on the
+            chess board that the Queen is on. Example: 0
+
+        Return value:
+            - coordinates_list: A list of (row, column) tuples
+        """
 
+        # the queen's rays are looked up in a table made when the file is imported
+        return self.get_coordinates_list_rays(self._queen_rays[row_from * 8 + column_from])
 
     def is_valid_move_rook(self, column_from, row_from, column_to, row_to):
         """
@@ -505,86 +1494,32 @@ class ChessVar:
             chess board that the player wants to move to. Example: 0
 
         Return value:
-            - True: if a valid move was made
+            - True: if the move is valid
             - False: if the move is not valid
         """
 
-        # list of valid coordinates
-        coordinates_list = []
+        coordinates_list = self.get_coordinates_list_rook(column_from, row_from)
+        return self.validate_coordinates_list(coordinates_list, column_to, row_to)
 
-        # horizontal moves going left
-        move = column_from - 1
-        # stay in bounds
-        while 0 <= move <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[row_from][move].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then rook can move there but
-            # can't move anymore after that
-            elif (self._board[row_from][move].get_color() != self._current_player.get_color()
-                  and self._board[row_from][move].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((row_from, move))
-                break
-            # add coordinate to list
-            coordinates_list.append((row_from, move))
-            move -= 1
-
-        # horizontal moves going right
-        move2 = column_from + 1
-        # stay in bounds
-        while 0 <= move2 <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[row_from][move2].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then rook can move there but
-            # can't move anymore after that
-            elif (self._board[row_from][move2].get_color() != self._current_player.get_color()
-                  and self._board[row_from][move2].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((row_from, move2))
-                break
-            # add coordinate to list
-            coordinates_list.append((row_from, move2))
-            move2 += 1
-
-        # vertical moves going up
-        move3 = row_from - 1
-        # stay in bounds
-        while 0 <= move3 <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move3][column_from].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then rook can move there but
-            # can't move anymore after that
-            elif (self._board[move3][column_from].get_color() != self._current_player.get_color()
-                  and self._board[move3][column_from].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move3, column_from))
-                break
-            # add coordinate to list
-            coordinates_list.append((move3, column_from))
-            move3 -= 1
-
-        # vertical moves going down
-        move4 = row_from + 1
-        # stay in bounds
-        while 0 <= move4 <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move4][column_from].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then rook can move there but
-            # can't move anymore after that
-            elif (self._board[move4][column_from].get_color() != self._current_player.get_color()
-                  and self._board[move4][column_from].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move4, column_from))
-                break
-            # add coordinate to list
-            coordinates_list.append((move4, column_from))
-            move4 += 1
+    def get_coordinates_list_rook(self, column_from, row_from):
+        """
+        Given a starting column and row, this method returns a list of all the coordinates on
+        the board a Rook standing there could move to. (A rook can move
+        vertically and horizontally any number of spaces until it reaches a piece. It can move onto
+        a piece of the opposite color but not one of its own color.)
+
+        Parameters:
+            - column_from: An integer that represents the column list index of the square on the
+            chess board that the Rook is on. Example: 0
+            - row_from: An integer that represents the row list index of the square on the
+            chess board that the Rook is on. Example: 0
+
+        Return value:
+            - coordinates_list: A list of (row, column) tuples
+        """
 
-        return self.validate_coordinates_list(coordinates_list, column_from, row_from, column_to, row_to, 'rook')
+        # the rook's rays are looked up in a table made when the file is imported
+        return self.get_coordinates_list_rays(self._rook_rays[row_from * 8 + column_from])
 
     def is_valid_move_bishop(self, column_from, row_from, column_to, row_to):
         """
@@ -606,91 +1541,67 @@ class ChessVar:
             chess board that the player wants to move to. Example: 0
 
         Return value:
-            - True: if a valid move was made
+            - True: if the move is valid
             - False: if the move is not valid
         """
 
+        coordinates_list = self.get_coordinates_list_bishop(column_from, row_from)
+        return self.validate_coordinates_list(coordinates_list, column_to, row_to)
+
+    def get_coordinates_list_bishop(self, column_from, row_from):
+        """
+        Given a starting column and row, this method returns a list of all the coordinates on
+        the board a Bishop standing there could move to. (A bishop can move
+        any diagonal direction any number of spaces until it reaches a piece. It can move onto a
+        piece of the opposite color but not one of its own color.)
+
+        Parameters:
+            - column_from: An integer that represents the column list index of the square on the
+            chess board that the Bishop is on. Example: 0
+            - row_from: An integer that represents the row list index of the square on the
+            chess board that the Bishop is on. Example: 0
+
+        Return value:
+            - coordinates_list: A list of (row, column) tuples
+        """
+
+        # the bishop's rays are looked up in a table made when the file is imported
+        return self.get_coordinates_list_rays(self._bishop_rays[row_from * 8 + column_from])
+
+    def get_coordinates_list_rays(self, rays):
+        """
+        Given the rays of a Queen, Rook or Bishop, this method returns a list of all the
+        coordinates on the board the piece could move to. Each ray is followed from the square
+        nearest the piece. If we run into a piece of the current player's color, the piece can't
+        move there or any further that direction. If we run into a piece of the opposite color,
+        the piece can move there to capture it but can't move any further that direction.
+
+        Parameters:
+            - rays: A tuple of rays, where each ray is a tuple of (row, column) tuples going
+            outward from the piece. Example: ROOK_RAYS[0]
+
+        Return value:
+            - coordinates_list: A list of (row, column) tuples
+        """
+
         # list of valid coordinates
         coordinates_list = []
-
-        # left top diagonal moves
-        move5y = column_from - 1
-        move5x = row_from - 1
-        # stay in bounds
-        while 0 <= move5y <= 7 and 0 <= move5x <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move5x][move5y].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then bishop can move there but
-            # can't move anymore after that
-            elif (self._board[move5x][move5y].get_color() != self._current_player.get_color()
-                  and self._board[move5x][move5y].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move5x, move5y))
-                break
-            coordinates_list.append((move5x, move5y))
-            move5y -= 1
-            move5x -= 1
-
-        # left bottom diagonal moves
-        move6y = column_from - 1
-        move6x = row_from + 1
-        # stay in bounds
-        while 0 <= move6y <= 7 and 0 <= move6x <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move6x][move6y].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then bishop can move there but
-            # can't move anymore after that
-            elif (self._board[move6x][move6y].get_color() != self._current_player.get_color()
-                  and self._board[move6x][move6y].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move6x, move6y))
-                break
-            coordinates_list.append((move6x, move6y))
-            move6y -= 1
-            move6x += 1
-
-        # right bottom diagonal moves
-        move7y = column_from + 1
-        move7x = row_from + 1
-        # stay in bounds
-        while 0 <= move7y <= 7 and 0 <= move7x <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move7x][move7y].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then bishop can move there but
-            # can't move anymore after that
-            elif (self._board[move7x][move7y].get_color() != self._current_player.get_color()
-                  and self._board[move7x][move7y].get_color() != ''):
-                # add coordinate to list
-                coordinates_list.append((move7x, move7y))
-                break
-            coordinates_list.append((move7x, move7y))
-            move7y += 1
-            move7x += 1
-
-        # right top diagonal moves
-        move8y = column_from + 1
-        move8x = row_from - 1
-        # stay in bounds
-        while 0 <= move8y <= 7 and 0 <= move8x <= 7:
-            # check if run into piece of same color, if yes then can't move any more spaces that particular direction
-            if self._board[move8x][move8y].get_color() == self._current_player.get_color():
-                break
-            # check if run into piece of opposite color, if yes then bishop can move there but
-            # can't move anymore after that
-            elif (self._board[move8x][move8y].get_color() != self._current_player.get_color()
-                  and self._board[move8x][move8y].get_color() != ''):
+        current_color = self._current_player.get_color()
+        board = self._board
+
+        for ray in rays:
+            for row, column in ray:
+                color = board[row][column].get_color()
+                # run into piece of same color, can't move any more spaces that direction
+                if color == current_color:
+                    break
                 # add coordinate to list
-                coordinates_list.append((move8x, move8y))
-                break
-            coordinates_list.append((move8x, move8y))
-            move8y += 1
-            move8x -= 1
-
-        return self.validate_coordinates_list(coordinates_list, column_from, row_from, column_to, row_to, 'bishop')
+                coordinates_list.append((row, column))
+                # run into piece of opposite color, can capture it but can't move any further
+                if color != '':
+                    break
 
+        return coordinates_list
 
     def is_valid_move_knight(self, column_from, row_from, column_to, row_to):
         """
@@ -713,71 +1624,31 @@ class ChessVar:
             chess board that the player wants to move to. Example: 0
 
         Return value:
-            - True: if a valid move was made
+            - True: if the move is valid
             - False: if the move is not valid
         """
 
-        # list of valid coordinates
-        coordinates_list = []
+        coordinates_list = self.get_coordinates_list_knight(column_from, row_from)
+        return self.validate_coordinates_list(coordinates_list, column_to, row_to)
+
+    def get_coordinates_list_knight(self, column_from, row_from):
+        """
+        Given a starting column and row, this method returns a list of all the coordinates on
+        the board a Knight standing there could move to. (A knight can move in
+        a 3 square 'L' shape 8 different ways and can jump over other pieces.)
+
+        Parameters:
+            - column_from: An integer that represents the column list index of the square on the
+            chess board that the Knight is on. Example: 0
+            - row_from: An integer that represents the row list index of the square on the
+            chess board that the Knight is on. Example: 0
 
-        # move forward two and to the left 1
-        move1y = column_from - 1
-        move1x = row_from - 2
-        # stay in bounds
-        if 0 <= move1y <= 7 and 0 <= move1x <= 7:
-            coordinates_list.append((move1x, move1y))
-
-        # move forward two and to the right 1
-        move2y = column_from + 1
-        move2x = row_from - 2
-        # stay in bounds
-        if 0 <= move2y <= 7 and 0 <= move2x <= 7:
-            coordinates_list.append((move2x, move2y))
-
-        # move backwards two and to the left 1
-        move3y = column_from - 1
-        move3x = row_from + 2
-        # stay in bounds
-        if 0 <= move3y <= 7 and 0 <= move3x <= 7:
-            coordinates_list.append((move3x, move3y))
-
-        # move backwards two and to the right 1
-        move4y = column_from + 1
-        move4x = row_from + 2
-        # stay in bounds
-        if 0 <= move4y <= 7 and 0 <= move4x <= 7:
-            coordinates_list.append((move4x, move4y))
-
-        # move forward 1 and to the left 2
-        move5y = column_from - 2
-        move5x = row_from - 1
-        # stay in bounds
-        if 0 <= move5y <= 7 and 0 <= move5x <= 7:
-            coordinates_list.append((move5x, move5y))
-
-        # move forward 1 and to the right 2
-        move6y = column_from + 2
-        move6x = row_from - 1
-        # stay in bounds
-        if 0 <= move6y <= 7 and 0 <= move6x <= 7:
-            coordinates_list.append((move6x, move6y))
-
-        # move backwards 1 and to the left 2
-        move7y = column_from - 2
-        move7x = row_from + 1
-        # stay in bounds
-        if 0 <= move7y <= 7 and 0 <= move7x <= 7:
-            coordinates_list.append((move7x, move7y))
-
-        # move backwards 1 and to the right 2
-        move8y = column_from + 2
-        move8x = row_from + 1
-        # stay in bounds
-        if 0 <= move8y <= 7 and 0 <= move8x <= 7:
-            coordinates_list.append((move8x, move8y))
-
-        return self.validate_coordinates_list(coordinates_list, column_from, row_from, column_to, row_to, 'knight')
+        Return value:
+            - coordinates_list: A tuple of (row, column) tuples
+        """
 
+        # the knight's coordinates are looked up in a table made when the file is imported
+        return self._knight_coordinates[row_from * 8 + column_from]
 
     def is_valid_move_pawn(self, column_from, row_from, column_to, row_to):
         """
@@ -791,8 +1662,7 @@ class ChessVar:
         we see if the square the player wants to move to is in one of the coordinates lists. Then,
         we make sure another piece is not in the square already if the pawn is just making a move.
         If the pawn is capturing another piece, we make sure that piece is of the opposite color.
-        If a move or capture is made, we update the board accordingly as well as the player's
-        'captured_pieces_dictionary'.
+        This method does not make the move; that is done by 'apply_move()'.
 
 
         Parameters:
@@ -806,152 +1676,95 @@ class ChessVar:
             chess board that the player wants to move to. Example: 0
 
         Return value:
-            - True: if a valid move was made
+            - True: if the move is valid
             - False: if the move is not valid
         """
 
-        # list of valid moves
-        coordinates_list_for_move = []
+        # lists of valid moves and valid capture moves
+        coordinates_list_for_move, coordinates_list_for_capture = self.get_coordinates_lists_pawn(column_from, row_from)
 
-        # list of valid capture moves
-        coordinates_list_for_capture = []
+        # check if square we want to move to is in our coordinates list
+        if (row_to, column_to) in coordinates_list_for_move:
+            # a pawn can't move forward onto a piece of either color
+            return self._board[row_to][column_to].get_color() == ''
 
-        # check if color is black or white
-        current_color = self._current_player.get_color()
+        # a capture is valid since the capture list only has squares with a piece of the
+        # opposite color
+        return (row_to, column_to) in coordinates_list_for_capture
 
-        # get possible white moves
-        if current_color == 'white':
-            # check if it is the pawn's first turn, if yes then moving forward two spaces is valid
-            if row_from == 6:
-                coordinates_list_for_move.append((row_from - 2, column_from))
-            # normal move one square forward
-            if 0 <= row_from - 1 <= 7:
-                coordinates_list_for_move.append((row_from - 1, column_from))
-            # check top left diagonal for piece of opposite color
-            if 0 <= row_from-1 <= 7 and 0 <= column_from-1 <= 7:
-                left_diagonal_piece = self._board[row_from-1][column_from-1]
-                if left_diagonal_piece.get_color() == 'black':
-                    coordinates_list_for_capture.append((row_from-1, column_from-1))
-            # check top right diagonal for piece of opposite color
-            if 0 <= row_from-1 <= 7 and 0 <= column_from+1 <= 7:
-                right_diagonal_piece = self._board[row_from-1][column_from+1]
-                if right_diagonal_piece.get_color() == 'black':
-                    coordinates_list_for_capture.append((row_from-1, column_from+1))
-
-        # get possible black moves
-        elif current_color == 'black':
-            # check if it is the pawn's first turn, if yes then moving forward two spaces is valid
-            if row_from == 1:
-                coordinates_list_for_move.append((row_from + 2, column_from))
-            # normal move one square forward
-            if 0 <= row_from + 1 <= 7:
-                coordinates_list_for_move.append((row_from + 1, column_from))
-            # check top left diagonal for piece of opposite color
-            if 0 <= row_from + 1 <= 7 and 0 <= column_from - 1 <= 7:
-                left_diagonal_piece = self._board[row_from + 1][column_from - 1]
-                if left_diagonal_piece.get_color() == 'white':
-                    coordinates_list_for_capture.append((row_from + 1, column_from - 1))
-            # check top right diagonal for piece of opposite color
-            if 0 <= row_from + 1 <= 7 and 0 <= column_from + 1 <= 7:
-                right_diagonal_piece = self._board[row_from + 1][column_from + 1]
-                if right_diagonal_piece.get_color() == 'white':
-                    coordinates_list_for_capture.append((row_from + 1, column_from + 1))
+    def get_coordinates_lists_pawn(self, column_from, row_from):
+        """
+        Given a starting column and row, this method returns two lists of coordinates for a Pawn
+        of the current player's color standing there. The first list has the squares the Pawn
+        could move forward to (two squares on its first turn, one otherwise), without checking if
+        those squares are empty. The second list has the diagonal squares the Pawn could move to
+        by capturing a piece of the opposite color.
 
-        # check if square we want to move to is in our coordinates list
-        if (row_to, column_to) in coordinates_list_for_move:
-            # now check if a piece of either the same color or opposite is in that square
-            piece = self._board[row_to][column_to]
-            if piece.get_color() != '':
-                # can't move forward
-                return False
-            else:
-                # move piece to desired square
-                self._board[row_to][column_to] = Piece('pawn', current_color)
-                # make previous spot empty
-                self._board[row_from][column_from] = Piece()
-
-        # need to check if we made a capture or not, rowto and columnto piece will be
-        # of opposite color in that case
-        elif (row_to,column_to) in coordinates_list_for_capture:
-            # capture and replace piece
-            captured_piece = self._board[row_to][column_to]
-            # add to captured dictionary
-            if current_color == 'white':
-                self._white_player.add_captured_piece(captured_piece.get_type())
-            else:
-                self._black_player.add_captured_piece(captured_piece.get_type())
-            # replace piece
-            self._board[row_to][column_to] = Piece('pawn', current_color)
-            # make previous spot empty
-            self._board[row_from][column_from] = Piece()
+        Parameters:
+            - column_from: An integer that represents the column list index of the square on the
+            chess board that the Pawn is on. Example: 0
+            - row_from: An integer that represents the row list index of the square on the
+            chess board that the Pawn is on. Example: 0
 
-        # move not valid
-        else:
-            return False
+        Return value:
+            - coordinates_list_for_move: A tuple of (row, column) tuples for forward moves
+            - coordinates_list_for_capture: A list of (row, column) tuples for captures
+        """
 
-        return True
+        # check if color is black or white
+        current_color = self._current_player.get_color()
+        opposite_color = 'black' if current_color == 'white' else 'white'
+        square = row_from * 8 + column_from
+
+        # the forward moves and diagonal squares are looked up in tables made when the file is
+        # imported, and a diagonal square is only kept if a piece of the opposite color is there
+        coordinates_list_for_move = self._pawn_move_coordinates[current_color][square]
+        coordinates_list_for_capture = [(row, column) for row, column in self._pawn_capture_coordinates[current_color][square]
+                                        if self._board[row][column].get_color() == opposite_color]
 
-    def validate_coordinates_list(self, coordinates_list, column_from, row_from, column_to, row_to, piece_type):
+        return coordinates_list_for_move, coordinates_list_for_capture
+
+    def validate_coordinates_list(self, coordinates_list, column_to, row_to):
         """
         Given a list of valid coordinates for potential moves of a piece, this method determines
         if the move the player wants to make is valid. First, the square the player wants to move
         to must exist in the coordinates list. Then, we check if a piece of the same color exists
-        in the square. If so, we return False. Then, we check if a piece of the opposite color
-        exists in that square. If so, then we are making a capture, so we update the current player's
-        captured_pieces_dictionary. Then we update the board by moving our piece to its desired
-        square and removing any captured piece.
+        in the square. If so, we return False. Otherwise the square is either empty or has a piece
+        of the opposite color that can be captured, so the move is valid. This method does not
+        make the move; that is done by 'apply_move()'.
         * this method does not apply to pawns because pawns move and capture differently
 
         Parameters:
             - coordinates_list: A list of valid coordinates (tuples) for potential moves of a piece.
-            - column_from: An integer that represents the column list index of the square on the
-            chess board that the player wants to start at. Example: 0
-            - row_from: An integer that represents the row list index of the square on the
-            chess board that the player wants to start at. Example: 0
             - column_to: An integer that represents the column list index of the square on the
             chess board that the player wants to move to. Example: 0
             - row_to: An integer that represents the row list index of the square on the
             chess board that the player wants to move to. Example: 0
-            - piece_type: A string that represents the type of piece we are moving.
 
         Return value:
-            - True: if a valid move was made
+            - True: if the move is valid
             - False: if the move is not valid
         """
 
         # first check if square want to move to is in our coordinates_list
         if (row_to, column_to) in coordinates_list:
             # now check if a piece of the same color is in that square
-            captured_piece = self._board[row_to][column_to]
-            if captured_piece.get_color() == self._current_player.get_color():
-                return False
-            # now check if opposite color piece is there- then capture
-            else:
-                # add to captured dictionary
-                if self._current_player.get_color() == 'white':
-                    if self._board[row_to][column_to].get_type() != '':
-                        self._white_player.add_captured_piece(captured_piece.get_type())
-                else:
-                    if self._board[row_to][column_to].get_type() != '':
-                        self._black_player.add_captured_piece(captured_piece.get_type())
-                # replace piece
-                self._board[row_to][column_to] = Piece(piece_type, self._current_player.get_color())
-                # make previous spot empty
-                self._board[row_from][column_from] = Piece()
+            return self._board[row_to][column_to].get_color() != self._current_player.get_color()
         # not a valid move
-        else:
-            return False
-        # move was valid
-        return True
+        return False
 
 
     def display_board(self):
         """
         This method prints the chess board. A '*' character represents a blank square.
-        A dashed line is included at the bottom.
+        A dashed line is included at the bottom. Only the squares on the board of the game's
+        rules are printed, so a smaller board is not shown as 8 by 8.
         """
-        for row in self._board:
-            for piece in row:
+        width = self._rules.get_width()
+        for row_index in range(8 - self._rules.get_height(), 8):
+            row = self._board[row_index]
+            for column in range(width):
+                piece = row[column]
                 # print a '*' for an empty square
                 if piece.get_type() == '':
                     print(f"{'*':<12}",end='')
@@ -960,43 +1773,52 @@ class ChessVar:
                     print(f"{piece.get_color():<5}{piece.get_type():<6}",end=" ")
             print()
         # separating line
-        print('-'*96)
+        print('-'*(12*width))
 
     def check_if_winner(self):
-        """This method will access the captured_pieces_dictionary of the current player and see
-        if all the pieces of one type have been captured. If yes, return True, if no, return False.
+        """This method will ask the current player if all the pieces of one type have been
+        captured. If yes, return True, if no, return False. The player keeps a mask of the
+        types it has captured every piece of, so nothing has to be counted.
 
         Return value:
             - True if the current player has won
             - False if the current player has not won
         """
 
-        # iterate through player's dictionary of captured pieces
-        for key, value in self._current_player.get_captured_pieces().items():
-            # all rooks, knights, or bishops have been captured
-            if key == 'rook' or key == 'knight' or key == 'bishop':
-                if value == 2:
-                    return True
-            # all queens or kings have been captured
-            elif key == 'queen' or key == 'king':
-                if value == 1:
-                    return True
-            # all pawns have been captured
-            else:
-                if value == 8:
-                    return True
+        return self._current_player.get_full_set_mask() != 0
 
-        return False
+    def is_winning_move_idx(self, from_sq, to_sq):
+        """
+        Returns True if a move captures the last piece of a type the opponent has left, which
+        wins the game. This only looks at the square moved to and the current player's mask of
+        sets about to fall, so it is cheap enough to call for every move in a search.
+        * this method does not check the move, so it must be one that 'is_legal_idx()' returns
+        True for
+
+        Parameters:
+            - from_sq: The index of the square moved from (0 to 63). Example: 35
+            - to_sq: The index of the square moved to (0 to 63). Example: 4
+
+        Return value:
+            - True: if the move wins the game
+            - False: otherwise
+        """
+
+        target_bit = TYPE_BITS[self.get_piece_idx(to_sq).get_type()]
+        return self._current_player.get_last_piece_mask() & target_bit != 0
 
 class Piece:
     """
     This class defines an object of type 'Piece'. A piece exists on the board in a
-    chess game (ChessVar). A piece has a type and a color.
+    chess game (ChessVar). A piece has a type and a color. There are only 13 Piece objects,
+    one for each type and color and one for an empty square, and they are shared by every
+    board: Piece('rook', 'black') always returns the same object. A Piece can't be changed, so
+    sharing it is safe, and moving a piece never has to make a new object.
 
     Data members:
         - self._type (a piece can be a 'rook', 'bishop', 'king', 'queen', 'knight',
-        or 'pawn')
-        - self._color (either black or white)
+        or 'pawn', or '' for an empty square)
+        - self._color (either black or white, or '' for an empty square)
 
     Methods:
         - get_type()
@@ -1005,14 +1827,28 @@ class Piece:
             - This method returns the color of the piece.
 
     Classes in communication with:
-        - The ChessVar class has many instances where it might need to instantiate a
-        chess piece. The board in a ChessVar object contains pieces of various types.
-        These pieces move and get captured throughout a game.
+        - The ChessVar class has many instances where it might need a chess piece. The board
+        in a ChessVar object contains pieces of various types. These pieces move and get
+        captured throughout a game.
     """
 
-    def __init__(self,type='',color=''):
-        self._type = type
-        self._color = color
+    __slots__ = ('_type', '_color')
+
+    # The 13 shared Piece objects by (type, color), filled in below the class.
+    _instances = {}
+
+    def __new__(cls, type='', color=''):
+        try:
+            return cls._instances[(type, color)]
+        except KeyError:
+            raise ValueError('there is no %s %s piece' % (color, type)) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError('a Piece can not be changed')
+
+    def __reduce__(self):
+        # copies and pickles of a piece are the shared object itself
+        return Piece, (self._type, self._color)
 
     def get_type(self):
         """
@@ -1034,33 +1870,77 @@ class Piece:
         return self._color
 
 
+# make the shared pieces, going around Piece.__setattr__ since a Piece can't be changed after this
+for _color in COLORS + ('',):
+    for _piece_type in (PIECE_TYPES if _color else ('',)):
+        _piece = object.__new__(Piece)
+        object.__setattr__(_piece, '_type', _piece_type)
+        object.__setattr__(_piece, '_color', _color)
+        Piece._instances[(_piece_type, _color)] = _piece
+
+# The shared Piece of an empty square.
+EMPTY_PIECE = Piece()
+
+# The Piece of every letter of a position string, with '.' for an empty square.
+LETTER_PIECES = {letter: Piece(piece_type, color) for (piece_type, color), letter in PIECE_LETTERS.items()}
+LETTER_PIECES['.'] = EMPTY_PIECE
+
+
 class Player:
     """
     This class defines an object of type 'Player'. A player exists in a chess game (ChessVar)
-    and has a color as well as a dictionary containing the quantities of pieces captured.
+    and has a color as well as the quantities of pieces captured of each type.
 
     Data members:
         - self._color (A player will either be black or white)
-        - self._captured_pieces (A dictionary where each key is a piece type and each value
-        is the corresponding number of captured pieces of that type.)
+        - self._set_sizes (The number of pieces of each type the player has to capture to win,
+        in the order of PIECE_TYPES.)
+        - self._captured_counts (An array with the number of captured pieces of each type, in
+        the order of PIECE_TYPES.)
+        - self._remaining_counts (An array with the number of pieces of each type the opponent
+        has left, in the order of PIECE_TYPES. Capturing them all wins the game.)
+        - self._last_piece_mask (A bitmask with the bit of every type in TYPE_BITS that the
+        opponent has only one piece of left, so capturing it would win.)
+        - self._full_set_mask (A bitmask with the bit of every type the opponent has no pieces
+        of left. The player has won if it is not 0.)
 
     Methods:
         - get_color(self)
             - This method returns the player's color.
         - get_captured_pieces(self)
-            - This method returns the player's dictionary of captured pieces.
+            - This method returns a new dictionary of the player's captured pieces.
+        - get_captured_count(self, type)
+            - This method returns the number of captured pieces of one type.
+        - get_remaining_count(self, type)
+            - This method returns the number of pieces of one type the opponent has left.
+        - get_last_piece_mask(self), get_full_set_mask(self)
+            - These methods return the masks of the types the opponent has one piece of left
+            and no pieces of left.
         - add_captured_piece(self, type)
-            - This method takes in a piece type (string) and uses that to find the same type
-            in the keys of self._captured_pieces and increments the corresponding value by 1.
+            - This method takes in a piece type (string) and increments the number of captured
+            pieces of that type by 1.
+        - remove_captured_piece(self, type)
+            - This method takes in a piece type (string) and decrements the number of captured
+            pieces of that type by 1.
+        - set_captured_counts(self, counts)
+            - This method sets the number of captured pieces of every type at once.
+        - update_set_masks(self, index)
+            - This method updates both masks for the type with the given index.
 
     Classes in communication with:
         - The ChessVar class has a white player, a black player, and a current player
         as data members.
     """
 
-    def __init__(self, color=''):
+    __slots__ = ('_color', '_set_sizes', '_captured_counts', '_remaining_counts', '_last_piece_mask',
+                 '_full_set_mask')
+
+    def __init__(self, color='', set_sizes=None):
         self._color = color
-        self._captured_pieces = {'rook':0, 'knight':0, 'bishop':0, 'queen':0, 'king':0, 'pawn':0}
+        if set_sizes is None:
+            set_sizes = tuple(SET_SIZES[piece_type] for piece_type in PIECE_TYPES)
+        self._set_sizes = set_sizes
+        self.set_captured_counts(bytes(len(PIECE_TYPES)))
 
     def get_color(self):
         """
@@ -1072,21 +1952,128 @@ class Player:
         return self._color
     def get_captured_pieces(self):
         """
-        Returns the player's dictionary of captured pieces.
+        Returns a dictionary of the player's captured pieces. The dictionary is a new copy, so
+        changing it does not change the player.
+
+        Return value:
+            - a dictionary where each key is a piece type and each value is the corresponding
+            number of captured pieces of that type
+        """
+        return dict(zip(PIECE_TYPES, self._captured_counts))
+    def get_captured_count(self, type):
+        """
+        Returns the number of captured pieces of one type.
+
+        Parameters:
+             - type (a string being either 'king', 'queen', 'rook', 'bishop',
+            'knight', or 'pawn')
+
+        Return value:
+            - number of captured pieces (an integer)
+        """
+        return self._captured_counts[TYPE_INDICES[type]]
+
+    def get_remaining_count(self, type):
+        """
+        Returns the number of pieces of one type the opponent has left. The player wins by
+        bringing any of these counts to 0.
+
+        Parameters:
+             - type (a string being either 'king', 'queen', 'rook', 'bishop',
+            'knight', or 'pawn')
+
+        Return value:
+            - number of pieces left (an integer)
+        """
+        return self._remaining_counts[TYPE_INDICES[type]]
+
+    def get_last_piece_mask(self):
+        """
+        Returns the mask of the sets about to fall: the bit in TYPE_BITS of every type the
+        opponent has only one piece of left. A capture of a piece whose type is in the mask
+        wins the game.
+
+        Return value:
+            - a bitmask (an integer, 0 if no capture would win)
+        """
+        return self._last_piece_mask
+
+    def get_full_set_mask(self):
+        """
+        Returns the mask of the bit in TYPE_BITS of every type the player has captured all the
+        pieces of.
 
         Return value:
-            - self._captured_pieces (dictionary)
+            - a bitmask (an integer, 0 if the player has not won)
         """
-        return self._captured_pieces
+        return self._full_set_mask
+
     def add_captured_piece(self, type):
         """
-        This method takes in a piece type (string) and uses that to find the same type
-        in the keys of self._captured_pieces and increments the corresponding value by 1.
+        This method takes in a piece type (string) and increments the number of captured
+        pieces of that type by 1.
+
+        Parameters:
+             - type (a string being either 'king', 'queen', 'rook', 'bishop',
+            'knight', or 'pawn')
+        """
+
+        index = TYPE_INDICES[type]
+        self._captured_counts[index] += 1
+        self._remaining_counts[index] -= 1
+        self.update_set_masks(index)
+
+    def remove_captured_piece(self, type):
+        """
+        This method takes in a piece type (string) and decrements the number of captured pieces
+        of that type by 1. It is used when a capture is taken back.
 
         Parameters:
              - type (a string being either 'king', 'queen', 'rook', 'bishop',
             'knight', or 'pawn')
         """
 
-        self._captured_pieces[type] += 1
+        index = TYPE_INDICES[type]
+        self._captured_counts[index] -= 1
+        self._remaining_counts[index] += 1
+        self.update_set_masks(index)
+
+    def set_captured_counts(self, counts):
+        """
+        Sets the number of captured pieces of every type at once, for example when a position
+        is loaded from a position string.
+
+        Parameters:
+            - counts: A list of captured counts in the order of PIECE_TYPES. Example: [0, 0, 1, 0, 0, 2]
+        """
+
+        self._captured_counts = array('B', counts)
+        self._remaining_counts = array('B', [set_size - count for set_size, count in zip(self._set_sizes, counts)])
+        self._last_piece_mask = 0
+        self._full_set_mask = 0
+        for index in range(len(PIECE_TYPES)):
+            self.update_set_masks(index)
+
+    def update_set_masks(self, index):
+        """
+        Sets the bit of one type in the mask of sets about to fall and the mask of full sets
+        from the number of pieces of that type the opponent has left.
+
+        Parameters:
+            - index: The index of the type in PIECE_TYPES. Example: 3
+        """
+
+        bit = 1 << index
+        remaining = self._remaining_counts[index]
+        if remaining == 1:
+            self._last_piece_mask |= bit
+        else:
+            self._last_piece_mask &= ~bit
+        if remaining == 0:
+            self._full_set_mask |= bit
+        else:
+            self._full_set_mask &= ~bit
+
 
+# The rules of the normal game, used by every game that is not given other rules.
+STANDARD_RULES = ChessRules()
@@ -0,0 +1,335 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file measures where the time of a move goes in the chess variant in
+# ChessGame.py. 'MoveInstrumentation' counts and times every stage of ChessVar.make_move():
+# reading the squares with get_square_indices() (the '_reference_dict' lookups), the dispatch on
+# the piece's get_type() in is_legal_idx(), the is_valid_move_(piecetype) call,
+# validate_coordinates_list(), apply_move_idx() and check_if_winner(). It also calls hooks when a
+# move is applied, when a piece is captured and when a game is over. Nothing in ChessVar changes
+# for this: attach() puts timed wrappers of those methods on one game object, where they are
+# found before the methods of its class, and detach() takes them off again. A game that is not
+# attached runs exactly the same code as before, so instrumentation costs nothing when it is
+# not used. Every stage has its number of calls, its total seconds and its own seconds (without
+# the stages it called), and format_metrics() writes them in the Prometheus text format so a
+# metrics system can scrape them:
+#
+#     instrumentation = MoveInstrumentation()
+#     instrumentation.add_hook('game_over', lambda game, state: print(state))
+#     instrumentation.attach(game)
+#     ...
+#     print(instrumentation.format_metrics())
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from ChessGame import ChessVar, move_to_algebraic
+from ChessBitboard import BitboardChessVar
+
+# The versions of the game that can be timed, by name.
+BACKENDS = {'list': ChessVar, 'bitboard': BitboardChessVar}
+
+# The timed stages of a move, in the order they happen, with the ChessVar method timed for each.
+# BitboardChessVar checks moves with bitboards, so it never calls the is_valid_move_(piecetype)
+# methods or validate_coordinates_list().
+STAGE_METHODS = (('make_move', 'make_move'),
+                 ('parse', 'get_square_indices'),
+                 ('dispatch', 'is_legal_idx'),
+                 ('is_valid_move_king', 'is_valid_move_king'),
+                 ('is_valid_move_queen', 'is_valid_move_queen'),
+                 ('is_valid_move_rook', 'is_valid_move_rook'),
+                 ('is_valid_move_bishop', 'is_valid_move_bishop'),
+                 ('is_valid_move_knight', 'is_valid_move_knight'),
+                 ('is_valid_move_pawn', 'is_valid_move_pawn'),
+                 ('validate_coordinates_list', 'validate_coordinates_list'),
+                 ('apply_move', 'apply_move_idx'),
+                 ('check_if_winner', 'check_if_winner'))
+STAGES = tuple(stage for stage, method_name in STAGE_METHODS)
+
+# The events hooks can be added for, and the arguments each hook is called with.
+#     - 'move_applied': (game, from_sq, to_sq) after every move, including moves of push_move()
+#     - 'capture': (game, to_sq, captured_piece) after a move that captured a piece
+#     - 'game_over': (game, game_state) after a move that won the game
+EVENTS = ('move_applied', 'capture', 'game_over')
+
+
+class MoveInstrumentation:
+    """
+    This class times the stages of the moves of the games attached to it and calls hooks for
+    the events of those games. Any number of games can be attached to one instrumentation, and
+    their counts are added together.
+
+    Data members:
+        - self._timing (True if the stages are timed. Without timing, only the events are
+        counted and the hooks called.)
+        - self._clock (The function that returns the time in seconds, time.perf_counter by
+        default.)
+        - self._calls (A dictionary with the number of calls of every stage.)
+        - self._seconds (A dictionary with the total seconds of every stage, including the
+        stages it called.)
+        - self._own_seconds (A dictionary with the seconds of every stage not spent in the
+        stages it called.)
+        - self._child_seconds (A list with the seconds spent in called stages for every timed
+        stage that is running, innermost last.)
+        - self._event_counts (A dictionary with the number of times every event happened.)
+        - self._hooks (A dictionary with the list of hooks of every event.)
+        - self._attached_count (The number of games attached.)
+
+    Methods:
+        - add_hook(self, event, hook), remove_hook(self, event, hook)
+            - Add or remove a function called for an event.
+        - attach(self, game), detach(self, game)
+            - Start and stop instrumenting a game.
+        - make_timed_method(self, stage, method)
+            - Returns a wrapper of a method that times it as a stage.
+        - make_event_method(self, game, method)
+            - Returns a wrapper of apply_move_idx() that calls the event hooks.
+        - fire(self, event, *arguments)
+            - Counts an event and calls its hooks.
+        - get_summary(self)
+            - Returns the counts and times as a dictionary.
+        - format_metrics(self, prefix)
+            - Returns the counts and times in the Prometheus text format.
+        - reset(self)
+            - Sets every count and time back to 0.
+
+    Classes in communication with:
+        - ChessVar (The games whose moves are timed. Only their methods are wrapped.)
+    """
+
+    def __init__(self, timing=True, clock=time.perf_counter):
+        self._timing = timing
+        self._clock = clock
+        self._calls = dict.fromkeys(STAGES, 0)
+        self._seconds = dict.fromkeys(STAGES, 0.0)
+        self._own_seconds = dict.fromkeys(STAGES, 0.0)
+        self._child_seconds = []
+        self._event_counts = dict.fromkeys(EVENTS, 0)
+        self._hooks = {event: [] for event in EVENTS}
+        self._attached_count = 0
+
+    def add_hook(self, event, hook):
+        """
+        Adds a function that is called every time an event happens in an attached game.
+
+        Parameters:
+            - event: One of EVENTS. Example: 'capture'
+            - hook: A function taking the arguments of the event (see EVENTS).
+        """
+        if event not in self._hooks:
+            raise ValueError('there is no event %r' % event)
+        self._hooks[event].append(hook)
+
+    def remove_hook(self, event, hook):
+        """
+        Removes a function added with add_hook().
+
+        Parameters:
+            - event: One of EVENTS.
+            - hook: The function that was added.
+        """
+        self._hooks[event].remove(hook)
+
+    def attach(self, game):
+        """
+        Starts instrumenting a game by putting wrappers of its methods on the game object.
+        * a game can only be attached to one instrumentation at a time, and it has to be
+        detached before it is copied or pickled
+
+        Parameters:
+            - game: A ChessVar object.
+        """
+        if 'apply_move_idx' in vars(game):
+            raise ValueError('the game is already attached')
+        if self._timing:
+            for stage, method_name in STAGE_METHODS:
+                setattr(game, method_name, self.make_timed_method(stage, getattr(game, method_name)))
+        # the event hooks go around the timed apply_move_idx(), so they are not timed with it
+        game.apply_move_idx = self.make_event_method(game, game.apply_move_idx)
+        self._attached_count += 1
+
+    def detach(self, game):
+        """
+        Stops instrumenting a game, so it runs its own methods again.
+
+        Parameters:
+            - game: A ChessVar object attached with attach().
+        """
+        if 'apply_move_idx' not in vars(game):
+            return
+        for stage, method_name in STAGE_METHODS:
+            vars(game).pop(method_name, None)
+        vars(game).pop('apply_move_idx', None)
+        self._attached_count -= 1
+
+    def make_timed_method(self, stage, method):
+        """
+        Returns a function that calls a method and adds its time to a stage. The time spent in
+        other timed stages it calls is kept out of the stage's own seconds.
+
+        Parameters:
+            - stage: One of STAGES. Example: 'parse'
+            - method: The bound method to time.
+
+        Return value:
+            - the wrapper function
+        """
+        clock = self._clock
+        child_seconds = self._child_seconds
+        calls, seconds, own_seconds = self._calls, self._seconds, self._own_seconds
+
+        def timed_method(*arguments):
+            child_seconds.append(0.0)
+            start = clock()
+            try:
+                return method(*arguments)
+            finally:
+                elapsed = clock() - start
+                calls[stage] += 1
+                seconds[stage] += elapsed
+                own_seconds[stage] += elapsed - child_seconds.pop()
+                if child_seconds:
+                    child_seconds[-1] += elapsed
+        return timed_method
+
+    def make_event_method(self, game, apply_move_idx):
+        """
+        Returns a function that calls a game's apply_move_idx() and then fires the
+        'move_applied' event, the 'capture' event if a piece was captured, and the 'game_over'
+        event if the move won the game.
+
+        Parameters:
+            - game: The ChessVar object.
+            - apply_move_idx: Its apply_move_idx() method.
+
+        Return value:
+            - the wrapper function
+        """
+        fire = self.fire
+
+        def apply_move_with_events(from_sq, to_sq):
+            captured_piece = apply_move_idx(from_sq, to_sq)
+            fire('move_applied', game, from_sq, to_sq)
+            if captured_piece.get_type() != '':
+                fire('capture', game, to_sq, captured_piece)
+            if game.get_game_state() != 'UNFINISHED':
+                fire('game_over', game, game.get_game_state())
+            return captured_piece
+        return apply_move_with_events
+
+    def fire(self, event, *arguments):
+        """
+        Counts an event and calls every hook added for it.
+
+        Parameters:
+            - event: One of EVENTS.
+            - arguments: The arguments of the event (see EVENTS).
+        """
+        self._event_counts[event] += 1
+        for hook in self._hooks[event]:
+            hook(*arguments)
+
+    def get_summary(self):
+        """
+        Returns the counts and times of every stage and event.
+
+        Return value:
+            - A dictionary with 'attached_games' (the number attached now), 'stages' (a
+            dictionary from every stage to a dictionary with 'calls', 'seconds', 'own_seconds'
+            and 'mean_us', the mean own microseconds of a call) and 'events' (a dictionary from
+            every event to its count)
+        """
+        stages = {}
+        for stage in STAGES:
+            calls = self._calls[stage]
+            stages[stage] = {'calls': calls, 'seconds': self._seconds[stage],
+                             'own_seconds': self._own_seconds[stage],
+                             'mean_us': self._own_seconds[stage] / calls * 1e6 if calls else 0.0}
+        return {'attached_games': self._attached_count, 'stages': stages, 'events': dict(self._event_counts)}
+
+    def format_metrics(self, prefix='chess'):
+        """
+        Returns the counts and times in the Prometheus text format, one sample per line, so
+        they can be served to or pushed into a metrics system.
+
+        Parameters:
+            - prefix: The start of every metric name. Example: 'chess'
+
+        Return value:
+            - a string of lines ending with a newline
+        """
+        counters = (('stage_calls_total', 'Calls of each stage of a move.', self._calls, 'stage'),
+                    ('stage_seconds_total', 'Seconds in each stage, with the stages it calls.',
+                     self._seconds, 'stage'),
+                    ('stage_own_seconds_total', 'Seconds in each stage, without the stages it calls.',
+                     self._own_seconds, 'stage'),
+                    ('events_total', 'Moves applied, captures and games over.', self._event_counts, 'event'))
+        lines = ['# HELP %s_attached_games Games attached now.' % prefix,
+                 '# TYPE %s_attached_games gauge' % prefix,
+                 '%s_attached_games %d' % (prefix, self._attached_count)]
+        for name, help_text, values, label in counters:
+            lines.append('# HELP %s_%s %s' % (prefix, name, help_text))
+            lines.append('# TYPE %s_%s counter' % (prefix, name))
+            for key, value in values.items():
+                lines.append('%s_%s{%s="%s"} %r' % (prefix, name, label, key, value))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Sets every count and time back to 0. Hooks and attached games are kept."""
+        for stage in STAGES:
+            self._calls[stage] = 0
+            self._seconds[stage] = 0.0
+            self._own_seconds[stage] = 0.0
+        for event in EVENTS:
+            self._event_counts[event] = 0
+
+
+def main(arguments=None):
+    """
+    Plays random games with make_move() on instrumented games and prints how many calls and how
+    much time every stage of a move took, as a table, as JSON or in the Prometheus text format.
+
+    Parameters:
+        - arguments: A list of command line arguments, or None to use sys.argv.
+
+    Return value:
+        - the exit status (0)
+    """
+    parser = argparse.ArgumentParser(description='Time the stages of the moves of the chess variant.')
+    parser.add_argument('--games', type=int, default=100, help='the number of random games (default: 100)')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='list')
+    parser.add_argument('--format', choices=('table', 'json', 'prometheus'), default='table')
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args(arguments)
+
+    rng = random.Random(options.seed)
+    instrumentation = MoveInstrumentation()
+    for game_number in range(options.games):
+        game = BACKENDS[options.backend]()
+        instrumentation.attach(game)
+        while True:
+            moves = game.legal_moves_idx()
+            if not moves:
+                break
+            game.make_move(*move_to_algebraic(rng.choice(moves)))
+        instrumentation.detach(game)
+
+    if options.format == 'prometheus':
+        sys.stdout.write(instrumentation.format_metrics())
+    elif options.format == 'json':
+        print(json.dumps(instrumentation.get_summary(), indent=2))
+    else:
+        summary = instrumentation.get_summary()
+        print('%-26s %10s %10s %10s %9s' % ('stage', 'calls', 'seconds', 'own', 'own us'))
+        for stage, values in summary['stages'].items():
+            print('%-26s %10d %10.3f %10.3f %9.2f' % (stage, values['calls'], values['seconds'],
+                                                      values['own_seconds'], values['mean_us']))
+        print(', '.join('%s %d' % item for item in summary['events'].items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
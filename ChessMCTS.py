@@ -0,0 +1,477 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file adds a Monte Carlo tree search (MCTS) computer player for the chess
+# variant in ChessGame.py. A game is won by capturing a whole set of one type, which is hard to
+# judge with a score like VariantEvaluator's, so 'MCTSEngine' judges a move by how often random
+# games played from it are won instead. Every playout walks down a tree of positions picking
+# moves with UCT (the move with the best win rate plus a bonus for moves that have been tried
+# less), adds one new position to the tree, plays random moves from there to the end of the
+# game, and adds the result to every position it walked through. The move tried most often is
+# played. Playouts are played on a BitboardChessVar that is loaded with the searched position
+# once per search. Every move of a playout comes from legal_moves_idx(), so it is made with
+# push_legal_move_idx() without being checked again, and taken back with pop_move_idx() at the
+# end of the playout. No position string is written or read between playouts, and the searched
+# game is never touched. The tree is kept between moves, and when the engine is asked about a
+# position that is already in it (for example after its own move and the opponent's answer),
+# the playouts already done there are reused:
+#
+#     engine = MCTSEngine()
+#     move, statistics = engine.search(game, max_playouts=2000)
+#     print(statistics['playouts_per_second'])
+
+import argparse
+import math
+import random
+import sys
+import time
+
+from ChessGame import START_POSITION, move_to_algebraic
+from ChessBitboard import BitboardChessVar
+
+
+class MCTSNode:
+    """
+    This class is one position in the tree of an 'MCTSEngine'. It knows the move that reached
+    it, the moves from it that have not been tried yet, and the results of the playouts that
+    went through it.
+
+    Data members:
+        - self._move (The packed move that reached this position, or None for the root.)
+        - self._parent (The node of the position before the move, or None for the root.)
+        - self._children (A list of the nodes of the moves that have been tried.)
+        - self._untried_moves (A list of the legal moves that have no node yet.)
+        - self._key (The position key of this position, see ChessVar.position_key().)
+        - self._win_state (The game state that means the player who made self._move won,
+        'WHITE_WON' or 'BLACK_WON'.)
+        - self._visits (The number of playouts that went through this position.)
+        - self._wins (The number of those playouts the player who made self._move won, with a
+        playout that ended unfinished counted as half a win.)
+
+    Methods:
+        - get_move(self), get_parent(self), get_key(self), get_visits(self)
+            - Return the data members.
+        - get_win_rate(self)
+            - Returns the share of playouts won by the player who made the move.
+        - has_untried_moves(self), has_children(self)
+            - Return True if there are moves left to try or moves that have been tried.
+        - take_untried_move(self, rng)
+            - Removes a random untried move and returns it.
+        - add_child(self, move, win_state, key, moves)
+            - Adds the node of a move and returns it.
+        - select_child(self, exploration)
+            - Returns the child with the highest UCT value.
+        - get_best_child(self)
+            - Returns the child that was visited the most.
+        - find_position(self, key, depth)
+            - Returns the node of a position a few moves below this one, or None.
+        - update(self, game_state)
+            - Adds the result of one playout.
+        - detach(self)
+            - Makes this node a root.
+
+    Classes in communication with:
+        - MCTSEngine (Builds the tree and runs the playouts.)
+    """
+
+    __slots__ = ('_move', '_parent', '_children', '_untried_moves', '_key', '_win_state',
+                 '_visits', '_wins')
+
+    def __init__(self, move, parent, win_state, key, moves):
+        self._move = move
+        self._parent = parent
+        self._children = []
+        self._untried_moves = moves
+        self._key = key
+        self._win_state = win_state
+        self._visits = 0
+        self._wins = 0.0
+
+    def get_move(self):
+        """
+        Returns the move that reached this position.
+
+        Return value:
+            - a packed move, or None for the root
+        """
+        return self._move
+
+    def get_parent(self):
+        """
+        Returns the node of the position before the move.
+
+        Return value:
+            - an MCTSNode, or None for the root
+        """
+        return self._parent
+
+    def get_key(self):
+        """
+        Returns the position key of this position.
+
+        Return value:
+            - position key (an integer from 0 to 2**64 - 1)
+        """
+        return self._key
+
+    def get_visits(self):
+        """
+        Returns the number of playouts that went through this position.
+
+        Return value:
+            - number of playouts (an integer)
+        """
+        return self._visits
+
+    def get_win_rate(self):
+        """
+        Returns the share of the playouts through this position that the player who made the
+        move won.
+
+        Return value:
+            - win rate (a float from 0 to 1, or 0.5 if there have been no playouts)
+        """
+        return self._wins / self._visits if self._visits else 0.5
+
+    def has_untried_moves(self):
+        """Returns True if some legal moves from this position have no node yet."""
+        return bool(self._untried_moves)
+
+    def has_children(self):
+        """Returns True if some moves from this position have been tried."""
+        return bool(self._children)
+
+    def take_untried_move(self, rng):
+        """
+        Removes a random move from the untried moves and returns it.
+
+        Parameters:
+            - rng: The random.Random object the move is picked with.
+
+        Return value:
+            - a packed move
+        """
+        moves = self._untried_moves
+        index = rng.randrange(len(moves))
+        moves[index], moves[-1] = moves[-1], moves[index]
+        return moves.pop()
+
+    def add_child(self, move, win_state, key, moves):
+        """
+        Adds the node of the position after a move.
+
+        Parameters:
+            - move: The packed move.
+            - win_state: The game state that means the player making the move won.
+            Example: 'WHITE_WON'
+            - key: The position key after the move.
+            - moves: The legal moves after the move.
+
+        Return value:
+            - the new MCTSNode
+        """
+        child = MCTSNode(move, self, win_state, key, moves)
+        self._children.append(child)
+        return child
+
+    def select_child(self, exploration):
+        """
+        Returns the child with the highest UCT value: its win rate plus
+        exploration * sqrt(ln(visits of this node) / visits of the child). Children that have
+        been tried less get a bigger bonus, so no move is given up on too early.
+
+        Parameters:
+            - exploration: How much to favor moves that have been tried less. Example: 1.4
+
+        Return value:
+            - an MCTSNode
+        """
+        scale = exploration * math.sqrt(math.log(self._visits))
+        return max(self._children,
+                   key=lambda child: child._wins / child._visits + scale / math.sqrt(child._visits))
+
+    def get_best_child(self):
+        """
+        Returns the child that was visited the most, which is the move the search trusts most.
+
+        Return value:
+            - an MCTSNode, or None if no move has been tried
+        """
+        if not self._children:
+            return None
+        return max(self._children, key=lambda child: child._visits)
+
+    def find_position(self, key, depth):
+        """
+        Looks for the node of a position with the given key at most depth moves below this one.
+
+        Parameters:
+            - key: The position key to look for.
+            - depth: How many moves down to look. Example: 2
+
+        Return value:
+            - an MCTSNode, or None if the position is not in the tree
+        """
+        if self._key == key:
+            return self
+        if depth > 0:
+            for child in self._children:
+                node = child.find_position(key, depth - 1)
+                if node is not None:
+                    return node
+        return None
+
+    def update(self, game_state):
+        """
+        Adds the result of one playout through this position.
+
+        Parameters:
+            - game_state: The state the playout ended in, 'WHITE_WON', 'BLACK_WON' or
+            'UNFINISHED'.
+        """
+        self._visits += 1
+        if game_state == self._win_state:
+            self._wins += 1.0
+        elif game_state == 'UNFINISHED':
+            self._wins += 0.5
+
+    def detach(self):
+        """Makes this node the root of its own tree, so the rest of the old tree can be freed."""
+        self._parent = None
+
+
+class MCTSEngine:
+    """
+    This class finds moves with Monte Carlo tree search. It keeps its tree from one search to
+    the next, so the playouts of earlier searches are used again when the game reaches a
+    position that is already in the tree.
+
+    Data members:
+        - self._exploration (The UCT exploration constant.)
+        - self._max_playout_plies (A playout that lasts this many moves is stopped and counted
+        as unfinished.)
+        - self._random (The random.Random object moves are picked with.)
+        - self._reuse_tree (True if the tree is kept between searches.)
+        - self._root (The root of the tree of the last search, or None.)
+        - self._playout_game (The BitboardChessVar the moves of playouts are made on, in the
+        position of the root and with the rules of the game being searched.)
+
+    Methods:
+        - search(self, game, max_playouts, max_time, stop)
+            - Returns the best move and a dictionary of search statistics.
+        - find_root(self, game)
+            - Returns the node of the game's position, reusing the old tree if it can.
+        - load_playout_game(self, game)
+            - Puts self._playout_game in the position of a game.
+        - run_playout(self, root)
+            - Runs one playout from the root and adds its result to the tree.
+        - play_random_game(self)
+            - Plays random moves to the end and returns the final game state.
+        - clear(self)
+            - Forgets the tree.
+
+    Classes in communication with:
+        - MCTSNode (The positions of the tree.)
+        - ChessVar (The game being searched. Only its public methods are used.)
+        - BitboardChessVar (The fast version of the game the playouts are played on.)
+    """
+
+    def __init__(self, exploration=1.4, max_playout_plies=200, rng=None, reuse_tree=True):
+        self._exploration = exploration
+        self._max_playout_plies = max_playout_plies
+        self._random = rng or random.Random()
+        self._reuse_tree = reuse_tree
+        self._root = None
+        self._playout_game = BitboardChessVar()
+
+    def search(self, game, max_playouts=1000, max_time=None, stop=None):
+        """
+        Finds the best move for the player whose turn it is by running playouts until
+        max_playouts have been run, max_time seconds have passed, or stop() returns True. The
+        game is left exactly as it was.
+
+        Parameters:
+            - game: A ChessVar object.
+            - max_playouts: The most playouts to run, or None for no limit. Example: 2000
+            - max_time: Stop after about this many seconds, or None for no limit.
+            - stop: A function with no parameters that returns True when the search should stop,
+            or None.
+
+        Return value:
+            - best_move: A packed move (see pack_move() in ChessGame.py), or None if the game is
+            over or there are no moves
+            - statistics: A dictionary with 'playouts' (run by this search), 'reused' (playouts
+            kept from earlier searches), 'win_rate' (of the best move, for the player to move),
+            'nodes' (positions added to the tree by this search, not counting a reused subtree),
+            'seconds' and 'playouts_per_second'
+        """
+        start = time.perf_counter()
+        deadline = None if max_time is None else start + max_time
+        root = self.find_root(game)
+        reused = root.get_visits()
+        self.load_playout_game(game)
+        nodes = 0
+
+        playouts = 0
+        if root.has_untried_moves() or root.has_children():
+            while max_playouts is None or playouts < max_playouts:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if stop is not None and stop():
+                    break
+                nodes += self.run_playout(root)
+                playouts += 1
+
+        best_child = root.get_best_child()
+        seconds = time.perf_counter() - start
+        statistics = {'playouts': playouts, 'reused': reused,
+                      'win_rate': best_child.get_win_rate() if best_child is not None else 0.5,
+                      'nodes': nodes, 'seconds': seconds,
+                      'playouts_per_second': playouts / seconds if seconds > 0 else 0.0}
+        return (best_child.get_move() if best_child is not None else None), statistics
+
+    def find_root(self, game):
+        """
+        Returns the node of the game's position. If the tree of the last search has the
+        position at most two moves below its root, that node becomes the new root with all of
+        its playouts. Otherwise a new tree is started.
+
+        Parameters:
+            - game: A ChessVar object.
+
+        Return value:
+            - an MCTSNode
+        """
+        key = game.position_key()
+        node = None
+        if self._reuse_tree and self._root is not None:
+            node = self._root.find_position(key, 2)
+        if node is None:
+            win_state = 'BLACK_WON' if game.get_current_player().get_color() == 'white' else 'WHITE_WON'
+            node = MCTSNode(None, None, win_state, key, game.legal_moves_idx())
+        node.detach()
+        self._root = node
+        return node
+
+    def load_playout_game(self, game):
+        """
+        Puts self._playout_game in the position of a game, making a new one first if the game
+        is played by other rules. This is done once per search, and the playouts take back
+        every move they make, so the playout game stays in this position.
+
+        Parameters:
+            - game: A ChessVar object. It is not changed.
+        """
+        if self._playout_game.get_rules() is not game.get_rules():
+            self._playout_game = BitboardChessVar(game.get_rules())
+        self._playout_game.load_string(game.to_string())
+
+    def run_playout(self, root):
+        """
+        Runs one playout on self._playout_game. Moves are picked with UCT until a position with
+        untried moves is reached, one untried move is added to the tree, and random moves are
+        played from there to the end of the game. The result is added to every node on the way
+        back up.
+
+        Parameters:
+            - root: The MCTSNode of the position of self._playout_game. Every move made is
+            taken back, so the playout game is in the same position at the end.
+
+        Return value:
+            - the number of nodes added to the tree (0 or 1)
+        """
+        game = self._playout_game
+        node = root
+        plies = 0
+        added = 0
+        try:
+            while not node.has_untried_moves() and node.has_children():
+                node = node.select_child(self._exploration)
+                move = node.get_move()
+                game.push_legal_move_idx(move >> 6, move & 63)
+                plies += 1
+
+            if node.has_untried_moves():
+                move = node.take_untried_move(self._random)
+                win_state = game.get_current_player().get_color().upper() + '_WON'
+                game.push_legal_move_idx(move >> 6, move & 63)
+                plies += 1
+                node = node.add_child(move, win_state, game.position_key(), game.legal_moves_idx())
+                added = 1
+
+            game_state = game.get_game_state()
+            if game_state == 'UNFINISHED':
+                game_state = self.play_random_game()
+        finally:
+            for ply in range(plies):
+                game.pop_move_idx()
+
+        while node is not None:
+            node.update(game_state)
+            node = node.get_parent()
+        return added
+
+    def play_random_game(self):
+        """
+        Plays random moves on self._playout_game until the game is over, there are no moves,
+        or self._max_playout_plies moves have been made, and then takes them all back.
+
+        Return value:
+            - the game state at the end: 'WHITE_WON', 'BLACK_WON' or 'UNFINISHED'
+        """
+        playout_game = self._playout_game
+        choice = self._random.choice
+        plies = 0
+        try:
+            for ply in range(self._max_playout_plies):
+                moves = playout_game.legal_moves_idx()
+                if not moves:
+                    break
+                move = choice(moves)
+                playout_game.push_legal_move_idx(move >> 6, move & 63)
+                plies += 1
+            return playout_game.get_game_state()
+        finally:
+            for ply in range(plies):
+                playout_game.pop_move_idx()
+
+    def clear(self):
+        """Forgets the tree, so the next search starts from nothing."""
+        self._root = None
+
+
+def main(arguments=None):
+    """
+    Searches a position with MCTS from the command line and prints the best move, its win rate
+    and the number of playouts per second.
+
+    Parameters:
+        - arguments: A list of command line arguments, or None to use sys.argv.
+
+    Return value:
+        - the exit status (0)
+    """
+    parser = argparse.ArgumentParser(description='Find a move of the chess variant with Monte Carlo tree search.')
+    parser.add_argument('--playouts', type=int, default=2000, help='the number of playouts (default: 2000)')
+    parser.add_argument('--position', default=START_POSITION,
+                        help='a position string to search (default: the start)')
+    parser.add_argument('--moves', nargs='*', default=[],
+                        help='moves to make from the position before searching, like e2e4 e7e5')
+    parser.add_argument('--seed', type=int, default=None)
+    options = parser.parse_args(arguments)
+
+    game = BitboardChessVar.from_string(options.position)
+    for move in options.moves:
+        if not game.make_move(move[:2], move[2:]):
+            parser.error('%s is not a legal move' % move)
+    engine = MCTSEngine(rng=random.Random(options.seed))
+    move, statistics = engine.search(game, options.playouts)
+    print('best move: %s' % ('%s%s' % move_to_algebraic(move) if move is not None else '-'))
+    print('win rate %.3f, %d playouts in %.2fs: %.0f playouts/s'
+          % (statistics['win_rate'], statistics['playouts'], statistics['seconds'],
+             statistics['playouts_per_second']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file searches one position of the chess variant in ChessGame.py with several
+# worker processes at once, so a computer move can use every core. It uses the "lazy SMP" way of
+# sharing the work: every worker runs a normal SearchEngine search of the same position, and all
+# of them use one TranspositionTable kept in shared memory (see ChessTransposition.py). Nothing
+# else is shared. A worker that reaches a position another worker has already searched finds
+# the result in the table instead of searching it again, and the moves the others stored as best
+# are searched first, so the main worker reaches each depth sooner. Half of the helper workers
+# start one ply deeper than the main worker so that they are searching different parts of the
+# tree. The search ends when the main worker finishes, and then the helpers are told to stop
+# through a shared flag. Running this file shows how much faster several workers reach a depth
+# than one worker:
+#
+#     python ChessParallel.py --processes 1 2 4 --depth 5
+#     python ChessParallel.py --position "r4k2/7r/8/8/8/8/8/R3K2R w 000000 000000" --depth 6
+
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessGame import START_POSITION, move_to_algebraic
+from ChessBitboard import BitboardChessVar
+from ChessSearch import SearchEngine
+from ChessTransposition import TranspositionTable, get_table_bytes
+
+# The engine and stop flag of a worker process, set up by init_worker().
+_worker_engine = None
+_worker_stop_flag = None
+
+
+def init_worker(table_buffer, stop_flag):
+    """
+    Sets up a worker process: one SearchEngine whose transposition table is in the shared
+    buffer, and the stop flag shared with the other workers.
+
+    Parameters:
+        - table_buffer: A shared buffer of get_table_bytes() bytes for the transposition table.
+        - stop_flag: A shared value that is set to 1 when the workers should stop.
+    """
+    global _worker_engine, _worker_stop_flag
+    _worker_engine = SearchEngine(table=TranspositionTable(buffer=table_buffer))
+    _worker_stop_flag = stop_flag
+
+
+def search_position(position, worker, max_depth, max_nodes, max_time):
+    """
+    Searches a position in a worker process. Worker 0 is the main worker, and it sets the stop
+    flag when its search is done so that the helpers stop too. The helpers search until they are
+    stopped, until they reach max_depth or until max_time seconds have passed.
+
+    Parameters:
+        - position: A position string. Example: START_POSITION
+        - worker: The number of the worker, from 0. Example: 0
+        - max_depth: The deepest search to try, in plies.
+        - max_nodes: The most positions the main worker visits, or None for no limit.
+        - max_time: The most seconds to search for, or None for no limit.
+
+    Return value:
+        - best_move: A packed move, or None if there are no moves
+        - statistics: The search statistics from SearchEngine.search()
+    """
+    game = BitboardChessVar.from_string(position)
+    stop_flag = _worker_stop_flag
+    if worker == 0:
+        try:
+            return _worker_engine.search(game, max_depth, max_nodes, max_time)
+        finally:
+            stop_flag.value = 1
+    return _worker_engine.search(game, max_depth, None, max_time, stop=lambda: stop_flag.value != 0,
+                                 start_depth=min(1 + worker % 2, max_depth))
+
+
+class ParallelSearchEngine:
+    """
+    This class finds the best move of a chess game with a pool of worker processes that share
+    one transposition table. search() answers the same way as SearchEngine.search(), so the two
+    can be used in the same places.
+
+    Data members:
+        - self._processes (The number of worker processes.)
+        - self._table_buffer (The shared buffer of the transposition table.)
+        - self._table (A 'TranspositionTable' on the shared buffer, used to clear it.)
+        - self._stop_flag (A shared value that tells the helper workers to stop.)
+        - self._pool (The ProcessPoolExecutor of the workers.)
+
+    Methods:
+        - search(self, game, max_depth, max_nodes, max_time)
+            - Returns the best move and a dictionary of search statistics.
+        - clear(self)
+            - Empties the shared transposition table.
+        - get_processes(self)
+            - Returns the number of worker processes.
+        - close(self)
+            - Shuts the worker processes down.
+
+    Classes in communication with:
+        - SearchEngine (Every worker process searches with one.)
+        - TranspositionTable (One table in shared memory is used by every worker.)
+        - BitboardChessVar (The game the workers search, made from a position string.)
+    """
+
+    def __init__(self, processes=None, table_size_mb=16):
+        self._processes = processes or os.cpu_count() or 1
+        self._table_buffer = multiprocessing.RawArray('B', get_table_bytes(table_size_mb))
+        self._table = TranspositionTable(buffer=self._table_buffer)
+        self._stop_flag = multiprocessing.RawValue('b', 0)
+        self._pool = ProcessPoolExecutor(self._processes, initializer=init_worker,
+                                         initargs=(self._table_buffer, self._stop_flag))
+
+    def search(self, game, max_depth=64, max_nodes=None, max_time=None):
+        """
+        Finds the best move for the player whose turn it is, searching with every worker. The
+        move of the worker whose search finished the deepest is returned, and the main worker's
+        move if there is a tie.
+
+        Parameters:
+            - game: A ChessVar object. Its position is copied, so the game is not changed.
+            - max_depth: The deepest search to try, in plies. Example: 5
+            - max_nodes: Stop after the main worker visits about this many positions, or None
+            for no limit.
+            - max_time: Stop after about this many seconds, or None for no limit.
+
+        Return value:
+            - best_move: A packed move (see pack_move() in ChessGame.py), or None if the game is
+            over or there are no moves
+            - statistics: A dictionary with the same keys as SearchEngine.search() returns, where
+            'nodes' and 'nps' count the positions of every worker, and 'processes'
+        """
+        position = game.to_string()
+        self._stop_flag.value = 0
+        futures = [self._pool.submit(search_position, position, worker, max_depth, max_nodes, max_time)
+                   for worker in range(self._processes)]
+        try:
+            results = [future.result() for future in futures]
+        finally:
+            self._stop_flag.value = 1
+
+        best_move, statistics = results[0]
+        for move, helper_statistics in results[1:]:
+            if helper_statistics['depth'] > statistics['depth']:
+                best_move, statistics = move, helper_statistics
+        statistics = dict(statistics)
+        statistics['nodes'] = sum(result[1]['nodes'] for result in results)
+        statistics['seconds'] = results[0][1]['seconds']
+        seconds = statistics['seconds']
+        statistics['nps'] = statistics['nodes'] / seconds if seconds > 0 else 0.0
+        statistics['processes'] = self._processes
+        return best_move, statistics
+
+    def clear(self):
+        """Empties the shared transposition table."""
+        self._table.clear()
+
+    def get_processes(self):
+        """
+        Returns the number of worker processes.
+
+        Return value:
+            - number of processes (an integer)
+        """
+        return self._processes
+
+    def close(self):
+        """Tells any running search to stop and shuts the worker processes down."""
+        self._stop_flag.value = 1
+        self._pool.shutdown(wait=True)
+
+
+def measure_speedup(position, depth, process_counts, table_size_mb=16):
+    """
+    Times searches of a position to a fixed depth with different numbers of workers. The table
+    is emptied before every search, and the workers are started and warmed up with a shallow
+    search before the timing starts.
+
+    Parameters:
+        - position: A position string. Example: START_POSITION
+        - depth: The depth to search to, in plies. Example: 5
+        - process_counts: The numbers of workers to try. Example: [1, 2, 4]
+        - table_size_mb: The size of the shared transposition table, in megabytes.
+
+    Return value:
+        - A list with one (processes, best_move, statistics) tuple for every number of workers
+    """
+    results = []
+    for processes in process_counts:
+        engine = ParallelSearchEngine(processes, table_size_mb)
+        try:
+            game = BitboardChessVar.from_string(position)
+            engine.search(game, 1)
+            engine.clear()
+            best_move, statistics = engine.search(game, depth)
+        finally:
+            engine.close()
+        results.append((processes, best_move, statistics))
+    return results
+
+
+def main(arguments=None):
+    """
+    Searches a position to a fixed depth with each number of workers given and prints the time,
+    the nodes, the nodes per second and the speedup compared to the first number of workers.
+
+    Parameters:
+        - arguments: A list of command line arguments, or None to use sys.argv.
+
+    Return value:
+        - the exit status (0)
+    """
+    parser = argparse.ArgumentParser(description='Time a parallel search of the chess variant.')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                        help='the numbers of worker processes to try (default: 1 and the number of cores)')
+    parser.add_argument('--depth', type=int, default=5, help='the depth to search to (default: 5)')
+    parser.add_argument('--position', default=START_POSITION,
+                        help='a position string to search (default: the start)')
+    parser.add_argument('--table-size', type=int, default=16,
+                        help='the size of the shared transposition table in megabytes (default: 16)')
+    options = parser.parse_args(arguments)
+
+    results = measure_speedup(options.position, options.depth, options.processes, options.table_size)
+    base_seconds = results[0][2]['seconds']
+    for processes, best_move, statistics in results:
+        move = '%s%s' % move_to_algebraic(best_move) if best_move is not None else '-'
+        print('%2d processes: depth %d  %s  score %d  %.3fs  %d nodes  %.0f nps  speedup %.2f'
+              % (processes, statistics['depth'], move, statistics['score'], statistics['seconds'],
+                 statistics['nodes'], statistics['nps'], base_seconds / statistics['seconds']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file checks and times the move generation of the chess variant in ChessGame.py.
+# 'perft' (performance test) counts every sequence of moves of a given length from a position,
+# by making each legal move with push_move_idx(), counting the moves from the new position, and
+# taking the move back with pop_move_idx(). The counts follow this variant's rules: there is no
+# check, so every move legal_moves_idx() gives is counted, a game that is over (a set of pieces
+# was captured) has no moves after it, and a pawn on the last rank has no moves since there is no
+# promotion.
+# The counts for a few positions are checked in below in REFERENCE_COUNTS. They were found with
+# the original version of ChessVar, so running this file checks that every version of the game
+# still makes exactly the same moves, and shows how fast each version is:
+#
+#     python ChessPerft.py                       (check every position with every version)
+#     python ChessPerft.py --depth 5 --backend bitboard
+#     python ChessPerft.py --moves e2e4 e7e5 --depth 3 --divide
+#     python ChessPerft.py --position "r4k2/7r/8/8/8/8/8/R3K2R w 000000 000000" --depth 4
+
+import argparse
+import sys
+import time
+
+from ChessGame import ChessVar, move_to_algebraic
+from ChessBitboard import BitboardChessVar
+
+# The versions of the game that can be checked, by name.
+BACKENDS = {'list': ChessVar, 'bitboard': BitboardChessVar}
+
+# The positions of REFERENCE_COUNTS, each given as the moves that reach it from the start.
+#     - 'start': the starting position.
+#     - 'queen raid': the white queen attacks the black king, so many lines end with a capture of
+#     the king and the end of the game.
+#     - 'last rank': a white pawn has reached g8, where it stays with no moves.
+REFERENCE_POSITIONS = {
+    'start': (),
+    'queen raid': ('e2e4', 'f7f6', 'd1h5'),
+    'last rank': ('f2f4', 'd7d6', 'h2h3', 'g8f6', 'd2d3', 'g7g5', 'f4g5', 'a7a6', 'g5g6', 'f7f5',
+                  'g6g7', 'c8e6', 'a2a3', 'h7h6', 'g7g8'),
+}
+
+# REFERENCE_COUNTS[position][depth - 1] is the number of move sequences of that depth.
+REFERENCE_COUNTS = {
+    'start': (20, 400, 8982, 201378, 5050444),
+    'queen raid': (18, 784, 16003, 646002),
+    'last rank': (34, 814, 26918, 688905),
+}
+
+
+def perft(game, depth):
+    """
+    Counts the sequences of depth legal moves that can be played from the game's position. The
+    game is left as it was.
+
+    Parameters:
+        - game: A ChessVar object.
+        - depth: The number of moves in each sequence. Example: 3
+
+    Return value:
+        - the number of sequences (an integer)
+    """
+    moves = game.legal_moves_idx()
+    if depth <= 1:
+        # the moves of the last ply only need to be counted, not made
+        return len(moves) if depth == 1 else 1
+    count = 0
+    for move in moves:
+        game.push_move_idx(move >> 6, move & 63)
+        count += perft(game, depth - 1)
+        game.pop_move_idx()
+    return count
+
+
+def divide(game, depth):
+    """
+    Counts the move sequences of perft() separately for every first move, which shows which move
+    is wrong when a count does not match.
+
+    Parameters:
+        - game: A ChessVar object.
+        - depth: The number of moves in each sequence, counting the first one. Example: 3
+
+    Return value:
+        - a list of (packed move, count) tuples in the order of legal_moves_idx()
+    """
+    counts = []
+    for move in game.legal_moves_idx():
+        game.push_move_idx(move >> 6, move & 63)
+        counts.append((move, perft(game, depth - 1)))
+        game.pop_move_idx()
+    return counts
+
+
+def timed_perft(game, depth):
+    """
+    Runs perft() and times it.
+
+    Parameters:
+        - game: A ChessVar object.
+        - depth: The number of moves in each sequence.
+
+    Return value:
+        - count: The number of move sequences
+        - seconds: How long the count took
+        - nps: The number of move sequences counted per second
+    """
+    start = time.perf_counter()
+    count = perft(game, depth)
+    seconds = time.perf_counter() - start
+    return count, seconds, count / seconds if seconds > 0 else 0.0
+
+
+def play_moves(game, moves):
+    """
+    Makes a list of moves on a game, for reaching the position to count from.
+
+    Parameters:
+        - game: A ChessVar object.
+        - moves: A list of moves, each the square moved from followed by the square moved to.
+        Example: ['e2e4', 'e7e5']
+
+    Return value:
+        - the game
+    """
+    for move in moves:
+        if not game.make_move(move[:2], move[2:]):
+            raise ValueError('illegal move in position: ' + move)
+    return game
+
+
+def check_reference_counts(backend_names, max_depth):
+    """
+    Counts every position of REFERENCE_COUNTS with every given version of the game, up to
+    max_depth, and prints each count with its time and nodes per second.
+
+    Parameters:
+        - backend_names: A list of names from BACKENDS. Example: ['list', 'bitboard']
+        - max_depth: The deepest count to run. Example: 4
+
+    Return value:
+        - True: if every count matched
+        - False: if any count was different
+    """
+    all_passed = True
+    for backend_name in backend_names:
+        for position_name, moves in REFERENCE_POSITIONS.items():
+            game = play_moves(BACKENDS[backend_name](), moves)
+            expected_counts = REFERENCE_COUNTS[position_name]
+            for depth in range(1, min(max_depth, len(expected_counts)) + 1):
+                count, seconds, nps = timed_perft(game, depth)
+                expected = expected_counts[depth - 1]
+                result = 'ok' if count == expected else 'FAILED (expected %d)' % expected
+                all_passed = all_passed and count == expected
+                print('%-9s %-11s depth %d: %9d  %7.3fs  %9.0f nps  %s'
+                      % (backend_name, position_name, depth, count, seconds, nps, result))
+    return all_passed
+
+
+def main(arguments=None):
+    """
+    Runs perft from the command line. With no --moves or --position, every reference position is
+    checked and the program exits with status 1 if any count is wrong. Otherwise the position
+    given by --position (a position string, see ChessGame.START_POSITION) followed by --moves is
+    counted to --depth, split by first move if --divide is given.
+
+    Parameters:
+        - arguments: A list of command line arguments, or None to use sys.argv.
+
+    Return value:
+        - the exit status (0 or 1)
+    """
+    parser = argparse.ArgumentParser(description='Count and time move sequences of the chess variant.')
+    parser.add_argument('--backend', choices=sorted(BACKENDS) + ['all'], default='all',
+                        help='the version of the game to use (default: all)')
+    parser.add_argument('--depth', type=int, default=4, help='the number of moves to count (default: 4)')
+    parser.add_argument('--moves', nargs='*', default=None,
+                        help='moves from the start to the position to count, like e2e4 e7e5')
+    parser.add_argument('--position', default=None,
+                        help='a position string to count from instead of the start (before --moves)')
+    parser.add_argument('--divide', action='store_true', help='print the count for every first move')
+    options = parser.parse_args(arguments)
+    backend_names = sorted(BACKENDS) if options.backend == 'all' else [options.backend]
+
+    if options.moves is None and options.position is None and not options.divide:
+        return 0 if check_reference_counts(backend_names, options.depth) else 1
+
+    for backend_name in backend_names:
+        if options.position is None:
+            game = BACKENDS[backend_name]()
+        else:
+            game = BACKENDS[backend_name].from_string(options.position)
+        game = play_moves(game, options.moves or [])
+        if options.divide:
+            start = time.perf_counter()
+            counts = divide(game, options.depth)
+            seconds = time.perf_counter() - start
+            for move, count in counts:
+                print('%s%s: %d' % (move_to_algebraic(move) + (count,)))
+            total = sum(count for move, count in counts)
+        else:
+            total, seconds, nps = timed_perft(game, options.depth)
+        print('%s depth %d: %d  %.3fs  %.0f nps'
+              % (backend_name, options.depth, total, seconds, total / seconds if seconds > 0 else 0.0))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,328 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file saves games of the chess variant in ChessGame.py in a compact binary
+# format and reads them back. Games are lists of packed moves (see pack_move() in ChessGame.py),
+# and a move is stored in its 12 bits: 6 bits for the index of the square moved from and 6 bits
+# for the square moved to, where the index of a square is row * 8 + column (a8 is 0 and h1 is 63),
+# so two moves fit in 3 bytes instead of the 8 characters of two ('e2', 'e4') pairs written as
+# text. A record file starts with MAGIC, followed by the games one after another. Each game has a
+# 3-byte header with its number of moves (plies) and its result, followed by its moves.
+# 'GameRecordWriter' adds games to a file one at a time, and also writes an index file next to it
+# with the byte offset of every game, so 'GameRecordReader' can jump straight to any game by its
+# number. read_games() reads a file from start to end one game at a time, and replay() makes the
+# moves of a game on a ChessVar one at a time, so a game is only rebuilt if it is needed.
+
+import struct
+import sys
+from array import array
+
+from ChessGame import ChessVar, move_to_algebraic
+
+# The first bytes of every record file.
+MAGIC = b'CVGR\x01'
+
+# The header of a game: the number of moves as an unsigned 16-bit integer and the result as one
+# byte, little-endian.
+GAME_HEADER = struct.Struct('<HB')
+
+# The results a game can have, by the number stored in its header.
+RESULTS = ('UNFINISHED', 'WHITE_WON', 'BLACK_WON')
+
+# The end of the name of a record file's index file. An index file has the byte offset of every
+# game as an unsigned 64-bit integer, little-endian on every machine.
+INDEX_SUFFIX = '.idx'
+
+
+def pack_moves(moves):
+    """
+    Packs a list of moves into bytes, 12 bits per move. The first move is in the lowest bits.
+
+    Parameters:
+        - moves: A list of packed moves. Example: [3364]
+
+    Return value:
+        - a bytes object of (12 * len(moves) + 7) // 8 bytes
+    """
+    packed = 0
+    for ply, move in enumerate(moves):
+        packed |= move << (12 * ply)
+    return packed.to_bytes((12 * len(moves) + 7) // 8, 'little')
+
+
+def unpack_moves(data, plies):
+    """
+    Unpacks moves packed with pack_moves().
+
+    Parameters:
+        - data: The bytes of the packed moves.
+        - plies: The number of moves packed in the bytes.
+
+    Return value:
+        - a list of packed moves
+    """
+    packed = int.from_bytes(data, 'little')
+    return [(packed >> (12 * ply)) & 0xFFF for ply in range(plies)]
+
+
+def read_game(file):
+    """
+    Reads the game at the current position of an open record file.
+
+    Parameters:
+        - file: A record file opened for reading in binary mode.
+
+    Return value:
+        - a dictionary with 'moves' (a list of packed moves), 'winner' (the result: 'UNFINISHED',
+        'WHITE_WON' or 'BLACK_WON') and 'plies' (the number of moves), or None at the end of the
+        file
+    """
+    header = file.read(GAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < GAME_HEADER.size:
+        raise ValueError('record file ends in the middle of a game header')
+    plies, result = GAME_HEADER.unpack(header)
+    if result >= len(RESULTS):
+        raise ValueError('record file has a game with an unknown result %d' % result)
+    data = file.read((12 * plies + 7) // 8)
+    if len(data) < (12 * plies + 7) // 8:
+        raise ValueError('record file ends in the middle of a game')
+    return {'moves': unpack_moves(data, plies), 'winner': RESULTS[result], 'plies': plies}
+
+
+def read_games(path):
+    """
+    Reads the games of a record file from start to end, one at a time, without using its index.
+
+    Parameters:
+        - path: The name of the record file.
+
+    Return value:
+        - a generator of dictionaries like the ones read_game() returns
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(path + ' is not a game record file')
+        while True:
+            game = read_game(file)
+            if game is None:
+                return
+            yield game
+
+
+def replay(moves, game=None):
+    """
+    Makes the moves of a game one at a time, yielding after each one, so a caller can stop as
+    soon as it has reached the position it needs.
+
+    Parameters:
+        - moves: A list of packed moves.
+        - game: The ChessVar object to make the moves on, or None for a new ChessVar.
+
+    Return value:
+        - a generator of (move, game) tuples, where game has just made the move. A ValueError is
+        raised if a move is not valid.
+    """
+    if game is None:
+        game = ChessVar()
+    for move in moves:
+        if not game.make_move_idx(move >> 6, move & 63):
+            raise ValueError('move %s%s is not valid' % move_to_algebraic(move))
+        yield move, game
+
+
+def build_index(path):
+    """
+    Writes the index file of a record file by reading every game, for example if the index file
+    was lost.
+
+    Parameters:
+        - path: The name of the record file.
+
+    Return value:
+        - the number of games in the file
+    """
+    offsets = array('Q')
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(path + ' is not a game record file')
+        while True:
+            offset = file.tell()
+            header = file.read(GAME_HEADER.size)
+            if not header:
+                break
+            plies, result = GAME_HEADER.unpack(header)
+            file.seek((12 * plies + 7) // 8, 1)
+            offsets.append(offset)
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    with open(path + INDEX_SUFFIX, 'wb') as index_file:
+        offsets.tofile(index_file)
+    return len(offsets)
+
+
+class GameRecordWriter:
+    """
+    This class adds games to a record file one at a time, writing each game as soon as it is
+    given, so games can be saved while they are still being played. It can be used in a 'with'
+    statement, which closes the files at the end.
+
+    Data members:
+        - self._file (the record file, opened for adding to)
+        - self._index_file (the index file, opened for adding to)
+        - self._games (The number of games in the file.)
+
+    Methods:
+        - write_game(self, moves, winner)
+            - Adds a game to the file.
+        - write_result(self, result)
+            - Adds a game given as a dictionary like the ones ChessSimulate.py makes.
+        - get_game_count(self)
+            - Returns the number of games in the file.
+        - close(self)
+            - Closes the files.
+
+    Classes in communication with:
+        - GameRecordReader (Reads the files a GameRecordWriter writes.)
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._index_file = open(path + INDEX_SUFFIX, 'ab')
+        self._games = self._index_file.tell() // 8
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def write_game(self, moves, winner='UNFINISHED'):
+        """
+        Adds a game to the end of the file and its offset to the end of the index.
+
+        Parameters:
+            - moves: A list of packed moves.
+            - winner: The result of the game: 'UNFINISHED', 'WHITE_WON' or 'BLACK_WON'
+
+        Return value:
+            - the number of the game in the file
+        """
+        if len(moves) > 0xFFFF:
+            raise ValueError('a game can have at most 65535 moves')
+        self._index_file.write(struct.pack('<Q', self._file.tell()))
+        self._file.write(GAME_HEADER.pack(len(moves), RESULTS.index(winner)))
+        self._file.write(pack_moves(moves))
+        self._games += 1
+        return self._games - 1
+
+    def write_result(self, result):
+        """
+        Adds a game given as a dictionary with 'moves' and 'winner', like the results of
+        ChessSimulate.simulate().
+
+        Parameters:
+            - result: A dictionary with 'moves' and 'winner'.
+
+        Return value:
+            - the number of the game in the file
+        """
+        return self.write_game(result['moves'], result['winner'])
+
+    def get_game_count(self):
+        """
+        Returns the number of games in the file.
+
+        Return value:
+            - number of games (an integer)
+        """
+        return self._games
+
+    def close(self):
+        """Closes the record file and the index file."""
+        self._file.close()
+        self._index_file.close()
+
+
+class GameRecordReader:
+    """
+    This class reads the games of a record file, using its index file to find any game by its
+    number without reading the games before it. It can be used in a 'with' statement, which
+    closes the file at the end.
+
+    Data members:
+        - self._file (the record file, opened for reading)
+        - self._offsets (An array with the byte offset of every game in the file.)
+
+    Methods:
+        - get_game(self, number)
+            - Returns one game by its number.
+        - replay_game(self, number)
+            - Makes the moves of a game on a new ChessVar one at a time.
+        - close(self)
+            - Closes the file.
+
+    Classes in communication with:
+        - GameRecordWriter (Writes the files a GameRecordReader reads.)
+        - ChessVar (Games can be replayed on a ChessVar.)
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            if self._file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(path + ' is not a game record file')
+            self._offsets = array('Q')
+            with open(path + INDEX_SUFFIX, 'rb') as index_file:
+                self._offsets.frombytes(index_file.read())
+            if sys.byteorder == 'big':
+                self._offsets.byteswap()
+        except Exception:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __iter__(self):
+        for number in range(len(self._offsets)):
+            yield self.get_game(number)
+
+    def get_game(self, number):
+        """
+        Returns one game of the file.
+
+        Parameters:
+            - number: The number of the game, starting from 0. Example: 12
+
+        Return value:
+            - a dictionary with 'moves', 'winner' and 'plies', like read_game() returns
+        """
+        self._file.seek(self._offsets[number])
+        return read_game(self._file)
+
+    def replay_game(self, number, game=None):
+        """
+        Makes the moves of one game of the file one at a time.
+
+        Parameters:
+            - number: The number of the game, starting from 0.
+            - game: The ChessVar object to make the moves on, or None for a new ChessVar.
+
+        Return value:
+            - a generator of (move, game) tuples, like replay() returns
+        """
+        return replay(self.get_game(number)['moves'], game)
+
+    def close(self):
+        """Closes the record file."""
+        self._file.close()
@@ -0,0 +1,304 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file runs engine searches for the chess variant in ChessGame.py in a pool of
+# worker processes, so an asyncio program like the game server in ChessServer.py can ask for
+# computer moves without a search blocking every other game in its event loop. 'SearchScheduler'
+# keeps a queue of search jobs. Each job is a position string (see ChessVar.to_string()), a time
+# budget and the seconds left on the clock of the player it is for, and jobs for players with
+# the least time left are searched first. Only a fixed number of jobs may wait, and submit()
+# raises asyncio.QueueFull when that many are waiting instead of letting jobs pile up, so the
+# caller can slow down. Cancelled jobs do not count, even before they leave the queue. A job is
+# cancelled by its key, for example the number of a game that ended. A job that is still waiting
+# is dropped, and a search that is running is told to stop through a flag in shared memory that
+# the worker's SearchEngine checks while it searches:
+#
+#     scheduler = SearchScheduler(processes=4)
+#     scheduler.start()
+#     move, statistics = await scheduler.submit(game_id, game, time_budget=0.5, clock_seconds=30)
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessBitboard import BitboardChessVar
+from ChessSearch import SearchEngine
+
+# The engine and stop flags of a worker process, set up by init_worker().
+_worker_engine = None
+_worker_stop_flags = None
+
+
+def init_worker(stop_flags, table_size_mb):
+    """
+    Sets up a worker process: one SearchEngine that is kept for every job the process runs, and
+    the stop flags shared with the scheduler.
+
+    Parameters:
+        - stop_flags: A shared array with one stop flag for every worker slot.
+        - table_size_mb: The size of the engine's transposition table, in megabytes.
+    """
+    global _worker_engine, _worker_stop_flags
+    _worker_engine = SearchEngine(table_size_mb)
+    _worker_stop_flags = stop_flags
+
+
+def search_position(position, slot, time_budget, max_nodes, max_depth):
+    """
+    Searches a position in a worker process. The search stops when its budget is used up or
+    when the stop flag of its slot is set.
+
+    Parameters:
+        - position: A position string. Example: START_POSITION
+        - slot: The number of the scheduler's slot running the job.
+        - time_budget: The most seconds to search for.
+        - max_nodes: The most positions to visit, or None for no limit.
+        - max_depth: The deepest search to try, in plies.
+
+    Return value:
+        - best_move: A packed move, or None if there are no moves
+        - statistics: The search statistics from SearchEngine.search()
+    """
+    game = BitboardChessVar.from_string(position)
+    stop_flags = _worker_stop_flags
+    return _worker_engine.search(game, max_depth, max_nodes, time_budget,
+                                 stop=lambda: stop_flags[slot] != 0)
+
+
+class SearchJob:
+    """
+    This class is one search waiting in a 'SearchScheduler' or running in one of its workers.
+
+    Data members:
+        - self._key (The key the job can be cancelled by, for example a game number.)
+        - self._position (The position string of the position to search.)
+        - self._time_budget (The most seconds to search for.)
+        - self._future (The asyncio future that gets the result of the search.)
+
+    Methods:
+        - get_key(self), get_position(self), get_time_budget(self), get_future(self)
+            - Return the data members.
+
+    Classes in communication with:
+        - SearchScheduler (Makes and runs the jobs.)
+    """
+
+    def __init__(self, key, position, time_budget, future):
+        self._key = key
+        self._position = position
+        self._time_budget = time_budget
+        self._future = future
+
+    def get_key(self):
+        """
+        Returns the key of the job.
+
+        Return value:
+            - the key given to SearchScheduler.submit()
+        """
+        return self._key
+
+    def get_position(self):
+        """
+        Returns the position string of the job.
+
+        Return value:
+            - a position string
+        """
+        return self._position
+
+    def get_time_budget(self):
+        """
+        Returns the time budget of the job.
+
+        Return value:
+            - seconds (a float)
+        """
+        return self._time_budget
+
+    def get_future(self):
+        """
+        Returns the future that gets the result of the job.
+
+        Return value:
+            - an asyncio future
+        """
+        return self._future
+
+
+class SearchScheduler:
+    """
+    This class runs search jobs in a pool of worker processes, for an asyncio event loop. One
+    dispatcher task per worker takes the most urgent job from the queue and waits for a worker
+    to search it, so the event loop is never blocked by a search.
+
+    Data members:
+        - self._processes (The number of worker processes.)
+        - self._queue (An asyncio.PriorityQueue of (clock seconds, number, job) tuples. It can
+        also hold cancelled jobs, which are skipped when they reach the front.)
+        - self._max_queued (The most jobs that may wait that are not cancelled.)
+        - self._jobs (A dictionary from key to the job waiting or running for that key.)
+        - self._running (A list with the job every slot is running, or None.)
+        - self._stop_flags (A shared array with one stop flag for every slot. Setting a flag
+        makes the search running in that slot stop.)
+        - self._table_size_mb (The size of each worker's transposition table, in megabytes.)
+        - self._max_nodes (The most positions a search visits, or None for no limit.)
+        - self._max_depth (The deepest search to try, in plies.)
+        - self._numbers (A counter that keeps jobs with the same clock in the order they came.)
+        - self._pool (the ProcessPoolExecutor, once started)
+        - self._dispatchers (the dispatcher tasks, once started)
+
+    Methods:
+        - start(self)
+            - Starts the workers and dispatchers.
+        - submit(self, key, game, time_budget, clock_seconds)
+            - Adds a job and returns a future for its result.
+        - cancel(self, key)
+            - Cancels the job of a key.
+        - has_job(self, key)
+            - Returns True if a job of a key is waiting or running.
+        - get_queued_count(self)
+            - Returns the number of jobs waiting.
+        - dispatch(self, slot)
+            - Runs the jobs of one slot.
+        - close(self)
+            - Stops the dispatchers and the workers.
+
+    Classes in communication with:
+        - SearchJob (The jobs in the queue.)
+        - SearchEngine (Searches the jobs in the worker processes.)
+        - GameServer (Can use a scheduler for the moves of the engine.)
+    """
+
+    def __init__(self, processes=None, max_queued=256, table_size_mb=16, max_nodes=None, max_depth=64):
+        self._processes = processes or os.cpu_count() or 1
+        self._queue = asyncio.PriorityQueue()
+        self._max_queued = max_queued
+        self._jobs = {}
+        self._running = [None] * self._processes
+        self._stop_flags = multiprocessing.RawArray('b', self._processes)
+        self._table_size_mb = table_size_mb
+        self._max_nodes = max_nodes
+        self._max_depth = max_depth
+        self._numbers = itertools.count()
+        self._pool = None
+        self._dispatchers = []
+
+    def start(self):
+        """Starts the worker processes and one dispatcher task per worker in the running loop."""
+        self._pool = ProcessPoolExecutor(self._processes, initializer=init_worker,
+                                         initargs=(self._stop_flags, self._table_size_mb))
+        self._dispatchers = [asyncio.ensure_future(self.dispatch(slot)) for slot in range(self._processes)]
+
+    def submit(self, key, game, time_budget, clock_seconds=None):
+        """
+        Adds a search of a game's position to the queue. A job that was already waiting or
+        running for the same key is cancelled, since only the newest position matters. Jobs
+        with fewer clock seconds are searched first.
+
+        Parameters:
+            - key: The key the job can be cancelled by. Example: the number of the game
+            - game: A ChessVar object. Its position is copied, so the game can go on changing.
+            - time_budget: The most seconds to search for. Example: 0.5
+            - clock_seconds: The seconds left on the clock of the player the move is for, or
+            None if there is no clock.
+
+        Return value:
+            - an asyncio future for the (best_move, statistics) result of the search. It is
+            cancelled if the job is cancelled. asyncio.QueueFull is raised if self._max_queued
+            jobs are already waiting, and then nothing is added.
+        """
+        # the job it replaces is cancelled first, so it does not count as waiting
+        self.cancel(key)
+        if self.get_queued_count() >= self._max_queued:
+            raise asyncio.QueueFull()
+        job = SearchJob(key, game.to_string(), time_budget, asyncio.get_running_loop().create_future())
+        priority = float('inf') if clock_seconds is None else clock_seconds
+        self._queue.put_nowait((priority, next(self._numbers), job))
+        self._jobs[key] = job
+        return job.get_future()
+
+    def cancel(self, key):
+        """
+        Cancels the job of a key. A waiting job is dropped when it reaches the front of the
+        queue, and a running search is told to stop.
+
+        Parameters:
+            - key: The key of the job. Example: the number of the game
+
+        Return value:
+            - True: if a job was cancelled
+            - False: if there was no job for the key
+        """
+        job = self._jobs.pop(key, None)
+        if job is None:
+            return False
+        job.get_future().cancel()
+        for slot, running_job in enumerate(self._running):
+            if running_job is job:
+                self._stop_flags[slot] = 1
+        return True
+
+    def has_job(self, key):
+        """
+        Returns True if a job of a key is waiting or running.
+
+        Parameters:
+            - key: The key of the job.
+        """
+        return key in self._jobs
+
+    def get_queued_count(self):
+        """
+        Returns the number of jobs waiting for a worker. Cancelled jobs are not counted, even if
+        they have not reached the front of the queue yet.
+
+        Return value:
+            - number of jobs (an integer)
+        """
+        running = sum(1 for job in self._running if job is not None and not job.get_future().done())
+        return len(self._jobs) - running
+
+    async def dispatch(self, slot):
+        """
+        Takes jobs from the queue one at a time and has a worker search them, until the task is
+        cancelled. Cancelled jobs are skipped.
+
+        Parameters:
+            - slot: The number of this dispatcher, which is also the index of its stop flag.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            priority, number, job = await self._queue.get()
+            if job.get_future().done():
+                continue
+            self._running[slot] = job
+            self._stop_flags[slot] = 0
+            try:
+                result = await loop.run_in_executor(self._pool, search_position, job.get_position(), slot,
+                                                    job.get_time_budget(), self._max_nodes, self._max_depth)
+            except Exception as error:
+                if not job.get_future().done():
+                    job.get_future().set_exception(error)
+            else:
+                if not job.get_future().done():
+                    job.get_future().set_result(result)
+            finally:
+                self._running[slot] = None
+                if self._jobs.get(job.get_key()) is job:
+                    del self._jobs[job.get_key()]
+
+    async def close(self):
+        """
+        Cancels every job, stops the dispatchers and shuts the worker processes down. Waiting for
+        the workers to exit is done in another thread, so the event loop keeps running.
+        """
+        for key in list(self._jobs):
+            self.cancel(key)
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self._pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._pool.shutdown, True)
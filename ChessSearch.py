@@ -0,0 +1,395 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file adds a computer player for the chess variant in ChessGame.py. The class
+# 'SearchEngine' looks ahead at the moves of a ChessVar (or BitboardChessVar) game using
+# iterative deepening negamax with alpha-beta pruning and a transposition table. Moves are packed
+# integers (see pack_move() in ChessGame.py), taken with push_move_idx() and taken back with
+# pop_move_idx(), so the game is never copied and no strings are used. A game is over
+# when a player has captured all of an opponent's pieces of one type, which ChessVar finds with
+# check_if_winner() after every move. Positions are scored by the VariantEvaluator in ChessEval.py.
+# Captures are searched first, starting with captures of the piece type the opponent has the
+# fewest of left, since those are closest to winning. A search can be limited by a number of
+# nodes, a number of seconds, or a depth, and it returns the best move it found together with
+# statistics about the search.
+
+import time
+
+from ChessGame import TYPE_INDICES
+from ChessEval import VariantEvaluator
+from ChessTransposition import TranspositionTable
+
+# A score larger than any evaluation. Winning at ply p scores WIN_SCORE - p, so faster wins are
+# preferred and slower losses are preferred.
+WIN_SCORE = 1000000
+INFINITY = WIN_SCORE + 1
+
+# Any score further from 0 than this is a win or a loss.
+WIN_THRESHOLD = WIN_SCORE - 1000
+
+# Flags stored with a transposition table score.
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class SearchStopped(Exception):
+    """Raised inside a search when its node or time budget has run out."""
+
+
+class SearchEngine:
+    """
+    This class searches the moves of a chess game to find the best one for the player whose turn
+    it is. It uses iterative deepening: it searches one move deep, then two, and so on until a
+    budget runs out, and answers with the best move of the deepest search that finished.
+
+    Data members:
+        - self._table (The 'TranspositionTable' used to remember positions between searches.)
+        - self._nodes (The number of positions visited in the current search.)
+        - self._max_nodes (The node budget of the current search, or None.)
+        - self._deadline (The time.perf_counter() value the current search must stop at, or None.)
+        - self._stop (A function that returns True when the current search should stop, or None.)
+        - self._evaluator_class (The class used to score positions, VariantEvaluator by default.)
+        - self._evaluator (The evaluator of the current search. Every move is made and taken back
+        through it, so it can keep its score up to date.)
+        - self._book (A 'PositionBook' whose best move is played without searching when the
+        position is in it, or None.)
+
+    Methods:
+        - search(self, game, max_depth, max_nodes, max_time, stop, start_depth)
+            - Returns the best move and a dictionary of search statistics.
+        - order_moves(self, game, moves, best_move)
+            - Sorts moves so the most promising are searched first.
+        - negamax(self, game, depth, alpha, beta, ply)
+            - Alpha-beta search of one position.
+        - quiescence(self, game, alpha, beta, ply)
+            - Searches captures only, so the search does not stop in the middle of an exchange.
+        - clear(self)
+            - Empties the transposition table.
+        - get_table(self)
+            - Returns the transposition table, for example to read its statistics.
+
+    Classes in communication with:
+        - ChessVar (The game being searched. Only its public methods are used.)
+        - VariantEvaluator (Scores the positions of the search.)
+        - TranspositionTable (Remembers the positions that have been searched.)
+        - PositionBook (Has the moves to play in known positions, if one is given.)
+    """
+
+    def __init__(self, table_size_mb=16, evaluator_class=VariantEvaluator, book=None, table=None):
+        # a table can be given, for example one shared with the engines of other processes
+        self._table = TranspositionTable(table_size_mb) if table is None else table
+        self._nodes = 0
+        self._max_nodes = None
+        self._deadline = None
+        self._stop = None
+        self._evaluator_class = evaluator_class
+        self._evaluator = None
+        self._book = book
+
+    def clear(self):
+        """Empties the transposition table."""
+        self._table.clear()
+
+    def get_table(self):
+        """
+        Returns the transposition table of the engine.
+
+        Return value:
+            - a 'TranspositionTable'
+        """
+        return self._table
+
+    def search(self, game, max_depth=64, max_nodes=None, max_time=None, stop=None, start_depth=1):
+        """
+        Finds the best move for the player whose turn it is. If the engine has a position book
+        with a move for the position, that move is returned without searching. Otherwise the
+        search starts start_depth plies deep and goes one ply deeper at a time until max_depth
+        is reached, the node budget is used up, max_time seconds have passed, or stop() returns
+        True. The game is left exactly as it was.
+
+        Parameters:
+            - game: A ChessVar object.
+            - max_depth: The deepest search to try, in plies. Example: 4
+            - max_nodes: Stop after visiting about this many positions, or None for no limit.
+            - max_time: Stop after about this many seconds, or None for no limit.
+            - stop: A function with no parameters that returns True when the search should stop,
+            for example because its answer is no longer needed, or None.
+            - start_depth: The depth of the first search. Engines searching the same position
+            with a shared table start at different depths, so they don't all search the same
+            positions at the same time. Example: 1
+
+        Return value:
+            - best_move: A packed move (see pack_move() in ChessGame.py), or None if the game is
+            over or there are no moves
+            - statistics: A dictionary with 'score' (of the best move, for the player to move),
+            'depth' (the deepest search that finished), 'nodes', 'seconds', 'nps' (nodes per
+            second) and 'book' (True if the move came from the position book)
+        """
+        start = time.perf_counter()
+        if self._book is not None:
+            book_move = self._book.get_best_move(game)
+            if book_move is not None:
+                return book_move, {'score': 0, 'depth': 0, 'nodes': 0,
+                                   'seconds': time.perf_counter() - start, 'nps': 0.0, 'book': True}
+
+        self._nodes = 0
+        self._max_nodes = max_nodes
+        self._deadline = None if max_time is None else start + max_time
+        self._stop = stop
+        self._table.new_search()
+        self._evaluator = self._evaluator_class(game)
+
+        moves = game.legal_moves_idx()
+        best_move = moves[0] if moves else None
+        best_score = 0
+        depth_reached = 0
+
+        if len(moves) > 1:
+            for depth in range(start_depth, max_depth + 1):
+                try:
+                    score, move = self.search_root(game, moves, depth, best_move)
+                except SearchStopped:
+                    break
+                best_score, best_move, depth_reached = score, move, depth
+                # a forced win or loss has been found, searching deeper won't change it
+                if abs(best_score) > WIN_THRESHOLD:
+                    break
+
+        seconds = time.perf_counter() - start
+        statistics = {'score': best_score, 'depth': depth_reached, 'nodes': self._nodes,
+                      'seconds': seconds, 'nps': self._nodes / seconds if seconds > 0 else 0.0,
+                      'book': False}
+        return best_move, statistics
+
+    def search_root(self, game, moves, depth, previous_best_move):
+        """
+        Searches every move of the root position to the given depth. The best move of the
+        previous, shallower search is tried first.
+
+        Parameters:
+            - game: A ChessVar object.
+            - moves: The legal moves of the root position.
+            - depth: The depth to search to, in plies.
+            - previous_best_move: The best move found so far, or None.
+
+        Return value:
+            - best_score: The score of the best move
+            - best_move: The best packed move
+        """
+        alpha = -INFINITY
+        best_move = None
+        for move in self.order_moves(game, moves, previous_best_move):
+            self._evaluator.push_move(move >> 6, move & 63)
+            try:
+                score = -self.negamax(game, depth - 1, -INFINITY, -alpha, 1)
+            finally:
+                self._evaluator.pop_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        return alpha, best_move
+
+    def check_budget(self):
+        """
+        Raises SearchStopped if the current search has used up its node or time budget, or has
+        been asked to stop.
+        """
+        if self._max_nodes is not None and self._nodes >= self._max_nodes:
+            raise SearchStopped()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchStopped()
+        if self._stop is not None and self._stop():
+            raise SearchStopped()
+
+    def order_moves(self, game, moves, best_move=None):
+        """
+        Sorts moves so that the moves most likely to be best are searched first, which lets
+        alpha-beta pruning skip more of the tree. The given best move comes first. Captures come
+        next, starting with captures of the piece type the opponent has the fewest of left (so a
+        capture that finishes a set is tried before anything else). Ties are broken by capturing
+        with the least valuable piece, the type with the most pieces in a set under the game's
+        rules. Moves that don't capture come last.
+
+        Parameters:
+            - game: A ChessVar object.
+            - moves: A list of packed moves.
+            - best_move: A move to search first, or None.
+
+        Return value:
+            - a new sorted list of moves
+        """
+        player = game.get_current_player()
+        set_sizes = game.get_rules().get_set_size_list()
+        keyed_moves = []
+        for move in moves:
+            if move == best_move:
+                order = -1
+            else:
+                target_type = game.get_piece_idx(move & 63).get_type()
+                if target_type == '':
+                    order = 100
+                else:
+                    remaining = player.get_remaining_count(target_type)
+                    moving_type = game.get_piece_idx(move >> 6).get_type()
+                    order = remaining * 10 - set_sizes[TYPE_INDICES[moving_type]]
+            keyed_moves.append((order, move))
+        keyed_moves.sort(key=lambda keyed_move: keyed_move[0])
+        return [move for order, move in keyed_moves]
+
+    def negamax(self, game, depth, alpha, beta, ply):
+        """
+        Returns the score of a position for the player whose turn it is, searching depth plies
+        ahead. Scores outside the (alpha, beta) window only need to be bounds.
+
+        Parameters:
+            - game: A ChessVar object.
+            - depth: The number of plies left to search.
+            - alpha: The score the player to move is already sure of.
+            - beta: The score the opponent is already sure of (as a score for the player to move).
+            - ply: The number of moves made since the root position.
+
+        Return value:
+            - score (an integer)
+        """
+        self._nodes += 1
+        if self._nodes & 1023 == 0:
+            self.check_budget()
+
+        # the last move captured a whole set, so the player to move has lost
+        if game.get_game_state() != 'UNFINISHED':
+            return -(WIN_SCORE - ply)
+
+        if depth <= 0:
+            return self.quiescence(game, alpha, beta, ply)
+
+        key = game.position_key()
+        entry = self._table.probe(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, table_move = entry
+            if entry_depth >= depth:
+                entry_score = score_from_table(entry_score, ply)
+                if entry_flag == EXACT:
+                    return entry_score
+                if entry_flag == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if entry_flag == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        moves = game.legal_moves_idx()
+        if not moves:
+            return 0
+
+        # a capture of the last piece of a set wins at once, so there is nothing to search
+        if game.get_current_player().get_last_piece_mask():
+            for move in moves:
+                if game.is_winning_move_idx(move >> 6, move & 63):
+                    return WIN_SCORE - (ply + 1)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in self.order_moves(game, moves, table_move):
+            self._evaluator.push_move(move >> 6, move & 63)
+            try:
+                score = -self.negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self._evaluator.pop_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, depth, score_to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def quiescence(self, game, alpha, beta, ply):
+        """
+        Searches only captures from a position, so that positions in the middle of an exchange
+        of pieces are not scored. The player to move may also choose not to capture, so the
+        position's own evaluation is a lower bound.
+
+        Parameters:
+            - game: A ChessVar object.
+            - alpha: The score the player to move is already sure of.
+            - beta: The score the opponent is already sure of.
+            - ply: The number of moves made since the root position.
+
+        Return value:
+            - score (an integer)
+        """
+        self._nodes += 1
+        if self._nodes & 1023 == 0:
+            self.check_budget()
+
+        if game.get_game_state() != 'UNFINISHED':
+            return -(WIN_SCORE - ply)
+
+        stand_pat = self._evaluator.evaluate()
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = [move for move in game.legal_moves_idx() if game.get_piece_idx(move & 63).get_type() != '']
+        if game.get_current_player().get_last_piece_mask():
+            for move in captures:
+                if game.is_winning_move_idx(move >> 6, move & 63):
+                    return WIN_SCORE - (ply + 1)
+        for move in self.order_moves(game, captures):
+            self._evaluator.push_move(move >> 6, move & 63)
+            try:
+                score = -self.quiescence(game, -beta, -alpha, ply + 1)
+            finally:
+                self._evaluator.pop_move()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+
+def score_to_table(score, ply):
+    """
+    Converts a score found ply moves from the root to one measured from the position itself,
+    so that a stored win keeps the right distance when it is found again at another ply.
+
+    Parameters:
+        - score: A search score.
+        - ply: The number of moves from the root to the position.
+
+    Return value:
+        - the score to store
+    """
+    if score > WIN_THRESHOLD:
+        return score + ply
+    if score < -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    """
+    Converts a stored score back to one measured from the root. This is the reverse of
+    score_to_table().
+
+    Parameters:
+        - score: A stored score.
+        - ply: The number of moves from the root to the position.
+
+    Return value:
+        - the search score
+    """
+    if score > WIN_THRESHOLD:
+        return score - ply
+    if score < -WIN_THRESHOLD:
+        return score + ply
+    return score
@@ -0,0 +1,1207 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file hosts games of the chess variant in ChessGame.py over the network. One
+# 'GameServer' runs every game session in a single asyncio event loop, so tens of thousands of
+# games share one thread instead of needing a thread each: a session is a ChessVar with its
+# players, watchers and clocks, and a connection only uses the loop while one of its lines is
+# being handled. Clients talk to the server with a line-based text protocol over TCP. Every
+# command is one line, and every line the server sends starts with a word saying what it is:
+#
+#     NEW [seconds]         start a game and play white, with [seconds] on each clock
+#     JOIN <game>           play the free color of a game (black, unless white left)
+#     WATCH <game>          watch a game
+#     BOT                   have the engine play the free color of your game
+#     MOVE <from> <to>      make a move in your game. Example: MOVE e2 e4
+#     STATE                 ask for the state of your game again
+#     LEAVE                 leave your game
+#     PING                  check that the server is there
+#     METRICS               ask for the move timing metrics (if the server was started with them)
+#
+#     GAME <game> <role>    you started, joined or are watching a game
+#     MOVED <from> <to>     a move was made in your game (sent to everyone in the game)
+#     STATE <game> <state> <white clock> <black clock> <position string>
+#                           the state of your game (sent to everyone after every move)
+#     EVICTED <game>        your game was closed since nothing happened in it for too long
+#     ERROR <reason>        the command was not done
+#     OK, PONG              the answers to LEAVE and PING
+#     METRIC <sample>       one line of the metrics, in the Prometheus text format, then OK
+#
+# Moves are checked with ChessVar.make_move(). Each player has a clock that runs during their
+# turn while both players are in the game, and a player whose clock runs out loses. A sweep every
+# second ends the games whose clock ran out and closes sessions that have been idle for too long.
+# The engine's moves are searched by a 'SearchScheduler' from ChessScheduler.py in other
+# processes, so a search never holds up the event loop. If its queue is full, the engine's move is
+# asked for again at the next sweep. 'LocalClient' stands in for a client with no network at all,
+# and 'GameClient' connects over TCP. With --metrics, every game is attached to one
+# 'MoveInstrumentation' from ChessInstrument.py, which times the stages of its moves:
+#
+#     python ChessServer.py --port 8765 --clock 300 --engine-processes 4
+#     python ChessServer.py --port 8765 --metrics
+#     python ChessServer.py --demo 100     (plays 100 games between clients on this computer)
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from ChessGame import ChessVar, COLORS, SQUARE_INDICES, move_to_algebraic
+from ChessScheduler import SearchScheduler
+from ChessInstrument import MoveInstrumentation
+
+# A connection is closed if this many bytes are waiting to be sent to it, so a client that
+# stops reading can't make the server keep every broadcast in memory.
+MAX_WRITE_BUFFER = 1 << 20
+
+
+class GameSession:
+    """
+    This class is one game on the server: the ChessVar, the connections playing and watching
+    it, and both players' clocks. A clock runs during its player's turn while both players
+    are in the game.
+
+    Data members:
+        - self._id (The number of the session.)
+        - self._game (the ChessVar being played)
+        - self._players (A dictionary from 'white' and 'black' to the connection playing that
+        color, or None if nobody is.)
+        - self._bot_color (The color the engine plays, or None.)
+        - self._watchers (A set of connections watching the game.)
+        - self._clocks (A dictionary from 'white' and 'black' to the seconds left on that
+        player's clock, not counting the turn that is running.)
+        - self._turn_started (The time the running clock was last updated, or None if no clock
+        is running.)
+        - self._last_activity (The time of the last command for this session.)
+
+    Methods:
+        - get_id(self), get_game(self), get_last_activity(self)
+            - Return the number of the session, the ChessVar and the time of the last command.
+        - touch(self, now)
+            - Sets the time of the last command.
+        - get_free_color(self)
+            - Returns a color nobody is playing, or None.
+        - is_ready(self)
+            - Returns True if both colors are played.
+        - add_player(self, color, connection, now)
+            - Adds a connection playing a color.
+        - add_bot(self, color, now), get_bot_color(self)
+            - Have the engine play a color, and return the color the engine plays.
+        - add_watcher(self, connection)
+            - Adds a connection watching the game.
+        - remove_connection(self, connection, now)
+            - Removes a connection from the session.
+        - get_connections(self)
+            - Returns every connection in the session.
+        - get_clock(self, color, now)
+            - Returns the seconds left on a player's clock.
+        - update_clock(self, now)
+            - Takes the time since the last update off the running clock and ends the game if
+            it ran out.
+        - make_move(self, color, square_moved_from, square_moved_to, now)
+            - Makes a move for a player, returning the reason if it could not be made.
+        - get_state_line(self, now)
+            - Returns the STATE line of the session.
+        - broadcast(self, line)
+            - Sends a line to every connection in the session.
+
+    Classes in communication with:
+        - ChessVar (Every session has a ChessVar.)
+        - GameServer (Keeps the sessions and hands them the commands of their connections.)
+    """
+
+    def __init__(self, game_id, clock_seconds, now):
+        self._id = game_id
+        self._game = ChessVar()
+        self._players = {'white': None, 'black': None}
+        self._bot_color = None
+        self._watchers = set()
+        self._clocks = {'white': float(clock_seconds), 'black': float(clock_seconds)}
+        self._turn_started = None
+        self._last_activity = now
+
+    def get_id(self):
+        """
+        Returns the number of the session.
+
+        Return value:
+            - session number (an integer)
+        """
+        return self._id
+
+    def get_game(self):
+        """
+        Returns the game of the session.
+
+        Return value:
+            - the ChessVar being played
+        """
+        return self._game
+
+    def get_last_activity(self):
+        """
+        Returns the time of the last command for this session.
+
+        Return value:
+            - a time from the server's timer, in seconds
+        """
+        return self._last_activity
+
+    def touch(self, now):
+        """
+        Sets the time of the last command for this session, which keeps it from being evicted.
+
+        Parameters:
+            - now: The current time from the server's timer, in seconds.
+        """
+        self._last_activity = now
+
+    def get_free_color(self):
+        """
+        Returns a color nobody is playing, white first.
+
+        Return value:
+            - 'white', 'black', or None if both colors are being played
+        """
+        for color in COLORS:
+            if self._players[color] is None and color != self._bot_color:
+                return color
+        return None
+
+    def is_ready(self):
+        """
+        Returns True if both colors are played, by a connection or by the engine.
+        """
+        return self.get_free_color() is None
+
+    def add_player(self, color, connection, now):
+        """
+        Adds a connection playing a color. Once both colors are played, the clock of the player
+        to move starts running.
+
+        Parameters:
+            - color: A color nobody is playing. Example: 'black'
+            - connection: The connection of the player.
+            - now: The current time from the server's timer, in seconds.
+        """
+        self._players[color] = connection
+        if self.is_ready() and self._turn_started is None and self._game.get_game_state() == 'UNFINISHED':
+            self._turn_started = now
+
+    def add_bot(self, color, now):
+        """
+        Has the engine play a color nobody is playing. Once both colors are played, the clock
+        of the player to move starts running.
+
+        Parameters:
+            - color: A color nobody is playing. Example: 'black'
+            - now: The current time from the server's timer, in seconds.
+        """
+        self._bot_color = color
+        if self.is_ready() and self._turn_started is None and self._game.get_game_state() == 'UNFINISHED':
+            self._turn_started = now
+
+    def get_bot_color(self):
+        """
+        Returns the color the engine plays.
+
+        Return value:
+            - 'white', 'black', or None if the engine does not play in this session
+        """
+        return self._bot_color
+
+    def add_watcher(self, connection):
+        """
+        Adds a connection watching the game.
+
+        Parameters:
+            - connection: The connection of the watcher.
+        """
+        self._watchers.add(connection)
+
+    def remove_connection(self, connection, now):
+        """
+        Removes a connection from the session. If it was playing, its color becomes free and
+        the running clock stops until the color is played again.
+
+        Parameters:
+            - connection: A connection in the session.
+            - now: The current time from the server's timer, in seconds.
+        """
+        self._watchers.discard(connection)
+        for color in COLORS:
+            if self._players[color] is connection:
+                self.update_clock(now)
+                self._players[color] = None
+                self._turn_started = None
+
+    def get_connections(self):
+        """
+        Returns every connection in the session: the players and then the watchers.
+
+        Return value:
+            - a list of connections
+        """
+        players = [connection for connection in self._players.values() if connection is not None]
+        return players + list(self._watchers)
+
+    def get_clock(self, color, now):
+        """
+        Returns the seconds left on a player's clock, including the turn that is running.
+
+        Parameters:
+            - color: 'white' or 'black'
+            - now: The current time from the server's timer, in seconds.
+
+        Return value:
+            - seconds left (a float, never below 0)
+        """
+        seconds = self._clocks[color]
+        if self._turn_started is not None and self._game.get_current_player().get_color() == color:
+            seconds -= now - self._turn_started
+        return max(seconds, 0.0)
+
+    def update_clock(self, now):
+        """
+        Takes the time since the last update off the clock of the player to move. If that
+        clock has run out, the game ends and the other player wins.
+
+        Parameters:
+            - now: The current time from the server's timer, in seconds.
+
+        Return value:
+            - True: if the clock ran out just now
+            - False: otherwise
+        """
+        if self._turn_started is None:
+            return False
+        color = self._game.get_current_player().get_color()
+        self._clocks[color] -= now - self._turn_started
+        self._turn_started = now
+        if self._clocks[color] > 0:
+            return False
+        self._clocks[color] = 0.0
+        self._turn_started = None
+        self._game.set_game_state('BLACK_WON' if color == 'white' else 'WHITE_WON')
+        return True
+
+    def make_move(self, color, square_moved_from, square_moved_to, now):
+        """
+        Makes a move for the player of a color with ChessVar.make_move(). The player's clock is
+        updated first, and after the move the other player's clock runs.
+
+        Parameters:
+            - color: The color of the player making the move. Example: 'white'
+            - square_moved_from: A string in algebraic notation. Example: 'e2'
+            - square_moved_to: A string in algebraic notation. Example: 'e4'
+            - now: The current time from the server's timer, in seconds.
+
+        Return value:
+            - None: if the move was made
+            - the reason the move was not made (a string) otherwise
+        """
+        if self._game.get_game_state() != 'UNFINISHED':
+            return 'the game is over'
+        if not self.is_ready():
+            return 'waiting for an opponent'
+        if self._game.get_current_player().get_color() != color:
+            return 'it is not your turn'
+        if self.update_clock(now):
+            return 'your clock ran out'
+        # make_move() raises a KeyError for a square that is not on the board
+        if square_moved_from not in SQUARE_INDICES or square_moved_to not in SQUARE_INDICES:
+            return 'not a square on the board'
+        if not self._game.make_move(square_moved_from, square_moved_to):
+            return 'not a valid move'
+        if self._game.get_game_state() != 'UNFINISHED':
+            self._turn_started = None
+        return None
+
+    def get_state_line(self, now):
+        """
+        Returns the STATE line of the session, with the state of the game, both clocks and the
+        position string of the game.
+
+        Parameters:
+            - now: The current time from the server's timer, in seconds.
+
+        Return value:
+            - a line. Example: 'STATE 1 UNFINISHED 300.0 295.5 ' followed by the position string
+        """
+        return 'STATE %d %s %.1f %.1f %s' % (self._id, self._game.get_game_state(),
+                                             self.get_clock('white', now), self.get_clock('black', now),
+                                             self._game.to_string())
+
+    def broadcast(self, line):
+        """
+        Sends a line to every connection in the session.
+
+        Parameters:
+            - line: A line without its newline.
+        """
+        for connection in self.get_connections():
+            connection.send(line)
+
+
+class GameServer:
+    """
+    This class runs game sessions for many connections. The commands of the protocol are
+    handled by handle_line(), which does not need a network: a connection is any object with a
+    send(line) method that delivers a line to its client. start() accepts TCP connections in
+    the running asyncio event loop and feeds their lines to handle_line().
+
+    Data members:
+        - self._sessions (A dictionary from session number to 'GameSession'.)
+        - self._roles (A dictionary from each connection in a session to a (session, role)
+        tuple, where role is 'white', 'black' or 'watcher'.)
+        - self._next_id (The number of the next session.)
+        - self._clock_seconds (The seconds on each clock of a new game if NEW does not say.)
+        - self._idle_seconds (A session is evicted after this many seconds without a command.)
+        - self._timer (A function returning the current time in seconds, time.monotonic by
+        default.)
+        - self._scheduler (The 'SearchScheduler' that searches the engine's moves, or None if the
+        engine can't play.)
+        - self._bot_seconds (The most seconds the engine searches for one move.)
+        - self._instrumentation (The 'MoveInstrumentation' every game is attached to, or None
+        if the moves are not timed.)
+        - self._commands (A dictionary from each command to the method that handles it.)
+        - self._server (the asyncio server, once started)
+        - self._sweep_task (the asyncio task running sweep() every second, once started)
+        - self._client_tasks (A dictionary from the writer of every open TCP connection to the
+        task reading its lines.)
+
+    Methods:
+        - get_session_count(self)
+            - Returns the number of sessions.
+        - handle_line(self, connection, line)
+            - Handles one line from a connection.
+        - command_new(self, connection, arguments), command_join, command_watch,
+        command_bot, command_move, command_state, command_leave, command_ping, command_metrics
+            - Handle one command each.
+        - get_session_argument(self, connection, arguments)
+            - Returns the session named by a command, or sends an error.
+        - make_session_move(self, session, color, square_moved_from, square_moved_to, now)
+            - Makes a move in a session and sends it to everyone in the session.
+        - request_bot_move(self, session), finish_bot_move(self, session, future)
+            - Ask the scheduler for the engine's move if it is the engine's turn, and make the
+            move once it has been found.
+        - close_session(self, session)
+            - Removes a session and cancels its search.
+        - disconnect(self, connection)
+            - Removes a connection from its session.
+        - sweep(self), sweep_forever(self, interval)
+            - End games whose clock ran out and evict idle sessions, once or every interval
+            seconds.
+        - start(self, host, port, sweep_interval)
+            - Starts accepting TCP connections.
+        - handle_client(self, reader, writer)
+            - Reads the lines of one TCP connection.
+        - serve_forever(self), close(self)
+            - Run the server until it is cancelled, and stop it.
+
+    Classes in communication with:
+        - GameSession (The server keeps the sessions.)
+        - StreamConnection (The connection of a TCP client.)
+        - LocalClient (A client without a network.)
+        - SearchScheduler (Searches the engine's moves in other processes.)
+        - MoveInstrumentation (Times the moves of every game, if the server has one.)
+    """
+
+    def __init__(self, clock_seconds=300.0, idle_seconds=600.0, timer=time.monotonic, scheduler=None,
+                 bot_seconds=1.0, instrumentation=None):
+        self._sessions = {}
+        self._roles = {}
+        self._next_id = 1
+        self._clock_seconds = clock_seconds
+        self._idle_seconds = idle_seconds
+        self._timer = timer
+        self._scheduler = scheduler
+        self._bot_seconds = bot_seconds
+        self._instrumentation = instrumentation
+        self._commands = {'NEW': self.command_new, 'JOIN': self.command_join,
+                          'WATCH': self.command_watch, 'BOT': self.command_bot,
+                          'MOVE': self.command_move,
+                          'STATE': self.command_state, 'LEAVE': self.command_leave,
+                          'PING': self.command_ping, 'METRICS': self.command_metrics}
+        self._server = None
+        self._sweep_task = None
+        self._client_tasks = {}
+
+    def get_session_count(self):
+        """
+        Returns the number of sessions on the server.
+
+        Return value:
+            - number of sessions (an integer)
+        """
+        return len(self._sessions)
+
+    def handle_line(self, connection, line):
+        """
+        Handles one line sent by a connection. Empty lines are ignored.
+
+        Parameters:
+            - connection: An object with a send(line) method.
+            - line: The line, with or without its newline. Example: 'MOVE e2 e4'
+        """
+        words = line.split()
+        if not words:
+            return
+        handler = self._commands.get(words[0].upper())
+        if handler is None:
+            connection.send('ERROR unknown command ' + words[0])
+            return
+        handler(connection, words[1:])
+
+    def command_new(self, connection, arguments):
+        """
+        NEW [seconds]: Starts a new session with the connection playing white.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command. Example: ['300']
+        """
+        try:
+            clock_seconds = float(arguments[0]) if arguments else self._clock_seconds
+        except ValueError:
+            connection.send('ERROR not a number of seconds')
+            return
+        if not clock_seconds > 0:
+            connection.send('ERROR the clocks need more than 0 seconds')
+            return
+        self.disconnect(connection)
+        now = self._timer()
+        session = GameSession(self._next_id, clock_seconds, now)
+        self._next_id += 1
+        self._sessions[session.get_id()] = session
+        if self._instrumentation is not None:
+            self._instrumentation.attach(session.get_game())
+        session.add_player('white', connection, now)
+        self._roles[connection] = (session, 'white')
+        connection.send('GAME %d white' % session.get_id())
+        connection.send(session.get_state_line(now))
+
+    def get_session_argument(self, connection, arguments):
+        """
+        Returns the session named by the first argument of a command, or sends an error.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command. Example: ['12']
+
+        Return value:
+            - a GameSession, or None if there is no such session
+        """
+        session = None
+        if len(arguments) == 1 and arguments[0].isdigit():
+            session = self._sessions.get(int(arguments[0]))
+        if session is None:
+            connection.send('ERROR no such game')
+        return session
+
+    def command_join(self, connection, arguments):
+        """
+        JOIN <game>: Joins a session as the color nobody is playing, and sends its state to
+        everyone in it.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command. Example: ['12']
+        """
+        session = self.get_session_argument(connection, arguments)
+        if session is None:
+            return
+        if self._roles.get(connection, (None,))[0] is session:
+            connection.send('ERROR already in this game')
+            return
+        color = session.get_free_color()
+        if color is None:
+            connection.send('ERROR the game is full')
+            return
+        self.disconnect(connection)
+        now = self._timer()
+        session.add_player(color, connection, now)
+        session.touch(now)
+        self._roles[connection] = (session, color)
+        connection.send('GAME %d %s' % (session.get_id(), color))
+        session.broadcast(session.get_state_line(now))
+
+    def command_watch(self, connection, arguments):
+        """
+        WATCH <game>: Watches a session.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command. Example: ['12']
+        """
+        session = self.get_session_argument(connection, arguments)
+        if session is None:
+            return
+        self.disconnect(connection)
+        now = self._timer()
+        session.add_watcher(connection)
+        session.touch(now)
+        self._roles[connection] = (session, 'watcher')
+        connection.send('GAME %d watcher' % session.get_id())
+        connection.send(session.get_state_line(now))
+
+    def command_move(self, connection, arguments):
+        """
+        MOVE <from> <to>: Makes a move in the connection's game. The move and the new state are
+        sent to everyone in the game. 'MOVE e2e4' also works.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command. Example: ['e2', 'e4']
+        """
+        session, role = self._roles.get(connection, (None, None))
+        if session is None or role == 'watcher':
+            connection.send('ERROR not playing a game')
+            return
+        if len(arguments) == 1:
+            arguments = [arguments[0][:2], arguments[0][2:]]
+        if len(arguments) != 2:
+            connection.send('ERROR a move needs two squares')
+            return
+        now = self._timer()
+        session.touch(now)
+        error = self.make_session_move(session, role, arguments[0], arguments[1], now)
+        if error is not None:
+            connection.send('ERROR ' + error)
+
+    def make_session_move(self, session, color, square_moved_from, square_moved_to, now):
+        """
+        Makes a move in a session for the player of a color. If it was made, the move and the
+        new state are sent to everyone in the session and the engine is asked for its move if
+        it is its turn. If the move ended the game because the player's clock ran out, the new
+        state is sent instead.
+
+        Parameters:
+            - session: A GameSession.
+            - color: The color of the player making the move. Example: 'white'
+            - square_moved_from: A string in algebraic notation. Example: 'e2'
+            - square_moved_to: A string in algebraic notation. Example: 'e4'
+            - now: The current time from the server's timer, in seconds.
+
+        Return value:
+            - None: if the move was made
+            - the reason the move was not made (a string) otherwise
+        """
+        game_state = session.get_game().get_game_state()
+        error = session.make_move(color, square_moved_from, square_moved_to, now)
+        if error is None:
+            session.broadcast('MOVED %s %s' % (square_moved_from, square_moved_to))
+            session.broadcast(session.get_state_line(now))
+            self.request_bot_move(session)
+        elif session.get_game().get_game_state() != game_state:
+            # the player's clock ran out, which ended the game
+            session.broadcast(session.get_state_line(now))
+        return error
+
+    def command_bot(self, connection, arguments):
+        """
+        BOT: Has the engine play the free color of the connection's game.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command (none are used).
+        """
+        session, role = self._roles.get(connection, (None, None))
+        if session is None or role == 'watcher':
+            connection.send('ERROR not playing a game')
+            return
+        if self._scheduler is None:
+            connection.send('ERROR the engine is not running on this server')
+            return
+        color = session.get_free_color()
+        if color is None:
+            connection.send('ERROR the game is full')
+            return
+        now = self._timer()
+        session.add_bot(color, now)
+        session.touch(now)
+        connection.send('GAME %d %s' % (session.get_id(), role))
+        session.broadcast(session.get_state_line(now))
+        self.request_bot_move(session)
+
+    def request_bot_move(self, session):
+        """
+        Asks the scheduler for the engine's move if it is the engine's turn in a session and no
+        search for it is waiting or running. The engine searches for at most self._bot_seconds,
+        and never more than a twentieth of the time left on its clock, and games whose engine
+        has the least time left are searched first. If the scheduler's queue is full, nothing
+        is asked and sweep() asks again later.
+
+        Parameters:
+            - session: A GameSession.
+        """
+        game = session.get_game()
+        color = session.get_bot_color()
+        if (self._scheduler is None or color is None or game.get_game_state() != 'UNFINISHED' or
+                game.get_current_player().get_color() != color or not session.is_ready() or
+                self._scheduler.has_job(session.get_id())):
+            return
+        clock_seconds = session.get_clock(color, self._timer())
+        try:
+            future = self._scheduler.submit(session.get_id(), game, min(self._bot_seconds, clock_seconds / 20),
+                                            clock_seconds)
+        except asyncio.QueueFull:
+            return
+        future.add_done_callback(lambda future: self.finish_bot_move(session, future))
+
+    def finish_bot_move(self, session, future):
+        """
+        Makes the move the engine found in a session, unless the search was cancelled, failed,
+        or the session was closed while it ran. A search that failed is asked for again by the
+        next sweep().
+
+        Parameters:
+            - session: The GameSession the search was for.
+            - future: The finished future from SearchScheduler.submit().
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        if self._sessions.get(session.get_id()) is not session:
+            return
+        move, statistics = future.result()
+        if move is None:
+            return
+        square_moved_from, square_moved_to = move_to_algebraic(move)
+        self.make_session_move(session, session.get_bot_color(), square_moved_from, square_moved_to,
+                               self._timer())
+
+    def command_state(self, connection, arguments):
+        """
+        STATE: Sends the state of the connection's game again.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command (none are used).
+        """
+        session, role = self._roles.get(connection, (None, None))
+        if session is None:
+            connection.send('ERROR not in a game')
+            return
+        connection.send(session.get_state_line(self._timer()))
+
+    def command_leave(self, connection, arguments):
+        """
+        LEAVE: Leaves the connection's game.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command (none are used).
+        """
+        if connection not in self._roles:
+            connection.send('ERROR not in a game')
+            return
+        self.disconnect(connection)
+        connection.send('OK')
+
+    def command_ping(self, connection, arguments):
+        """
+        PING: Answers PONG.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command (none are used).
+        """
+        connection.send('PONG')
+
+    def command_metrics(self, connection, arguments):
+        """
+        METRICS: Sends every sample of the move timing metrics on a METRIC line, then OK.
+
+        Parameters:
+            - connection: The connection the command came from.
+            - arguments: The words after the command (none are used).
+        """
+        if self._instrumentation is None:
+            connection.send('ERROR the server has no metrics')
+            return
+        for line in self._instrumentation.format_metrics().splitlines():
+            if not line.startswith('#'):
+                connection.send('METRIC ' + line)
+        connection.send('OK')
+
+    def disconnect(self, connection):
+        """
+        Removes a connection from its session, if it is in one. A session nobody is in any
+        more is closed.
+
+        Parameters:
+            - connection: A connection.
+        """
+        session, role = self._roles.pop(connection, (None, None))
+        if session is None:
+            return
+        session.remove_connection(connection, self._timer())
+        if not session.get_connections():
+            self.close_session(session)
+
+    def close_session(self, session):
+        """
+        Removes a session from the server and cancels any search for the engine's move in it.
+
+        Parameters:
+            - session: A GameSession.
+        """
+        del self._sessions[session.get_id()]
+        if self._instrumentation is not None:
+            self._instrumentation.detach(session.get_game())
+        if self._scheduler is not None:
+            self._scheduler.cancel(session.get_id())
+
+    def sweep(self):
+        """
+        Ends every game whose running clock has run out, sending its new state to everyone in
+        it, and evicts every session that has had no command for self._idle_seconds, sending
+        EVICTED to everyone in it. The engine's move is asked for again in every game where it
+        is its turn and no search is waiting or running.
+
+        Return value:
+            - the number of sessions evicted
+        """
+        now = self._timer()
+        evicted = []
+        for session in self._sessions.values():
+            if session.update_clock(now):
+                session.broadcast(session.get_state_line(now))
+                if self._scheduler is not None:
+                    self._scheduler.cancel(session.get_id())
+            if now - session.get_last_activity() >= self._idle_seconds:
+                evicted.append(session)
+            elif session.get_bot_color() is not None:
+                self.request_bot_move(session)
+        for session in evicted:
+            session.broadcast('EVICTED %d' % session.get_id())
+            for connection in session.get_connections():
+                del self._roles[connection]
+            self.close_session(session)
+        return len(evicted)
+
+    async def sweep_forever(self, interval):
+        """
+        Runs sweep() every interval seconds until it is cancelled.
+
+        Parameters:
+            - interval: The seconds between sweeps. Example: 1.0
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    async def start(self, host='127.0.0.1', port=8765, sweep_interval=1.0):
+        """
+        Starts accepting TCP connections and sweeping the sessions in the running event loop.
+
+        Parameters:
+            - host: The address to listen on. Example: '127.0.0.1'
+            - port: The port to listen on, or 0 for any free port. Example: 8765
+            - sweep_interval: The seconds between sweeps. Example: 1.0
+
+        Return value:
+            - the port the server is listening on
+        """
+        self._server = await asyncio.start_server(self.handle_client, host, port)
+        self._sweep_task = asyncio.ensure_future(self.sweep_forever(sweep_interval))
+        return self._server.sockets[0].getsockname()[1]
+
+    async def handle_client(self, reader, writer):
+        """
+        Reads the lines of one TCP connection and handles them until the client disconnects.
+
+        Parameters:
+            - reader: The asyncio StreamReader of the connection.
+            - writer: The asyncio StreamWriter of the connection.
+        """
+        connection = StreamConnection(writer)
+        self._client_tasks[writer] = asyncio.current_task()
+        try:
+            while not writer.is_closing():
+                line = await reader.readline()
+                if not line:
+                    break
+                self.handle_line(connection, line.decode('utf-8', 'replace'))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # the client went away, or sent a line longer than the reader's limit
+            pass
+        finally:
+            del self._client_tasks[writer]
+            self.disconnect(connection)
+            writer.close()
+
+    async def serve_forever(self):
+        """Accepts connections until the task running this is cancelled."""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stops accepting connections, closes the open ones and stops sweeping."""
+        self._sweep_task.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+        # closing a connection makes its reader see the end, so its task finishes by itself
+        tasks = list(self._client_tasks.values())
+        for writer in list(self._client_tasks):
+            writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class StreamConnection:
+    """
+    This class is the connection of one TCP client, used by 'GameServer'.
+
+    Data members:
+        - self._writer (the asyncio StreamWriter of the connection)
+
+    Methods:
+        - send(self, line)
+            - Sends a line to the client.
+
+    Classes in communication with:
+        - GameServer (Sends lines to clients through their connections.)
+    """
+
+    def __init__(self, writer):
+        self._writer = writer
+
+    def send(self, line):
+        """
+        Sends a line to the client without waiting for it to be written. A client that has
+        stopped reading is disconnected once MAX_WRITE_BUFFER bytes are waiting for it.
+
+        Parameters:
+            - line: A line without its newline.
+        """
+        if self._writer.is_closing():
+            return
+        if self._writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self._writer.close()
+            return
+        self._writer.write(line.encode() + b'\n')
+
+
+class LocalClient:
+    """
+    This class stands in for a client of a 'GameServer' without any network: its commands go
+    straight to handle_line(), and the lines the server sends to it are kept in a list. It can
+    be used to try the server, or to check it, in the same process.
+
+    Data members:
+        - self._server (the GameServer)
+        - self._received (A list of the lines the server has sent that were not read yet.)
+
+    Methods:
+        - command(self, line)
+            - Sends a command to the server.
+        - send(self, line)
+            - Called by the server to send a line to this client.
+        - receive(self)
+            - Returns and forgets the lines the server has sent.
+        - close(self)
+            - Disconnects from the server.
+
+    Classes in communication with:
+        - GameServer (The server the client talks to.)
+    """
+
+    def __init__(self, server):
+        self._server = server
+        self._received = []
+
+    def command(self, line):
+        """
+        Sends a command to the server, which handles it right away.
+
+        Parameters:
+            - line: A command. Example: 'MOVE e2 e4'
+
+        Return value:
+            - the lines the server sent back (see receive())
+        """
+        self._server.handle_line(self, line)
+        return self.receive()
+
+    def send(self, line):
+        """
+        Keeps a line sent by the server.
+
+        Parameters:
+            - line: A line without its newline.
+        """
+        self._received.append(line)
+
+    def receive(self):
+        """
+        Returns the lines the server has sent since the last call, including lines sent because
+        of other clients' commands.
+
+        Return value:
+            - a list of lines
+        """
+        received = self._received
+        self._received = []
+        return received
+
+    def close(self):
+        """Disconnects from the server, leaving any game."""
+        self._server.disconnect(self)
+
+
+class GameClient:
+    """
+    This class is a TCP client of a 'GameServer'.
+
+    Data members:
+        - self._reader (the asyncio StreamReader of the connection)
+        - self._writer (the asyncio StreamWriter of the connection)
+
+    Methods:
+        - connect(cls, host, port)
+            - Connects to a server and returns a new client.
+        - command(self, line)
+            - Sends a command.
+        - receive(self)
+            - Waits for the next line from the server.
+        - receive_until(self, word)
+            - Waits for the next line starting with a word.
+        - close(self)
+            - Closes the connection.
+
+    Classes in communication with:
+        - GameServer (The server the client talks to.)
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765):
+        """
+        Connects to a server.
+
+        Parameters:
+            - host: The address of the server. Example: '127.0.0.1'
+            - port: The port of the server. Example: 8765
+
+        Return value:
+            - a new GameClient
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def command(self, line):
+        """
+        Sends a command to the server.
+
+        Parameters:
+            - line: A command without its newline. Example: 'MOVE e2 e4'
+        """
+        self._writer.write(line.encode() + b'\n')
+        await self._writer.drain()
+
+    async def receive(self):
+        """
+        Waits for the next line from the server.
+
+        Return value:
+            - the line without its newline, or '' if the server closed the connection
+        """
+        line = await self._reader.readline()
+        return line.decode().rstrip('\n')
+
+    async def receive_until(self, word):
+        """
+        Waits for the next line from the server that starts with a word, skipping other lines.
+
+        Parameters:
+            - word: The first word of the line. Example: 'STATE'
+
+        Return value:
+            - the line, or '' if the server closed the connection first
+        """
+        while True:
+            line = await self.receive()
+            if not line or line.split(' ', 1)[0] == word:
+                return line
+
+    async def close(self):
+        """Closes the connection."""
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def play_demo_side(client, color, rng):
+    """
+    Plays random legal moves for one color of a game until the game is over, choosing them
+    from the position string of every STATE line.
+
+    Parameters:
+        - client: A GameClient playing the color.
+        - color: 'white' or 'black'
+        - rng: A random.Random object.
+
+    Return value:
+        - the final state of the game, and the number of moves the client made
+    """
+    moves = 0
+    while True:
+        line = await client.receive_until('STATE')
+        if not line:
+            return 'UNFINISHED', moves
+        words = line.split(' ', 5)
+        if words[2] != 'UNFINISHED':
+            return words[2], moves
+        game = ChessVar.from_string(words[5])
+        if game.get_current_player().get_color() == color:
+            await client.command('MOVE %s %s' % rng.choice(game.legal_moves()))
+            moves += 1
+
+
+async def play_demo_game(port, rng, bot=False):
+    """
+    Connects a client to a server and has it start a game. Then a second client joins and both
+    play random moves, or with bot, the engine plays black.
+
+    Parameters:
+        - port: The port of a server on this computer.
+        - rng: A random.Random object.
+        - bot: True to play against the engine.
+
+    Return value:
+        - the final state of the game, and the number of moves the clients made
+    """
+    white = await GameClient.connect('127.0.0.1', port)
+    await white.command('NEW')
+    game_id = (await white.receive_until('GAME')).split()[1]
+    if bot:
+        await white.command('BOT')
+        result = await play_demo_side(white, 'white', rng)
+        await white.close()
+        return result
+    black = await GameClient.connect('127.0.0.1', port)
+    await black.command('JOIN ' + game_id)
+    results = await asyncio.gather(play_demo_side(white, 'white', rng),
+                                   play_demo_side(black, 'black', rng))
+    await white.close()
+    await black.close()
+    return results[0][0], results[0][1] + results[1][1]
+
+
+async def run_demo(games, seed=0, engine_processes=0, bot_seconds=0.05):
+    """
+    Starts a server on a free port of this computer and plays games between TCP clients on it,
+    all at the same time.
+
+    Parameters:
+        - games: The number of games. Example: 100
+        - seed: The seed of the random moves.
+        - engine_processes: The number of engine worker processes. If it is more than 0, every
+        game is played by one client against the engine.
+        - bot_seconds: The most seconds the engine searches for a move.
+
+    Return value:
+        - a list of (final state, number of client moves) tuples, one for every game
+    """
+    scheduler = None
+    if engine_processes > 0:
+        scheduler = SearchScheduler(engine_processes)
+        scheduler.start()
+    server = GameServer(scheduler=scheduler, bot_seconds=bot_seconds)
+    port = await server.start('127.0.0.1', 0)
+    rng = random.Random(seed)
+    try:
+        return await asyncio.gather(*[play_demo_game(port, rng, scheduler is not None)
+                                      for game in range(games)])
+    finally:
+        await server.close()
+        if scheduler is not None:
+            await scheduler.close()
+
+
+async def run_server(host, port, clock_seconds, idle_seconds, engine_processes=0, bot_seconds=1.0,
+                     metrics=False):
+    """
+    Runs a server until the program is stopped.
+
+    Parameters:
+        - host: The address to listen on.
+        - port: The port to listen on.
+        - clock_seconds: The seconds on each clock of a new game.
+        - idle_seconds: The seconds without a command after which a session is evicted.
+        - engine_processes: The number of engine worker processes, or 0 for no engine.
+        - bot_seconds: The most seconds the engine searches for a move.
+        - metrics: True to time the moves of every game and answer the METRICS command.
+    """
+    scheduler = None
+    if engine_processes > 0:
+        scheduler = SearchScheduler(engine_processes)
+        scheduler.start()
+    server = GameServer(clock_seconds, idle_seconds, scheduler=scheduler, bot_seconds=bot_seconds,
+                        instrumentation=MoveInstrumentation() if metrics else None)
+    port = await server.start(host, port)
+    print('serving games on %s:%d' % (host, port))
+    try:
+        await server.serve_forever()
+    finally:
+        if scheduler is not None:
+            await scheduler.close()
+
+
+def main(arguments=None):
+    """
+    Runs a game server from the command line, or with --demo, plays games between clients on
+    a server on this computer and prints how fast they were played. With --engine-processes,
+    the engine can play, and the demo games are played against it.
+
+    Parameters:
+        - arguments: A list of command line arguments, or None to use sys.argv.
+
+    Return value:
+        - the exit status (0)
+    """
+    parser = argparse.ArgumentParser(description='Host games of the chess variant over TCP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clock', type=float, default=300.0,
+                        help='the seconds on each clock of a new game (default: 300)')
+    parser.add_argument('--idle', type=float, default=600.0,
+                        help='the seconds without a command before a game is evicted (default: 600)')
+    parser.add_argument('--engine-processes', type=int, default=0,
+                        help='the number of processes searching moves for the BOT command (default: 0)')
+    parser.add_argument('--bot-seconds', type=float, default=None,
+                        help='the most seconds the engine searches for a move (default: 1, or 0.05 with --demo)')
+    parser.add_argument('--demo', type=int, default=None,
+                        help='play this many games between local clients (or against the engine) and exit')
+    parser.add_argument('--metrics', action='store_true',
+                        help='time the moves of every game and answer the METRICS command')
+    options = parser.parse_args(arguments)
+
+    if options.demo is None:
+        try:
+            asyncio.run(run_server(options.host, options.port, options.clock, options.idle,
+                                   options.engine_processes,
+                                   1.0 if options.bot_seconds is None else options.bot_seconds,
+                                   options.metrics))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    start = time.perf_counter()
+    results = asyncio.run(run_demo(options.demo, 0, options.engine_processes,
+                                   0.05 if options.bot_seconds is None else options.bot_seconds))
+    seconds = time.perf_counter() - start
+    winners = {'WHITE_WON': 0, 'BLACK_WON': 0, 'UNFINISHED': 0}
+    for winner, moves in results:
+        winners[winner] += 1
+    plies = sum(moves for winner, moves in results)
+    print('white won %d, black won %d, unfinished %d'
+          % (winners['WHITE_WON'], winners['BLACK_WON'], winners['UNFINISHED']))
+    print('%d games, %d client moves in %.2fs: %.0f moves/s' % (options.demo, plies, seconds, plies / seconds))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
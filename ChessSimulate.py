@@ -0,0 +1,358 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file plays many games of the chess variant in ChessGame.py at once, for
+# example to make self-play data. simulate() splits the games into chunks and hands the chunks to a
+# pool of worker processes, so every core plays games on its own and only finished results are
+# sent back. Each side of a game is played by a move policy: 'random' picks any legal move,
+# 'greedy' captures whenever it can (preferring captures that bring an opponent's set closest to
+# being lost), 'search' asks the SearchEngine in ChessSearch.py for its best move and 'mcts' asks
+# the MCTSEngine in ChessMCTS.py. Every chunk gets its own random seed made from the simulation
+# seed and the number of its first game, so the same seed always plays the same games no matter
+# how many processes are used. Results come back one chunk at a time, so the parent can save
+# them while the other games are still being played:
+#
+#     for chunk in simulate(10000, white='random', black='greedy'):
+#         for result in chunk:
+#             print(result['winner'], result['plies'])
+
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+
+from ChessGame import ChessVar
+from ChessBitboard import BitboardChessVar
+from ChessSearch import SearchEngine
+from ChessMCTS import MCTSEngine
+from ChessRecord import GameRecordWriter
+
+# The versions of the game a simulation can use, by name.
+BACKENDS = {'list': ChessVar, 'bitboard': BitboardChessVar}
+
+
+class RandomPolicy:
+    """
+    This class plays a random legal move.
+
+    Data members:
+        - self._random (the random.Random object the moves are picked with)
+
+    Methods:
+        - choose_move(self, game)
+            - Returns a random legal move.
+
+    Classes in communication with:
+        - ChessVar (The game the policy plays moves in.)
+    """
+
+    def __init__(self, rng):
+        self._random = rng
+
+    def choose_move(self, game):
+        """
+        Picks a move for the player whose turn it is.
+
+        Parameters:
+            - game: A ChessVar object.
+
+        Return value:
+            - a packed move (see pack_move() in ChessGame.py), or None if there are no legal moves
+        """
+        moves = game.legal_moves_idx()
+        if not moves:
+            return None
+        return self._random.choice(moves)
+
+
+class GreedyCapturePolicy:
+    """
+    This class captures a piece whenever it can. Among the captures it picks one that takes a
+    piece of the type the opponent has the fewest of left, since those captures are closest to
+    winning (a capture of the last piece of a type wins the game). If there is no capture, it
+    plays a random move.
+
+    Data members:
+        - self._random (the random.Random object used to break ties)
+
+    Methods:
+        - choose_move(self, game)
+            - Returns the best capture, or a random move if there is none.
+
+    Classes in communication with:
+        - ChessVar (The game the policy plays moves in.)
+        - Player (Its captured pieces show how many of each type the opponent has left.)
+    """
+
+    def __init__(self, rng):
+        self._random = rng
+
+    def choose_move(self, game):
+        """
+        Picks a move for the player whose turn it is.
+
+        Parameters:
+            - game: A ChessVar object.
+
+        Return value:
+            - a packed move, or None if there are no legal moves
+        """
+        moves = game.legal_moves_idx()
+        if not moves:
+            return None
+        player = game.get_current_player()
+        best_captures = []
+        fewest_left = None
+        for move in moves:
+            target_type = game.get_piece_idx(move & 63).get_type()
+            if target_type == '':
+                continue
+            remaining = player.get_remaining_count(target_type)
+            if fewest_left is None or remaining < fewest_left:
+                fewest_left = remaining
+                best_captures = [move]
+            elif remaining == fewest_left:
+                best_captures.append(move)
+        return self._random.choice(best_captures or moves)
+
+
+class SearchPolicy:
+    """
+    This class plays the move a SearchEngine finds with a fixed node budget. The engine keeps its
+    transposition table from move to move, so later searches of a game are faster.
+
+    Data members:
+        - self._engine (the 'SearchEngine' used to find moves)
+        - self._max_nodes (The number of nodes each search may visit.)
+
+    Methods:
+        - choose_move(self, game)
+            - Returns the engine's best move.
+
+    Classes in communication with:
+        - ChessVar (The game the policy plays moves in.)
+        - SearchEngine (Searches for the move.)
+    """
+
+    def __init__(self, rng, max_nodes=2000, table_size_mb=4):
+        self._engine = SearchEngine(table_size_mb)
+        self._max_nodes = max_nodes
+
+    def choose_move(self, game):
+        """
+        Picks a move for the player whose turn it is.
+
+        Parameters:
+            - game: A ChessVar object.
+
+        Return value:
+            - a packed move, or None if there are no legal moves
+        """
+        move, statistics = self._engine.search(game, max_nodes=self._max_nodes)
+        return move
+
+
+class MCTSPolicy:
+    """
+    This class plays the move an MCTSEngine finds with a fixed number of playouts. The engine
+    keeps its tree from move to move, so the playouts of the last search are reused.
+
+    Data members:
+        - self._engine (the 'MCTSEngine' used to find moves)
+        - self._max_playouts (The number of playouts each search runs.)
+
+    Methods:
+        - choose_move(self, game)
+            - Returns the engine's best move.
+
+    Classes in communication with:
+        - ChessVar (The game the policy plays moves in.)
+        - MCTSEngine (Searches for the move.)
+    """
+
+    def __init__(self, rng, max_playouts=200):
+        self._engine = MCTSEngine(rng=rng)
+        self._max_playouts = max_playouts
+
+    def choose_move(self, game):
+        """
+        Picks a move for the player whose turn it is.
+
+        Parameters:
+            - game: A ChessVar object.
+
+        Return value:
+            - a packed move, or None if there are no legal moves
+        """
+        move, statistics = self._engine.search(game, self._max_playouts)
+        return move
+
+
+# The move policies, by the name simulate() takes.
+POLICIES = {'random': RandomPolicy, 'greedy': GreedyCapturePolicy, 'search': SearchPolicy,
+            'mcts': MCTSPolicy}
+
+
+def play_game(game, white_policy, black_policy, rng, random_plies=0, max_plies=500):
+    """
+    Plays one game to the end with a policy for each side.
+
+    Parameters:
+        - game: A ChessVar object in its starting position.
+        - white_policy, black_policy: Objects with a choose_move(game) method.
+        - rng: The random.Random object used for the opening moves.
+        - random_plies: The number of moves at the start of the game to play at random, so that
+        games between policies that always choose the same move are still different.
+        - max_plies: The game is stopped unfinished after this many moves.
+
+    Return value:
+        - a dictionary with 'moves' (a list of packed moves), 'winner' (the game state at the
+        end: 'UNFINISHED', 'WHITE_WON' or 'BLACK_WON') and 'plies' (the number of moves played)
+    """
+    moves = []
+    while game.get_game_state() == 'UNFINISHED' and len(moves) < max_plies:
+        if len(moves) < random_plies:
+            legal_moves = game.legal_moves_idx()
+            move = rng.choice(legal_moves) if legal_moves else None
+        elif game.get_current_player().get_color() == 'white':
+            move = white_policy.choose_move(game)
+        else:
+            move = black_policy.choose_move(game)
+        # a player with no legal moves left ends the game unfinished
+        if move is None:
+            break
+        game.make_move_idx(move >> 6, move & 63)
+        moves.append(move)
+    return {'moves': moves, 'winner': game.get_game_state(), 'plies': len(moves)}
+
+
+def play_chunk(task):
+    """
+    Plays a chunk of games in a worker process. This is the function the process pool runs.
+
+    Parameters:
+        - task: A (first_game, count, options) tuple, where first_game is the number of the first
+        game of the chunk, count is the number of games and options is the dictionary of
+        simulate() settings.
+
+    Return value:
+        - a list of play_game() results, each with a 'game' number added
+    """
+    first_game, count, options = task
+    # a string seed is hashed as a whole, so no two (seed, first game) pairs share a seed
+    rng = random.Random('%s:%d' % (options['seed'], first_game))
+    game_class = BACKENDS[options['backend']]
+    white_policy = POLICIES[options['white']](rng, **options['white_options'])
+    black_policy = POLICIES[options['black']](rng, **options['black_options'])
+    results = []
+    for game_number in range(first_game, first_game + count):
+        result = play_game(game_class(), white_policy, black_policy, rng,
+                           options['random_plies'], options['max_plies'])
+        result['game'] = game_number
+        results.append(result)
+    return results
+
+
+def simulate(num_games, white='random', black='random', processes=None, chunk_size=16, seed=0,
+             backend='bitboard', random_plies=0, max_plies=500, white_options=None,
+             black_options=None):
+    """
+    Plays num_games games across a pool of worker processes and yields the results in chunks as
+    they are finished. Chunks can arrive in any order; each result has a 'game' number.
+
+    Parameters:
+        - num_games: The number of games to play. Example: 1000
+        - white, black: The names of the policies in POLICIES that play each side.
+        Example: 'greedy'
+        - processes: The number of worker processes, or None for one per core. With 1, the games
+        are played in this process.
+        - chunk_size: The number of games each worker plays before sending results back.
+        - seed: The seed every chunk's random numbers are made from.
+        - backend: The name of the version of the game in BACKENDS. Example: 'list'
+        - random_plies: The number of opening moves to play at random.
+        - max_plies: The number of moves after which a game is stopped unfinished.
+        - white_options, black_options: Dictionaries of extra arguments for each policy.
+        Example: {'max_nodes': 5000}
+
+    Return value:
+        - a generator of lists of results, each like the dictionary play_game() returns plus a
+        'game' number
+    """
+    options = {'seed': seed, 'backend': backend, 'white': white, 'black': black,
+               'white_options': white_options or {}, 'black_options': black_options or {},
+               'random_plies': random_plies, 'max_plies': max_plies}
+    tasks = [(first_game, min(chunk_size, num_games - first_game), options)
+             for first_game in range(0, num_games, chunk_size)]
+
+    if processes == 1:
+        for task in tasks:
+            yield play_chunk(task)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        for chunk in pool.imap_unordered(play_chunk, tasks):
+            yield chunk
+
+
+def main(arguments=None):
+    """
+    Runs a simulation from the command line and prints how many games each side won and how
+    many games were played per second. With --output, the games are also saved to a game record
+    file in the order of their numbers, so game i of the file is game i of the simulation.
+
+    Parameters:
+        - arguments: A list of command line arguments, or None to use sys.argv.
+
+    Return value:
+        - the exit status (0)
+    """
+    parser = argparse.ArgumentParser(description='Play many games of the chess variant at once.')
+    parser.add_argument('--games', type=int, default=100, help='the number of games (default: 100)')
+    parser.add_argument('--white', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--black', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='the number of worker processes (default: one per core)')
+    parser.add_argument('--chunk-size', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='bitboard')
+    parser.add_argument('--random-plies', type=int, default=0)
+    parser.add_argument('--max-plies', type=int, default=500)
+    parser.add_argument('--output', default=None,
+                        help='a game record file to add the games to (see ChessRecord.py)')
+    options = parser.parse_args(arguments)
+    writer = None if options.output is None else GameRecordWriter(options.output)
+
+    start = time.perf_counter()
+    winners = {'WHITE_WON': 0, 'BLACK_WON': 0, 'UNFINISHED': 0}
+    plies = 0
+    # chunks come back in the order they finish, so a chunk is kept here until every game
+    # before it has been written
+    waiting_chunks = {}
+    next_game = 0
+    for chunk in simulate(options.games, options.white, options.black, options.processes,
+                          options.chunk_size, options.seed, options.backend,
+                          options.random_plies, options.max_plies):
+        for result in chunk:
+            winners[result['winner']] += 1
+            plies += result['plies']
+        if writer is not None:
+            waiting_chunks[chunk[0]['game']] = chunk
+            while next_game in waiting_chunks:
+                for result in waiting_chunks.pop(next_game):
+                    writer.write_result(result)
+                    next_game += 1
+    if writer is not None:
+        writer.close()
+    seconds = time.perf_counter() - start
+
+    print('white (%s) won %d, black (%s) won %d, unfinished %d'
+          % (options.white, winners['WHITE_WON'], options.black, winners['BLACK_WON'],
+             winners['UNFINISHED']))
+    print('%d games, %d moves in %.2fs: %.1f games/s, %.0f moves/s'
+          % (options.games, plies, seconds, options.games / seconds, plies / seconds))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+# Author: Allison Majors
+# GitHub username: birdybird10
+# Date: 10/18/26
+# Description: This file has a fixed-size transposition table for searching games of the chess
+# variant in ChessGame.py. A transposition table remembers what a search found out about a
+# position (its score, how deep it was searched and the best move), keyed by the position's
+# Zobrist key from ChessVar.position_key(). A Python dictionary of tuples uses over 100 bytes per
+# entry and keeps growing, so this table packs every entry into two 64-bit integers in one flat
+# array whose size is set in megabytes when the table is made. The table is split into buckets
+# of two slots. The first slot keeps the deepest search of a position and the second slot is
+# always replaced, so deep results survive while recent shallow results are still stored.
+# The slots can also live in a buffer shared between processes, so several searches of the same
+# position can use one table. Processes write to it without locks: an entry is two words, and
+# one process can write one word just as another writes the other. Such an entry is never found,
+# because its check word no longer matches its key.
+
+from array import array
+
+# Bytes used by one bucket: two slots of two 64-bit integers each.
+BUCKET_BYTES = 32
+
+# Scores are stored with this added so that they are never negative. It must be larger than any
+# score the search can return.
+SCORE_OFFSET = 1 << 20
+
+# Bit positions of the fields packed into an entry's data word.
+FLAG_SHIFT = 21
+DEPTH_SHIFT = 23
+MOVE_SHIFT = 31
+GENERATION_SHIFT = 44
+VALID_BIT = 1 << 52
+
+
+def get_table_bytes(size_mb):
+    """
+    Returns the number of bytes the slots of a table of a given size use: the largest power of
+    two number of buckets that fits in size_mb megabytes. This is the size of the buffer to
+    share between processes.
+
+    Parameters:
+        - size_mb: The most memory the table may use, in megabytes. Example: 16
+
+    Return value:
+        - number of bytes (an integer)
+    """
+    buckets = 1
+    while buckets * 2 * BUCKET_BYTES <= size_mb * 1024 * 1024:
+        buckets *= 2
+    return buckets * BUCKET_BYTES
+
+
+class TranspositionTable:
+    """
+    This class is a transposition table with a fixed amount of memory. Every entry is stored as
+    two unsigned 64-bit integers in self._slots: a check word and a data word. The data word
+    packs the score, the bound flag, the depth, the best move and the search generation. The
+    check word is the position key XOR the data word, so an entry only matches a key if both
+    words were written together.
+
+    Data members:
+        - self._slots (An array of unsigned 64-bit integers, four for every bucket, or a
+        memoryview of a shared buffer used the same way.)
+        - self._bucket_mask (The number of buckets minus 1. The number of buckets is a power of
+        two so a key can be turned into a bucket index with a bitwise AND.)
+        - self._generation (A number from 0 to 255 that goes up with every new search, so that
+        entries left over from old searches can be replaced.)
+        - self._hits, self._misses, self._stores, self._overwrites (Counters for how often
+        probe() found an entry, how often it didn't, how many entries were stored, and how many
+        stored entries replaced an entry for a different position.)
+
+    Methods:
+        - probe(self, key)
+            - Returns the stored (depth, score, flag, best move) for a key, or None.
+        - store(self, key, depth, score, flag, best_move)
+            - Stores an entry using the replacement policy.
+        - new_search(self)
+            - Starts a new search generation.
+        - clear(self)
+            - Removes every entry and resets the counters.
+        - get_statistics(self)
+            - Returns a dictionary with the counters and the size of the table.
+
+    Classes in communication with:
+        - SearchEngine (Uses a TranspositionTable to remember positions it has searched.)
+        - ChessVar (Its position_key() is used as the key of an entry.)
+    """
+
+    def __init__(self, size_mb=16, buffer=None):
+        if buffer is None:
+            self._slots = array('Q', [0]) * (get_table_bytes(size_mb) // 8)
+        else:
+            # the buffer is shared with other processes, for example a multiprocessing.RawArray
+            # of get_table_bytes(size_mb) bytes, and size_mb is not used
+            self._slots = memoryview(buffer).cast('B').cast('Q')
+        buckets = len(self._slots) // 4
+        if buckets == 0 or buckets & (buckets - 1):
+            raise ValueError('a transposition table needs a power of two number of buckets')
+        self._bucket_mask = buckets - 1
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._overwrites = 0
+
+    def probe(self, key):
+        """
+        Looks up a position in the table.
+
+        Parameters:
+            - key: The 64-bit position key. Example: game.position_key()
+
+        Return value:
+            - A (depth, score, flag, best_move) tuple if the position is stored, where best_move
+            is an integer from 0 to 4095 or None, or None if the position is not stored.
+        """
+        slots = self._slots
+        index = (key & self._bucket_mask) * 4
+        for slot in (index, index + 2):
+            data = slots[slot + 1]
+            if data and slots[slot] ^ data == key:
+                self._hits += 1
+                move = (data >> MOVE_SHIFT) & 0x1FFF
+                return ((data >> DEPTH_SHIFT) & 0xFF,
+                        (data & 0x1FFFFF) - SCORE_OFFSET,
+                        (data >> FLAG_SHIFT) & 0x3,
+                        move - 1 if move else None)
+        self._misses += 1
+        return None
+
+    def store(self, key, depth, score, flag, best_move):
+        """
+        Stores what a search found out about a position. The first slot of the bucket is used if
+        it holds the same position, if it is empty or from an older search, or if the new depth
+        is at least as deep as the stored one. Otherwise the second slot is used, replacing
+        whatever is in it.
+
+        Parameters:
+            - key: The 64-bit position key.
+            - depth: How many plies deep the position was searched (0 to 255).
+            - score: The score found, between -SCORE_OFFSET and SCORE_OFFSET.
+            - flag: Whether the score is exact, a lower bound or an upper bound (0 to 3).
+            - best_move: The best move as an integer from 0 to 4095, or None.
+        """
+        slots = self._slots
+        index = (key & self._bucket_mask) * 4
+        depth = min(max(depth, 0), 255)
+        data = (VALID_BIT | (self._generation << GENERATION_SHIFT) |
+                ((0 if best_move is None else best_move + 1) << MOVE_SHIFT) |
+                (depth << DEPTH_SHIFT) | (flag << FLAG_SHIFT) | (score + SCORE_OFFSET))
+
+        # the depth-preferred slot
+        old_data = slots[index + 1]
+        old_key = slots[index] ^ old_data
+        if (not old_data or old_key == key or depth >= (old_data >> DEPTH_SHIFT) & 0xFF
+                or (old_data >> GENERATION_SHIFT) & 0xFF != self._generation):
+            slot = index
+        else:
+            # the always-replace slot
+            slot = index + 2
+            old_data = slots[slot + 1]
+            old_key = slots[slot] ^ old_data
+
+        if old_data and old_key != key:
+            self._overwrites += 1
+        self._stores += 1
+        slots[slot] = key ^ data
+        slots[slot + 1] = data
+
+    def new_search(self):
+        """
+        Starts a new search generation. Entries from earlier searches stay in the table and can
+        still be found, but they no longer keep their depth-preferred slot.
+        """
+        self._generation = (self._generation + 1) & 0xFF
+
+    def clear(self):
+        """
+        Removes every entry and resets the counters. A shared table is cleared for every process
+        using it.
+        """
+        self._slots[:] = array('Q', [0]) * len(self._slots)
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._overwrites = 0
+
+    def get_statistics(self):
+        """
+        Returns the table's counters and size.
+
+        Return value:
+            - A dictionary with 'hits', 'misses', 'stores', 'overwrites', 'entries' (the number of
+            slots) and 'bytes' (the memory used by the slots)
+        """
+        return {'hits': self._hits, 'misses': self._misses, 'stores': self._stores,
+                'overwrites': self._overwrites, 'entries': len(self._slots) // 2,
+                'bytes': len(self._slots) * self._slots.itemsize}